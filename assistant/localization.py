@@ -5,8 +5,11 @@
 # PLease read the GNU Affero General Public License in
 # <https://www.github.com/TeamUltroid/Ultroid/blob/main/LICENSE/>.
 
+import asyncio
 import re
 
+from strings import load_translations, translate_all
+
 from . import (
     Button,
     ULTConfig,
@@ -17,6 +20,9 @@ from . import (
     udB,
 )
 
+# Background translations, referenced until done so they aren't collected.
+_tasks = set()
+
 
 @callback("lang", owner=True)
 async def setlang(event):
@@ -41,6 +47,11 @@ async def settt(event):
     languages = get_languages()
     ULTConfig.lang = lang
     udB.del_key("language") if lang == "en" else udB.set_key("language", lang)
+    if lang != "en":
+        load_translations(lang)
+        task = asyncio.create_task(translate_all(lang))
+        _tasks.add(task)
+        task.add_done_callback(_tasks.discard)
     await event.edit(
         f"Your language has been set to {languages[lang]['natively']} [{lang}].",
         buttons=get_back_button("lang"),
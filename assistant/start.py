@@ -5,8 +5,6 @@
 # PLease read the GNU Affero General Public License in
 # <https://www.github.com/TeamUltroid/Ultroid/blob/main/LICENSE/>.
 
-from datetime import datetime
-
 from pytz import timezone as tz
 from telethon import Button, events
 from telethon.errors.rpcerrorlist import MessageDeleteForbiddenError
@@ -14,6 +12,7 @@ from telethon.utils import get_display_name
 
 from pyUltroid._misc import SUDO_M, owner_and_sudos
 from pyUltroid.dB.base import KeyManager
+from pyUltroid.fns.broadcast import Broadcast, running
 from pyUltroid.fns.helper import inline_mention
 from strings import get_string
 
@@ -159,7 +158,7 @@ async def ultroid(event):
 
 @callback("stat", owner=True)
 async def botstat(event):
-    ok = len(udB.get_key("BOT_USERS") or [])
+    ok = KeyManager("BOT_USERS", cast=list).count()
     msg = """Ultroid Assistant - Stats
 Total Users - {}""".format(
         ok,
@@ -179,25 +178,11 @@ async def bdcast(event):
         response = await conv.get_response()
         if response.message == "/cancel":
             return await conv.send_message("Cancelled!!")
-        success = 0
-        fail = 0
-        await conv.send_message(f"Starting a broadcast to {total} users...")
-        start = datetime.now()
-        for i in keym.get():
-            try:
-                await asst.send_message(int(i), response)
-                success += 1
-            except BaseException:
-                fail += 1
-        end = datetime.now()
-        time_taken = (end - start).seconds
-        await conv.send_message(
-            f"""
-**Broadcast completed in {time_taken} seconds.**
-Total Users in Bot - {total}
-**Sent to** : `{success} users.`
-**Failed for** : `{fail} user(s).`""",
-        )
+        if running("bot_users"):
+            return await conv.send_message("A broadcast is already running.")
+        status = await conv.send_message(f"Starting a broadcast to {total} users...")
+        targets = [int(i) for i in keym.get()]
+    await Broadcast.start("bot_users", asst, response, targets, status=status)
 
 
 @callback("setter", owner=True)
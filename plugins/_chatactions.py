@@ -203,11 +203,11 @@ async def chatBot_replies(e):
             await e.respond(e.message)
         except Exception as er:
             LOGS.exception(er)
-    key = udB.get_key("CHATBOT_USERS") or {}
+    key = await udB.aget("CHATBOT_USERS") or {}
     if e.text and key.get(e.chat_id) and sender.id in key[e.chat_id]:
         msg = await get_chatbot_reply(e.message.message)
         if msg:
-            sleep = udB.get_key("CHATBOT_SLEEP") or 1.5
+            sleep = await udB.aget("CHATBOT_SLEEP") or 1.5
             await asyncio.sleep(sleep)
             await e.reply(msg)
     chat = await e.get_chat()
@@ -227,9 +227,8 @@ async def uname_change(e):
 
 
 async def uname_stuff(id, uname, name):
-    if udB.get_key("USERNAME_LOG"):
-        old_ = udB.get_key("USERNAME_DB") or {}
-        old = old_.get(id)
+    if await udB.aget("USERNAME_LOG"):
+        old = await udB.ahget("USERNAME_DB", id)
         # Ignore Name Logs
         if old and old == uname:
             return
@@ -249,5 +248,4 @@ async def uname_stuff(id, uname, name):
                 get_string("can_4").format(f"[{name}](tg://user?id={id})", uname),
             )
 
-        old_[id] = uname
-        udB.set_key("USERNAME_DB", old_)
+        await udB.ahset("USERNAME_DB", id, uname)
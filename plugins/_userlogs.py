@@ -21,6 +21,7 @@ from telethon.tl.types import MessageEntityMention, MessageEntityMentionName, Us
 from telethon.utils import get_display_name
 
 from pyUltroid.dB.botchat_db import tag_add, who_tag
+from pyUltroid.fns.cache import BoundedCache
 
 from . import (
     LOG_CHANNEL,
@@ -36,7 +37,8 @@ from . import (
 )
 
 CACHE_SPAM = {}
-TAG_EDITS = {}
+# Logged mentions by (chat, message id), to append their later edits.
+TAG_EDITS = BoundedCache("tag_edits", maxsize=1000, ttl=2 * 24 * 60 * 60)
 
 
 @ultroid_bot.on(
@@ -57,20 +59,14 @@ async def all_messages_catcher(e):
     buttons = await parse_buttons(e)
     try:
         sent = await asst.send_message(NEEDTOLOG, e.message, buttons=buttons)
-        if TAG_EDITS.get(e.chat_id):
-            TAG_EDITS[e.chat_id].update({e.id: {"id": sent.id, "msg": e}})
-        else:
-            TAG_EDITS.update({e.chat_id: {e.id: {"id": sent.id, "msg": e}}})
+        TAG_EDITS[(e.chat_id, e.id)] = {"id": sent.id, "msg": e}
         tag_add(sent.id, e.chat_id, e.id)
     except MediaEmptyError as er:
         LOGS.debug(f"handling {er}.")
         try:
             msg = await asst.get_messages(e.chat_id, ids=e.id)
             sent = await asst.send_message(NEEDTOLOG, msg, buttons=buttons)
-            if TAG_EDITS.get(e.chat_id):
-                TAG_EDITS[e.chat_id].update({e.id: {"id": sent.id, "msg": e}})
-            else:
-                TAG_EDITS.update({e.chat_id: {e.id: {"id": sent.id, "msg": e}}})
+            TAG_EDITS[(e.chat_id, e.id)] = {"id": sent.id, "msg": e}
             tag_add(sent.id, e.chat_id, e.id)
         except Exception as me:
             if not isinstance(me, (PeerIdInvalidError, ValueError)):
@@ -81,10 +77,7 @@ async def all_messages_catcher(e):
                     sent = await asst.send_message(
                         NEEDTOLOG, e.message.text, file=media, buttons=buttons
                     )
-                    if TAG_EDITS.get(e.chat_id):
-                        TAG_EDITS[e.chat_id].update({e.id: {"id": sent.id, "msg": e}})
-                    else:
-                        TAG_EDITS.update({e.chat_id: {e.id: {"id": sent.id, "msg": e}}})
+                    TAG_EDITS[(e.chat_id, e.id)] = {"id": sent.id, "msg": e}
                     return os.remove(media)
                 except Exception as er:
                     LOGS.exception(er)
@@ -120,7 +113,9 @@ if udB.get_key("TAG_LOG"):
         x = event.sender
         if isinstance(x, User) and (x.bot or x.verified):
             return
-        if event.chat_id not in TAG_EDITS:
+        key = (event.chat_id, event.id)
+        d_ = TAG_EDITS.get(key)
+        if not d_:
             if event.sender_id == udB.get_key("TAG_LOG"):
                 return
             if event.is_private:
@@ -145,15 +140,8 @@ if udB.get_key("TAG_LOG"):
                         )
                     except Exception as er:
                         return LOGS.exception(er)
-                    if TAG_EDITS.get(event.chat_id):
-                        TAG_EDITS[event.chat_id].update({event.id: {"id": sent.id}})
-                    else:
-                        TAG_EDITS.update({event.chat_id: {event.id: {"id": sent.id}}})
-            return
-        d_ = TAG_EDITS[event.chat_id]
-        if not d_.get(event.id):
+                    TAG_EDITS[key] = {"id": sent.id, "msg": event}
             return
-        d_ = d_[event.id]
         if d_["msg"].text == event.text:
             return
         msg = None
@@ -182,7 +170,7 @@ if udB.get_key("TAG_LOG"):
             msg = await MSG.edit(TEXT, buttons=await parse_buttons(event))
             d_["msg"] = msg
         except (MessageTooLongError, MediaCaptionTooLongError):
-            del TAG_EDITS[event.chat_id][event.id]
+            TAG_EDITS.pop(key, None)
         except Exception as er:
             LOGS.exception(er)
 
@@ -15,12 +15,25 @@ import re
 from telethon.events import NewMessage as NewMsg
 
 from pyUltroid.dB import DEVLIST
-from pyUltroid.dB.antiflood_db import get_flood, get_flood_limit, rem_flood, set_flood
+from pyUltroid.dB.antiflood_db import (
+    FLOOD_TRACKER,
+    flood_limit,
+    get_flood,
+    get_flood_limit,
+    parse_limit,
+    rem_flood,
+    set_flood,
+)
 from pyUltroid.fns.admins import admin_check
 
 from . import Button, Redis, asst, callback, eod, get_string, ultroid_bot, ultroid_cmd
 
-_check_flood = {}
+
+async def _exempt(event):
+    if event.sender_id in DEVLIST or getattr(event.sender, "bot", None):
+        return True
+    return await admin_check(event, silent=True)
+
 
 if Redis("ANTIFLOOD"):
 
@@ -30,39 +43,39 @@ if Redis("ANTIFLOOD"):
         ),
     )
     async def flood_checm(event):
-        count = 1
-        chat = (await event.get_chat()).title
-        if event.chat_id in _check_flood.keys():
-            if event.sender_id == list(_check_flood[event.chat_id].keys())[0]:
-                count = _check_flood[event.chat_id][event.sender_id]
-                _check_flood[event.chat_id] = {event.sender_id: count + 1}
-            else:
-                _check_flood[event.chat_id] = {event.sender_id: count}
-        else:
-            _check_flood[event.chat_id] = {event.sender_id: count}
-        if await admin_check(event, silent=True) or getattr(event.sender, "bot", None):
+        limit = flood_limit(event.chat_id)
+        if not (limit and event.sender_id):
             return
-        if event.sender_id in DEVLIST:
+        flood = FLOOD_TRACKER.hit(event.chat_id, event.sender_id, *limit)
+        if not flood:
             return
-        if _check_flood[event.chat_id][event.sender_id] >= int(
-            get_flood_limit(event.chat_id)
-        ):
+        chat = (await event.get_chat()).title
+        if flood == "burst":
             try:
-                name = event.sender.first_name
-                await event.client.edit_permissions(
-                    event.chat_id, event.sender_id, send_messages=False
-                )
-                del _check_flood[event.chat_id]
-                await event.reply(f"#AntiFlood\n\n{get_string('antiflood_3')}")
                 await asst.send_message(
                     int(Redis("LOG_CHANNEL")),
-                    f"#Antiflood\n\n`Muted `[{name}](tg://user?id={event.sender_id})` in {chat}`",
-                    buttons=Button.inline(
-                        "Unmute", data=f"anti_{event.sender_id}_{event.chat_id}"
-                    ),
+                    f"#Antiflood\n\n`Several users are flooding {chat}`",
                 )
             except BaseException:
                 pass
+            return
+        if await FLOOD_TRACKER.is_admin(event, _exempt):
+            return
+        try:
+            name = event.sender.first_name
+            await event.client.edit_permissions(
+                event.chat_id, event.sender_id, send_messages=False
+            )
+            await event.reply(f"#AntiFlood\n\n{get_string('antiflood_3')}")
+            await asst.send_message(
+                int(Redis("LOG_CHANNEL")),
+                f"#Antiflood\n\n`Muted `[{name}](tg://user?id={event.sender_id})` in {chat}`",
+                buttons=Button.inline(
+                    "Unmute", data=f"anti_{event.sender_id}_{event.chat_id}"
+                ),
+            )
+        except BaseException:
+            pass
 
 
 @callback(
@@ -83,16 +96,20 @@ async def unmuting(e):
 
 
 @ultroid_cmd(
-    pattern="setflood ?(\\d+)",
+    pattern="setflood ?(\\d+)( \\d+)?",
     admins_only=True,
 )
 async def setflood(e):
     input_ = e.pattern_match.group(1).strip()
+    window = (e.pattern_match.group(2) or "").strip()
     if not input_:
         return await e.eor("`What?`", time=5)
-    if not input_.isdigit():
+    if not input_.isdigit() or int(input_) < 1 or window and int(window) < 1:
         return await e.eor(get_string("com_3"), time=5)
-    if m := set_flood(e.chat_id, input_):
+    if m := set_flood(e.chat_id, input_, window):
+        FLOOD_TRACKER.forget(e.chat_id)
+        if window:
+            input_ += f"/{window}s"
         return await eod(e, get_string("antiflood_4").format(input_))
 
 
@@ -102,10 +119,7 @@ async def setflood(e):
 )
 async def remove_flood(e):
     hmm = rem_flood(e.chat_id)
-    try:
-        del _check_flood[e.chat_id]
-    except BaseException:
-        pass
+    FLOOD_TRACKER.forget(e.chat_id)
     if hmm:
         return await e.eor(get_string("antiflood_1"), time=5)
     await e.eor(get_string("antiflood_2"), time=5)
@@ -117,5 +131,8 @@ async def remove_flood(e):
 )
 async def getflood(e):
     if ok := get_flood_limit(e.chat_id):
-        return await e.eor(get_string("antiflood_5").format(ok), time=5)
+        limit, window = parse_limit(ok)
+        return await e.eor(
+            get_string("antiflood_5").format(f"{limit}/{window}s"), time=5
+        )
     await e.eor(get_string("antiflood_2"), time=5)
@@ -12,7 +12,7 @@ __doc__ = get_help("help_blacklist")
 
 from pyUltroid.dB.blacklist_db import (
     add_blacklist,
-    get_blacklist,
+    get_automaton,
     list_blacklist,
     rem_blacklist,
 )
@@ -56,13 +56,12 @@ async def lsnote(e):
 
 
 async def blacklist(e):
-    if x := get_blacklist(e.chat_id):
-        text = e.text.lower().split()
-        if any((z in text) for z in x):
-            try:
-                await e.delete()
-            except BaseException:
-                pass
+    automaton = await get_automaton(e.chat_id)
+    if automaton and e.text and automaton.search(e.text):
+        try:
+            await e.delete()
+        except BaseException:
+            pass
 
 
 if udB.get_key("BLACKLIST_DB"):
@@ -7,7 +7,7 @@ import threading
 import subprocess
 
 # Import LOGS and call_back from Ultroid
-from . import LOGS, call_back
+from . import LOGS, call_back, udB
 
 
 # Enable / disable and interval via env:
@@ -94,6 +94,7 @@ def _monitor_updates_loop():
                 # restart bot
                 LOGS.info("Auto-update: Restarting Ultroid process...")
                 try:
+                    udB.flush()
                     os.execl(sys.executable, sys.executable, "-m", "pyUltroid")
                 except Exception:
                     LOGS.exception("Auto-update: execl restart failed → exiting.")
@@ -16,8 +16,9 @@ import io
 from telethon.utils import get_display_name
 
 from pyUltroid.dB.base import KeyManager
+from pyUltroid.fns.broadcast import Broadcast, running
 
-from . import HNDLR, LOGS, eor, get_string, udB, ultroid_bot, ultroid_cmd
+from . import HNDLR, LOGS, eor, get_string, udB, ultroid_cmd
 
 KeyM = KeyManager("BROADCAST", cast=list)
 
@@ -131,6 +132,14 @@ async def list_all(event):
         await x.edit(msg)
 
 
+async def _broadcast(x, message, mode):
+    if running("channels"):
+        return await x.edit("`A broadcast is already running.`")
+    await Broadcast.start(
+        "channels", x.client, message, KeyM.get(), mode=mode, status=x
+    )
+
+
 @ultroid_cmd(
     pattern="forward$",
     allow_sudo=False,
@@ -138,39 +147,12 @@ async def list_all(event):
 async def forw(event):
     if not event.is_reply:
         return await event.eor(get_string("ex_1"))
-    ultroid_bot = event.client
     channels = KeyM.get()
     x = await event.eor("Sending...")
     if not channels:
         return await x.edit(f"Please add channels by using `{HNDLR}add` in them.")
-    error_count = 0
-    sent_count = 0
     previous_message = await event.get_reply_message()
-    error_count = 0
-    for channel in channels:
-        try:
-            await ultroid_bot.forward_messages(channel, previous_message)
-            sent_count += 1
-            await x.edit(
-                f"Sent : {sent_count}\nError : {error_count}\nTotal : {len(channels)}",
-            )
-        except Exception:
-            try:
-                await ultroid_bot.send_message(
-                    udB.get_key("LOG_CHANNEL"),
-                    f"Error in sending at {channel}.",
-                )
-            except Exception as Em:
-                LOGS.info(Em)
-            error_count += 1
-            await x.edit(
-                f"Sent : {sent_count}\nError : {error_count}\nTotal : {len(channels)}",
-            )
-    await x.edit(f"{sent_count} messages sent with {error_count} errors.")
-    if error_count > 0:
-        await ultroid_bot.send_message(
-            udB.get_key("LOG_CHANNEL"), f"{error_count} Errors"
-        )
+    await _broadcast(x, previous_message, "forward")
 
 
 @ultroid_cmd(
@@ -185,32 +167,9 @@ async def sending(event):
     if not channels:
         return await x.edit(f"Please add channels by using `{HNDLR}add` in them.")
     await x.edit("Sending....")
-    if event.reply_to_msg_id:
-        previous_message = await event.get_reply_message()
-        if previous_message.poll:
-            return await x.edit(f"Reply `{HNDLR}forward` for polls.")
-        if previous_message:
-            error_count = 0
-            sent_count = 0
-            for channel in channels:
-                try:
-                    await ultroid_bot.send_message(channel, previous_message)
-                    sent_count += 1
-                    await x.edit(
-                        f"Sent : {sent_count}\nError : {error_count}\nTotal : {len(channels)}",
-                    )
-                except Exception as error:
-                    await ultroid_bot.send_message(
-                        udB.get_key("LOG_CHANNEL"),
-                        f"Error in sending at {channel}.\n\n{error}",
-                    )
-                    error_count += 1
-                    await x.edit(
-                        f"Sent : {sent_count}\nError : {error_count}\nTotal : {len(channels)}",
-                    )
-            await x.edit(f"{sent_count} messages sent with {error_count} errors.")
-            if error_count > 0:
-                await ultroid_bot.send_message(
-                    udB.get_key("LOG_CHANNEL"),
-                    f"{error_count} Errors",
-                )
+    previous_message = await event.get_reply_message()
+    if not previous_message:
+        return
+    if previous_message.poll:
+        return await x.edit(f"Reply `{HNDLR}forward` for polls.")
+    await _broadcast(x, previous_message, "send")
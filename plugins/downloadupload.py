@@ -9,7 +9,6 @@ from . import get_help
 
 __doc__ = get_help("help_downloadupload")
 
-import asyncio
 import glob
 import os
 import time
@@ -54,14 +53,12 @@ async def down(event):
         filename, d = await fast_download(
             link,
             filename,
-            progress_callback=lambda d, t: asyncio.get_event_loop().create_task(
-                progress(
-                    d,
-                    t,
-                    msg,
-                    s_time,
-                    f"Downloading from {link}",
-                )
+            progress_callback=lambda d, t: progress(
+                d,
+                t,
+                msg,
+                s_time,
+                f"Downloading from {link}",
             ),
         )
     except InvalidURL:
@@ -115,14 +112,12 @@ async def download(event):
         file_name = await event.client.download_media(
             ok,
             d,
-            progress_callback=lambda d, t: asyncio.get_event_loop().create_task(
-                progress(
-                    d,
-                    t,
-                    xx,
-                    k,
-                    get_string("com_5"),
-                ),
+            progress_callback=lambda d, t: progress(
+                d,
+                t,
+                xx,
+                k,
+                get_string("com_5"),
             ),
         )
     e = dt.now()
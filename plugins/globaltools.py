@@ -36,10 +36,10 @@
         `gpromote @username all sar` ~ promote the user in all group & channel
 • `{i}gdemote` - `demote user globally`
 """
-import asyncio
 import os
 
-from telethon.errors.rpcerrorlist import ChatAdminRequiredError, FloodWaitError
+from telethon import utils
+from telethon.errors.rpcerrorlist import ChatAdminRequiredError
 from telethon.tl.functions.channels import EditAdminRequest
 from telethon.tl.functions.contacts import BlockRequest, UnblockRequest
 from telethon.tl.types import ChatAdminRights, User
@@ -55,7 +55,9 @@ from pyUltroid.dB.gban_mute_db import (
     ungban,
     ungmute,
 )
+from pyUltroid.fns.broadcast import run_in_chats
 from pyUltroid.fns.tools import create_tl_btn, format_btn, get_msg_button
+from pyUltroid.startup._dialogs import CHANNELS, GROUPS
 
 from . import (
     HNDLR,
@@ -92,6 +94,33 @@ _gdemote_rights = ChatAdminRights(
 keym = KeyManager("GBLACKLISTS", cast=list)
 
 
+def _types(key):
+    key = key.lower()
+    if "group" in key:
+        return GROUPS
+    if "channel" in key:
+        return CHANNELS
+    return GROUPS + CHANNELS
+
+
+async def _in_chats(client, status, chats, action):
+    """Run 'action(peer)' in 'chats' of the dialog index of 'client'.
+    Returns the number of chats it worked in, and the errors."""
+    index = client.dialogs
+    done, errors = await run_in_chats(
+        chats,
+        lambda chat: action(index.input_peer(chat)),
+        status=status,
+        text=status.text,
+    )
+    for chat, er in errors:
+        if isinstance(er, ChatAdminRequiredError):
+            index.drop_rights(chat)
+        else:
+            LOGS.debug(f"{chat}: {er}")
+    return done, errors
+
+
 @ultroid_cmd(pattern="gpromote( (.*)|$)", fullsudo=True)
 async def _(e):
     x = e.pattern_match.group(1).strip()
@@ -106,54 +135,16 @@ async def _(e):
         if len(ok) > 1 and (("group" in ok[1]) or ("channel" in ok[1])):
             key = ok[1]
         rank = ok[2] if len(ok) > 2 else "AdMin"
-        c = 0
         user.id = user.peer_id.user_id if e.is_private else user.from_id.user_id
-        async for x in e.client.iter_dialogs():
-            if (
-                "group" in key.lower()
-                and x.is_group
-                or "group" not in key.lower()
-                and "channel" in key.lower()
-                and x.is_channel
-            ):
-                try:
-                    await e.client(
-                        EditAdminRequest(
-                            x.id,
-                            user.id,
-                            _gpromote_rights,
-                            rank,
-                        ),
-                    )
-                    c += 1
-                except BaseException:
-                    pass
-            elif (
-                ("group" not in key.lower() or x.is_group)
-                and (
-                    "group" in key.lower()
-                    or "channel" not in key.lower()
-                    or x.is_channel
-                )
-                and (
-                    "group" in key.lower()
-                    or "channel" in key.lower()
-                    or x.is_group
-                    or x.is_channel
-                )
-            ):
-                try:
-                    await e.client(
-                        EditAdminRequest(
-                            x.id,
-                            user.id,
-                            _gpromote_rights,
-                            rank,
-                        ),
-                    )
-                    c += 1
-                except Exception as er:
-                    LOGS.info(er)
+        index = await e.client.dialogs.load()
+        c, _ = await _in_chats(
+            e.client,
+            ev,
+            index.chats(_types(key), "add_admins"),
+            lambda chat: e.client(
+                EditAdminRequest(chat, user.id, _gpromote_rights, rank)
+            ),
+        )
         await eor(ev, f"Promoted The Replied Users in Total : {c} {key} chats")
     else:
         k = e.text.split()
@@ -173,30 +164,15 @@ async def _(e):
         if len(k) > 2 and (("group" in k[2]) or ("channel" in k[2])):
             key = k[2]
         rank = k[3] if len(k) > 3 else "AdMin"
-        c = 0
-        async for x in e.client.iter_dialogs():
-            if (
-                "group" in key.lower()
-                and x.is_group
-                or "group" not in key.lower()
-                and "channel" in key.lower()
-                and x.is_channel
-                or "group" not in key.lower()
-                and "channel" not in key.lower()
-                and (x.is_group or x.is_channel)
-            ):
-                try:
-                    await ultroid_bot(
-                        EditAdminRequest(
-                            x.id,
-                            user,
-                            _gpromote_rights,
-                            rank,
-                        ),
-                    )
-                    c += 1
-                except BaseException:
-                    pass
+        index = await e.client.dialogs.load()
+        c, _ = await _in_chats(
+            e.client,
+            ev,
+            index.chats(_types(key), "add_admins"),
+            lambda chat: ultroid_bot(
+                EditAdminRequest(chat, user, _gpromote_rights, rank)
+            ),
+        )
         await eor(ev, f"Promoted {name.first_name} in Total : {c} {key} chats.")
 
 
@@ -215,30 +191,15 @@ async def _(e):
         if len(ok) > 1 and (("group" in ok[1]) or ("channel" in ok[1])):
             key = ok[1]
         rank = "Not AdMin"
-        c = 0
-        async for x in e.client.iter_dialogs():
-            if (
-                "group" in key.lower()
-                and x.is_group
-                or "group" not in key.lower()
-                and "channel" in key.lower()
-                and x.is_channel
-                or "group" not in key.lower()
-                and "channel" not in key.lower()
-                and (x.is_group or x.is_channel)
-            ):
-                try:
-                    await ultroid_bot(
-                        EditAdminRequest(
-                            x.id,
-                            user.id,
-                            _gdemote_rights,
-                            rank,
-                        ),
-                    )
-                    c += 1
-                except BaseException:
-                    pass
+        index = await e.client.dialogs.load()
+        c, _ = await _in_chats(
+            e.client,
+            ev,
+            index.chats(_types(key), "add_admins"),
+            lambda chat: ultroid_bot(
+                EditAdminRequest(chat, user.id, _gdemote_rights, rank)
+            ),
+        )
         await eor(ev, f"Demoted The Replied Users in Total : {c} {key} chats")
     else:
         k = e.text.split()
@@ -258,30 +219,15 @@ async def _(e):
         if len(k) > 2 and (("group" in k[2]) or ("channel" in k[2])):
             key = k[2]
         rank = "Not AdMin"
-        c = 0
-        async for x in ultroid_bot.iter_dialogs():
-            if (
-                "group" in key.lower()
-                and x.is_group
-                or "group" not in key.lower()
-                and "channel" in key.lower()
-                and x.is_channel
-                or "group" not in key.lower()
-                and "channel" not in key.lower()
-                and (x.is_group or x.is_channel)
-            ):
-                try:
-                    await ultroid_bot(
-                        EditAdminRequest(
-                            x.id,
-                            user,
-                            _gdemote_rights,
-                            rank,
-                        ),
-                    )
-                    c += 1
-                except BaseException:
-                    pass
+        index = await ultroid_bot.dialogs.load()
+        c, _ = await _in_chats(
+            ultroid_bot,
+            ev,
+            index.chats(_types(key), "add_admins"),
+            lambda chat: ultroid_bot(
+                EditAdminRequest(chat, user, _gdemote_rights, rank)
+            ),
+        )
         await eor(ev, f"Demoted {name.first_name} in Total : {c} {key} chats.")
 
 
@@ -314,33 +260,13 @@ async def _(e):
     except BaseException:
         userid = int(userid)
         name = str(userid)
-    chats = 0
-    if e.client._dialogs:
-        dialog = e.client._dialogs
-    else:
-        dialog = await e.client.get_dialogs()
-        e.client._dialogs.extend(dialog)
-    for ggban in dialog:
-        if ggban.is_group or ggban.is_channel:
-            try:
-                await e.client.edit_permissions(ggban.id, userid, view_messages=True)
-                chats += 1
-            except FloodWaitError as fw:
-                LOGS.info(
-                    f"[FLOOD_WAIT_ERROR] : on Ungban\nSleeping for {fw.seconds+10}"
-                )
-                await asyncio.sleep(fw.seconds + 10)
-                try:
-                    await e.client.edit_permissions(
-                        ggban.id, userid, view_messages=True
-                    )
-                    chats += 1
-                except BaseException as er:
-                    LOGS.exception(er)
-            except (ChatAdminRequiredError, ValueError):
-                pass
-            except BaseException as er:
-                LOGS.exception(er)
+    index = await e.client.dialogs.load()
+    chats, _ = await _in_chats(
+        e.client,
+        xx,
+        index.chats(GROUPS + CHANNELS, "ban_users"),
+        lambda chat: e.client.edit_permissions(chat, userid, view_messages=True),
+    )
     ungban(userid)
     if isinstance(peer, User):
         await e.client(UnblockRequest(userid))
@@ -384,7 +310,6 @@ async def _(e):
     except BaseException:
         userid = int(userid)
         name = str(userid)
-    chats = 0
     if userid == ultroid_bot.uid:
         return await xx.eor("`I can't gban myself.`", time=3)
     elif userid in DEVLIST:
@@ -395,32 +320,13 @@ async def _(e):
             "`User is already gbanned and added to gbanwatch.`",
             time=4,
         )
-    if e.client._dialogs:
-        dialog = e.client._dialogs
-    else:
-        dialog = await e.client.get_dialogs()
-        e.client._dialogs.extend(dialog)
-    for ggban in dialog:
-        if ggban.is_group or ggban.is_channel:
-            try:
-                await e.client.edit_permissions(ggban.id, userid, view_messages=False)
-                chats += 1
-            except FloodWaitError as fw:
-                LOGS.info(
-                    f"[FLOOD_WAIT_ERROR] : on GBAN Command\nSleeping for {fw.seconds+10}"
-                )
-                await asyncio.sleep(fw.seconds + 10)
-                try:
-                    await e.client.edit_permissions(
-                        ggban.id, userid, view_messages=False
-                    )
-                    chats += 1
-                except BaseException as er:
-                    LOGS.exception(er)
-            except (ChatAdminRequiredError, ValueError):
-                pass
-            except BaseException as er:
-                LOGS.exception(er)
+    index = await e.client.dialogs.load()
+    chats, _ = await _in_chats(
+        e.client,
+        xx,
+        index.chats(GROUPS + CHANNELS, "ban_users"),
+        lambda chat: e.client.edit_permissions(chat, userid, view_messages=False),
+    )
     gban(userid, reason)
     if isinstance(user, User):
         await e.client(BlockRequest(userid))
@@ -448,67 +354,34 @@ async def gcast(event):
         )
 
     kk = await event.eor("`Globally Broadcasting Msg...`")
-    er = 0
-    done = 0
-    err = ""
-    if event.client._dialogs:
-        dialog = event.client._dialogs
-    else:
-        dialog = await event.client.get_dialogs()
-        event.client._dialogs.extend(dialog)
-    for x in dialog:
-        if x.is_group:
-            chat = x.entity.id
-            if (
-                not keym.contains(chat)
-                and int(f"-100{str(chat)}") not in NOSPAM_CHAT
-                and (
-                    (
-                        event.text[2:7] != "admin"
-                        or (x.entity.admin_rights or x.entity.creator)
-                    )
-                )
-            ):
-                try:
-                    if btn:
-                        bt = create_tl_btn(btn)
-                        await something(
-                            event,
-                            msg,
-                            reply.media if reply else None,
-                            bt,
-                            chat=chat,
-                            reply=False,
-                        )
-                    else:
-                        await event.client.send_message(
-                            chat, msg, file=reply.media if reply else None
-                        )
-                    done += 1
-                except FloodWaitError as fw:
-                    await asyncio.sleep(fw.seconds + 10)
-                    try:
-                        if btn:
-                            bt = create_tl_btn(btn)
-                            await something(
-                                event,
-                                msg,
-                                reply.media if reply else None,
-                                bt,
-                                chat=chat,
-                                reply=False,
-                            )
-                        else:
-                            await event.client.send_message(
-                                chat, msg, file=reply.media if reply else None
-                            )
-                        done += 1
-                    except Exception as rr:
-                        err += f"• {rr}\n"
-                        er += 1
-                except BaseException as h:
-                    err += f"• {str(h)}" + "\n"
-                    er += 1
+    index = await event.client.dialogs.load()
+    admin = event.pattern_match.group(1) == "admin"
+    chats = [
+        chat
+        for chat in index.chats(GROUPS, admin=admin)
+        if chat not in NOSPAM_CHAT
+        and not keym.contains(chat)
+        and not keym.contains(utils.resolve_id(chat)[0])
+    ]
+
+    async def send(chat):
+        if btn:
+            bt = create_tl_btn(btn)
+            return await something(
+                event,
+                msg,
+                reply.media if reply else None,
+                bt,
+                chat=chat,
+                reply=False,
+            )
+        await event.client.send_message(
+            chat, msg, file=reply.media if reply else None
+        )
+
+    done, errors = await _in_chats(event.client, kk, chats, send)
+    er = len(errors)
+    err = "".join(f"• {rr}\n" for _, rr in errors)
     text += f"Done in {done} chats, error in {er} chat(s)"
     if err != "":
         open("gcast-error.log", "w+").write(err)
@@ -533,35 +406,26 @@ async def gucast(event):
             event, "`Give some text to Globally Broadcast or reply a message..`"
         )
     kk = await event.eor("`Globally Broadcasting Msg...`")
-    er = 0
-    done = 0
-    if event.client._dialogs:
-        dialog = event.client._dialogs
-    else:
-        dialog = await event.client.get_dialogs()
-        event.client._dialogs.extend(dialog)
-    for x in dialog:
-        if x.is_user and not x.entity.bot:
-            chat = x.id
-            if not keym.contains(chat):
-                try:
-                    if btn:
-                        bt = create_tl_btn(btn)
-                        await something(
-                            event,
-                            msg,
-                            reply.media if reply else None,
-                            bt,
-                            chat=chat,
-                            reply=False,
-                        )
-                    else:
-                        await event.client.send_message(
-                            chat, msg, file=reply.media if reply else None
-                        )
-                    done += 1
-                except BaseException:
-                    er += 1
+    index = await event.client.dialogs.load()
+    chats = [chat for chat in index.chats(("user",)) if not keym.contains(chat)]
+
+    async def send(chat):
+        if btn:
+            bt = create_tl_btn(btn)
+            return await something(
+                event,
+                msg,
+                reply.media if reply else None,
+                bt,
+                chat=chat,
+                reply=False,
+            )
+        await event.client.send_message(
+            chat, msg, file=reply.media if reply else None
+        )
+
+    done, errors = await _in_chats(event.client, kk, chats, send)
+    er = len(errors)
     await kk.edit(f"Done in {done} chats, error in {er} chat(s)")
 
 
@@ -577,23 +441,17 @@ async def gkick(e):
     else:
         return await xx.edit("`Reply to some msg or add their id.`", time=5)
     name = (await e.client.get_entity(userid)).first_name
-    chats = 0
     if userid == ultroid_bot.uid:
         return await xx.eor("`I can't gkick myself.`", time=3)
     if userid in DEVLIST:
         return await xx.eor("`I can't gkick my Developers.`", time=3)
-    if e.client._dialogs:
-        dialog = e.client._dialogs
-    else:
-        dialog = await e.client.get_dialogs()
-        e.client._dialogs.extend(dialog)
-    for gkick in dialog:
-        if gkick.is_group or gkick.is_channel:
-            try:
-                await e.client.kick_participant(gkick.id, userid)
-                chats += 1
-            except BaseException:
-                pass
+    index = await e.client.dialogs.load()
+    chats, _ = await _in_chats(
+        e.client,
+        xx,
+        index.chats(GROUPS + CHANNELS, "ban_users"),
+        lambda chat: e.client.kick_participant(chat, userid),
+    )
     await xx.edit(f"`Gkicked` [{name}](tg://user?id={userid}) `in {chats} chats.`")
 
 
@@ -609,25 +467,19 @@ async def _(e):
     else:
         return await xx.eor("`Reply to some msg or add their id.`", tome=5, time=5)
     name = await e.client.get_entity(userid)
-    chats = 0
     if userid == ultroid_bot.uid:
         return await xx.eor("`I can't gmute myself.`", time=3)
     if userid in DEVLIST:
         return await xx.eor("`I can't gmute my Developers.`", time=3)
     if is_gmuted(userid):
         return await xx.eor("`User is already gmuted.`", time=4)
-    if e.client._dialogs:
-        dialog = e.client._dialogs
-    else:
-        dialog = await e.client.get_dialogs()
-        e.client._dialogs.extend(dialog)
-    for onmute in dialog:
-        if onmute.is_group:
-            try:
-                await e.client.edit_permissions(onmute.id, userid, send_messages=False)
-                chats += 1
-            except BaseException:
-                pass
+    index = await e.client.dialogs.load()
+    chats, _ = await _in_chats(
+        e.client,
+        xx,
+        index.chats(GROUPS, "ban_users"),
+        lambda chat: e.client.edit_permissions(chat, userid, send_messages=False),
+    )
     gmute(userid)
     await xx.edit(f"`Gmuted` {inline_mention(name)} `in {chats} chats.`")
 
@@ -644,21 +496,15 @@ async def _(e):
     else:
         return await xx.eor("`Reply to some msg or add their id.`", time=5)
     name = (await e.client.get_entity(userid)).first_name
-    chats = 0
     if not is_gmuted(userid):
         return await xx.eor("`User is not gmuted.`", time=3)
-    if e.client._dialogs:
-        dialog = e.client._dialogs
-    else:
-        dialog = await e.client.get_dialogs()
-        e.client._dialogs.extend(dialog)
-    for hurr in dialog:
-        if hurr.is_group:
-            try:
-                await e.client.edit_permissions(hurr.id, userid, send_messages=True)
-                chats += 1
-            except BaseException:
-                pass
+    index = await e.client.dialogs.load()
+    chats, _ = await _in_chats(
+        e.client,
+        xx,
+        index.chats(GROUPS, "ban_users"),
+        lambda chat: e.client.edit_permissions(chat, userid, send_messages=True),
+    )
     ungmute(userid)
     await xx.edit(f"`Ungmuted` {inline_mention(name)} `in {chats} chats.`")
 
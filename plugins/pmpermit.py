@@ -59,15 +59,17 @@ from telethon.tl.functions.messages import ReportSpamRequest
 from telethon.utils import get_display_name, resolve_bot_file_id
 
 from pyUltroid.dB.base import KeyManager
+from pyUltroid.fns.cache import BoundedCache
 
 from . import *
 
 # ========================= CONSTANTS =============================
 
-COUNT_PM = {}
-LASTMSG = {}
-WARN_MSGS = {}
-U_WARNS = {}
+_DAY = 24 * 60 * 60
+COUNT_PM = BoundedCache("pm_warns", maxsize=5000, ttl=_DAY)
+LASTMSG = BoundedCache("pm_last_messages", maxsize=5000, ttl=_DAY)
+WARN_MSGS = BoundedCache("pm_warn_texts", maxsize=5000, ttl=_DAY)
+U_WARNS = BoundedCache("pm_warns_given", maxsize=5000, ttl=_DAY)
 if isinstance(udB.get_key("PMPERMIT"), (int, str)):
     value = [udB.get_key("PMPERMIT")]
     udB.set_key("PMPERMIT", value)
@@ -97,8 +99,8 @@ PMCMDS = [
     f"{HNDLR}unblock",
 ]
 
-_not_approved = {}
-_to_delete = {}
+_not_approved = BoundedCache("pm_log_messages", maxsize=1000, ttl=7 * _DAY)
+_to_delete = BoundedCache("pm_warn_messages", maxsize=1000, ttl=_DAY)
 
 my_bot = asst.me.username
 
@@ -115,10 +117,24 @@ def update_pm(userid, message, warns_given):
 
 
 async def delete_pm_warn_msgs(chat: int):
-    try:
-        await _to_delete[chat].delete()
-    except KeyError:
-        pass
+    if msg := _to_delete.get(chat):
+        await msg.delete()
+
+
+async def log_pm(user_id, text, new=False, **kwargs):
+    """Edit the log message about 'user_id' to 'text', or send a new one if
+    'new' or if it was dropped from '_not_approved'."""
+    msg = None if new else _not_approved.get(user_id)
+    if msg:
+        try:
+            return await asst.edit_message(
+                udB.get_key("LOG_CHANNEL"), msg, text, **kwargs
+            )
+        except MessageNotModifiedError:
+            return
+    _not_approved[user_id] = await asst.send_message(
+        udB.get_key("LOG_CHANNEL"), text, **kwargs
+    )
 
 
 # =================================================================
@@ -184,21 +200,11 @@ if udB.get_key("PMSETTING"):
                 await ultroid_bot.edit_folder(miss.id, folder=0)
             except BaseException:
                 pass
-            try:
-                await asst.edit_message(
-                    LOG_CHANNEL,
-                    _not_approved[miss.id],
-                    f"#AutoApproved : <b>OutGoing Message.\nUser : {inline_mention(miss, html=True)}</b> [<code>{miss.id}</code>]",
-                    parse_mode="html",
-                )
-            except KeyError:
-                await asst.send_message(
-                    LOG_CHANNEL,
-                    f"#AutoApproved : <b>OutGoing Message.\nUser : {inline_mention(miss, html=True)}</b> [<code>{miss.id}</code>]",
-                    parse_mode="html",
-                )
-            except MessageNotModifiedError:
-                pass
+            await log_pm(
+                miss.id,
+                f"#AutoApproved : <b>OutGoing Message.\nUser : {inline_mention(miss, html=True)}</b> [<code>{miss.id}</code>]",
+                parse_mode="html",
+            )
 
     @ultroid_bot.on(
         events.NewMessage(
@@ -212,46 +218,33 @@ if udB.get_key("PMSETTING"):
         )
     )
     async def permitpm(event):
-        inline_pm = Redis("INLINE_PM") or False
+        inline_pm = await udB.aget("INLINE_PM") or False
         user = event.sender
         if not keym.contains(user.id) and event.text != UND:
-            if Redis("MOVE_ARCHIVE"):
+            if await udB.aget("MOVE_ARCHIVE"):
                 try:
                     await ultroid_bot.edit_folder(user.id, folder=1)
                 except BaseException as er:
                     LOGS.info(er)
-            if event.media and not udB.get_key("DISABLE_PMDEL"):
+            if event.media and not await udB.aget("DISABLE_PMDEL"):
                 await event.delete()
             name = user.first_name
             fullname = get_display_name(user)
             username = f"@{user.username}"
             mention = inline_mention(user)
             count = keym.count()
-            try:
-                wrn = COUNT_PM[user.id] + 1
-                await asst.edit_message(
-                    udB.get_key("LOG_CHANNEL"),
-                    _not_approved[user.id],
-                    f"Incoming PM from **{mention}** [`{user.id}`] with **{wrn}/{WARNS}** warning!",
-                    buttons=[
-                        Button.inline("Approve PM", data=f"approve_{user.id}"),
-                        Button.inline("Block PM", data=f"block_{user.id}"),
-                    ],
-                )
-            except KeyError:
-                _not_approved[user.id] = await asst.send_message(
-                    udB.get_key("LOG_CHANNEL"),
-                    f"Incoming PM from **{mention}** [`{user.id}`] with **1/{WARNS}** warning!",
-                    buttons=[
-                        Button.inline("Approve PM", data=f"approve_{user.id}"),
-                        Button.inline("Block PM", data=f"block_{user.id}"),
-                    ],
-                )
-                wrn = 1
-            except MessageNotModifiedError:
-                wrn = 1
-            if user.id in LASTMSG:
-                prevmsg = LASTMSG[user.id]
+            wrn = COUNT_PM.get(user.id, 0) + 1
+            await log_pm(
+                user.id,
+                f"Incoming PM from **{mention}** [`{user.id}`] with **{wrn}/{WARNS}** warning!",
+                new=wrn == 1,
+                buttons=[
+                    Button.inline("Approve PM", data=f"approve_{user.id}"),
+                    Button.inline("Block PM", data=f"block_{user.id}"),
+                ],
+            )
+            prevmsg = LASTMSG.get(user.id)
+            if prevmsg is not None:
                 if event.text != prevmsg:
                     if "PMSecurity" in event.text or "**PMSecurity" in event.text:
                         return
@@ -359,28 +352,16 @@ if udB.get_key("PMSETTING"):
                         user.id, message_
                     )
             LASTMSG.update({user.id: event.text})
-            if user.id not in COUNT_PM:
-                COUNT_PM.update({user.id: 1})
-            else:
-                COUNT_PM[user.id] = COUNT_PM[user.id] + 1
+            COUNT_PM[user.id] = COUNT_PM.get(user.id, 0) + 1
             if COUNT_PM[user.id] >= WARNS:
                 await delete_pm_warn_msgs(user.id)
                 _to_delete[user.id] = await event.respond(UNS)
-                try:
-                    del COUNT_PM[user.id]
-                    del LASTMSG[user.id]
-                except KeyError:
-                    await asst.send_message(
-                        udB.get_key("LOG_CHANNEL"),
-                        "PMPermit is messed! Pls restart the bot!!",
-                    )
-                    return LOGS.info("COUNT_PM is messed.")
+                COUNT_PM.pop(user.id, None)
+                LASTMSG.pop(user.id, None)
                 await ultroid_bot(BlockRequest(user.id))
                 await ultroid_bot(ReportSpamRequest(peer=user.id))
-                await asst.edit_message(
-                    udB.get_key("LOG_CHANNEL"),
-                    _not_approved[user.id],
-                    f"**{mention}** [`{user.id}`] was Blocked for spamming.",
+                await log_pm(
+                    user.id, f"**{mention}** [`{user.id}`] was Blocked for spamming."
                 )
 
     @ultroid_cmd(pattern="(start|stop|clear)archive$", fullsudo=True)
@@ -424,29 +405,15 @@ if udB.get_key("PMSETTING"):
                 f"<b>{inline_mention(user, html=True)}</b> <code>approved to PM!</code>",
                 parse_mode="html",
             )
-            try:
-                await asst.edit_message(
-                    udB.get_key("LOG_CHANNEL"),
-                    _not_approved[user.id],
-                    f"#APPROVED\n\n<b>{inline_mention(user, html=True)}</b> [<code>{user.id}</code>] <code>was approved to PM you!</code>",
-                    buttons=[
-                        Button.inline("Disapprove PM", data=f"disapprove_{user.id}"),
-                        Button.inline("Block", data=f"block_{user.id}"),
-                    ],
-                    parse_mode="html",
-                )
-            except KeyError:
-                _not_approved[user.id] = await asst.send_message(
-                    udB.get_key("LOG_CHANNEL"),
-                    f"#APPROVED\n\n<b>{inline_mention(user, html=True)}</b> [<code>{user.id}</code>] <code>was approved to PM you!</code>",
-                    buttons=[
-                        Button.inline("Disapprove PM", data=f"disapprove_{user.id}"),
-                        Button.inline("Block", data=f"block_{user.id}"),
-                    ],
-                    parse_mode="html",
-                )
-            except MessageNotModifiedError:
-                pass
+            await log_pm(
+                user.id,
+                f"#APPROVED\n\n<b>{inline_mention(user, html=True)}</b> [<code>{user.id}</code>] <code>was approved to PM you!</code>",
+                buttons=[
+                    Button.inline("Disapprove PM", data=f"disapprove_{user.id}"),
+                    Button.inline("Block", data=f"block_{user.id}"),
+                ],
+                parse_mode="html",
+            )
         else:
             await apprvpm.eor("`User may already be approved.`", time=5)
 
@@ -470,29 +437,15 @@ if udB.get_key("PMSETTING"):
                 f"<b>{inline_mention(user, html=True)}</b> <code>Disapproved to PM!</code>",
                 parse_mode="html",
             )
-            try:
-                await asst.edit_message(
-                    udB.get_key("LOG_CHANNEL"),
-                    _not_approved[user.id],
-                    f"#DISAPPROVED\n\n<b>{inline_mention(user, html=True)}</b> [<code>{user.id}</code>] <code>was disapproved to PM you.</code>",
-                    buttons=[
-                        Button.inline("Approve PM", data=f"approve_{user.id}"),
-                        Button.inline("Block", data=f"block_{user.id}"),
-                    ],
-                    parse_mode="html",
-                )
-            except KeyError:
-                _not_approved[user.id] = await asst.send_message(
-                    udB.get_key("LOG_CHANNEL"),
-                    f"#DISAPPROVED\n\n<b>{inline_mention(user, html=True)}</b> [<code>{user.id}</code>] <code>was disapproved to PM you.</code>",
-                    buttons=[
-                        Button.inline("Approve PM", data=f"approve_{user.id}"),
-                        Button.inline("Block", data=f"block_{user.id}"),
-                    ],
-                    parse_mode="html",
-                )
-            except MessageNotModifiedError:
-                pass
+            await log_pm(
+                user.id,
+                f"#DISAPPROVED\n\n<b>{inline_mention(user, html=True)}</b> [<code>{user.id}</code>] <code>was disapproved to PM you.</code>",
+                buttons=[
+                    Button.inline("Approve PM", data=f"approve_{user.id}"),
+                    Button.inline("Block", data=f"block_{user.id}"),
+                ],
+                parse_mode="html",
+            )
         else:
             await eod(
                 e,
@@ -523,25 +476,13 @@ async def blockpm(block):
         keym.remove(user)
     except AttributeError:
         pass
-    try:
-        await asst.edit_message(
-            udB.get_key("LOG_CHANNEL"),
-            _not_approved[user],
-            f"#BLOCKED\n\n{inline_mention(aname)} [`{user}`] has been **blocked**.",
-            buttons=[
-                Button.inline("UnBlock", data=f"unblock_{user}"),
-            ],
-        )
-    except KeyError:
-        _not_approved[user] = await asst.send_message(
-            udB.get_key("LOG_CHANNEL"),
-            f"#BLOCKED\n\n{inline_mention(aname)} [`{user}`] has been **blocked**.",
-            buttons=[
-                Button.inline("UnBlock", data=f"unblock_{user}"),
-            ],
-        )
-    except MessageNotModifiedError:
-        pass
+    await log_pm(
+        user,
+        f"#BLOCKED\n\n{inline_mention(aname)} [`{user}`] has been **blocked**.",
+        buttons=[
+            Button.inline("UnBlock", data=f"unblock_{user}"),
+        ],
+    )
 
 
 @ultroid_cmd(pattern="unblock( (.*)|$)", fullsudo=True)
@@ -585,25 +526,13 @@ async def unblockpm(event):
         await event.eor(f"{inline_mention(aname)} [`{user}`] `has been UnBlocked!`")
     except Exception as et:
         return await event.eor(f"ERROR - {et}")
-    try:
-        await asst.edit_message(
-            udB.get_key("LOG_CHANNEL"),
-            _not_approved[user],
-            f"#UNBLOCKED\n\n{inline_mention(aname)} [`{user}`] has been **unblocked**.",
-            buttons=[
-                Button.inline("Block", data=f"block_{user}"),
-            ],
-        )
-    except KeyError:
-        _not_approved[user] = await asst.send_message(
-            udB.get_key("LOG_CHANNEL"),
-            f"#UNBLOCKED\n\n{inline_mention(aname)} [`{user}`] has been **unblocked**.",
-            buttons=[
-                Button.inline("Block", data=f"block_{user}"),
-            ],
-        )
-    except MessageNotModifiedError:
-        pass
+    await log_pm(
+        user,
+        f"#UNBLOCKED\n\n{inline_mention(aname)} [`{user}`] has been **unblocked**.",
+        buttons=[
+            Button.inline("Block", data=f"block_{user}"),
+        ],
+    )
 
 
 @ultroid_cmd(pattern="listapproved$", owner=True)
@@ -30,6 +30,9 @@
 • `{i}tr <dest lang code> <(reply to) a message>`
     Get translated message.
 
+• `{i}trstrings <lang code-optional>`
+    Translate all bot strings missing in a language (default: current one).
+
 • `{i}webshot <url>`
     Get a screenshot of the webpage.
 """
@@ -61,6 +64,7 @@ from telethon.tl.types import (
 )
 
 from pyUltroid.fns.tools import metadata, translate
+from strings import translate_all
 
 from . import (
     HNDLR,
@@ -75,7 +79,14 @@ from . import (
     get_string,
 )
 from . import humanbytes as hb
-from . import inline_mention, is_url_ok, json_parser, mediainfo, ultroid_cmd
+from . import (
+    inline_mention,
+    is_url_ok,
+    json_parser,
+    mediainfo,
+    run_async,
+    ultroid_cmd,
+)
 
 
 @ultroid_cmd(pattern="tr( (.*)|$)", manager=True)
@@ -95,7 +106,7 @@ async def _(event):
         )
     lan = input or "en"
     try:
-        tt = translate(text, lang_tgt=lan)
+        tt = await run_async(translate)(text, lang_tgt=lan)
         output_str = f"**TRANSLATED** to {lan}\n{tt}"
         await event.eor(output_str)
     except Exception as exc:
@@ -103,6 +114,16 @@ async def _(event):
         await event.eor(str(exc), time=5)
 
 
+@ultroid_cmd(pattern="trstrings( (.*)|$)", fullsudo=True)
+async def _(event):
+    lang = event.pattern_match.group(1).strip() or ULTConfig.lang
+    if lang == "en":
+        return await event.eor("`Strings are already in English.`", time=5)
+    msg = await event.eor(f"`Translating strings to {lang}...`")
+    count = await translate_all(lang)
+    await msg.edit(f"`Translated {count} strings to {lang}.`")
+
+
 @ultroid_cmd(
     pattern="id( (.*)|$)",
     manager=True,
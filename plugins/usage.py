@@ -15,6 +15,9 @@
 
 • `{i}usage db`
    Get database storage usage.
+
+• `{i}usage cache`
+   Get the size of in-memory caches.
 """
 
 import math
@@ -22,6 +25,7 @@ import shutil
 from random import choice
 
 from pyUltroid.fns import some_random_headers
+from pyUltroid.fns.cache import cache_stats
 
 from . import (
     HOSTED_ON,
@@ -61,6 +65,8 @@ async def usage_finder(event):
 
     if opt == "db":
         await x.edit(db_usage())
+    elif opt == "cache":
+        await x.edit(cache_usage())
     elif opt == "heroku":
         is_hk, hk = await heroku_usage()
         await x.edit(hk)
@@ -178,7 +184,18 @@ def db_usage():
     used = udB.usage
     a = f"{humanbytes(used)}/{humanbytes(total)}"
     b = f"{str(round((used / total) * 100, 2))}%"
-    return f"**{udB.name}**\n\n**Storage Used**: `{a}`\n**Usage percentage**: **{b}**"
+    stats = udB.cache_stats
+    c = f"{stats['hits']} hits, {stats['misses']} misses, {stats['invalidations']} invalidations"
+    return f"**{udB.name}**\n\n**Storage Used**: `{a}`\n**Usage percentage**: **{b}**\n**Cache**: `{c}`"
+
+
+def cache_usage():
+    lines = [
+        f"• `{name}`: `{stats['entries']}/{stats['maxsize']}` entries,"
+        f" `{humanbytes(stats['bytes'])}`"
+        for name, stats in cache_stats().items()
+    ]
+    return "**Caches**\n\n" + "\n".join(lines)
 
 
 async def get_full_usage():
@@ -74,7 +74,7 @@ async def get_var(event):
             await eor(x, "Such a var doesn't exist!", time=5)
 
     elif opt == "db":
-        val = udB.get(varname)
+        val = udB.get_key(varname)
         if val is not None:
             await x.edit(f"**Key** - `{varname}`\n**Value**: `{val}`")
         else:
@@ -27,6 +27,9 @@ Setup:
 4. Web API starts automatically on bot startup (use .webapi autostart off to disable)
 """
 
+from pyUltroid.fns.cache import cache_stats
+from pyUltroid.fns.FastTelethon import SenderPool
+
 from . import LOGS, eor, get_string, udB, ultroid_cmd
 import os
 import asyncio
@@ -181,7 +184,10 @@ def start_web_api(port=8000, api_key=None):
                 "username": bot_info.get("username"),
                 "first_name": bot_info.get("first_name"),
                 "is_bot": bot_info.get("is_bot"),
-                "system": system_stats
+                "system": system_stats,
+                "db_cache": udB.cache_stats,
+                "transfer_senders": SenderPool.metrics(),
+                "caches": cache_stats(),
             }
             return stats
         except Exception as e:
@@ -42,6 +42,11 @@ if run_as_module:
     udB = UltroidDB()
     update_envs()
 
+    if _write_delay := udB.get_key("WRITE_BEHIND"):
+        udB.write_behind(float(_write_delay))
+    if udB.get_key("CACHE_SYNC"):
+        udB.watch()
+
     LOGS.info(f"Connecting to {udB.name}...")
     if udB.ping():
         LOGS.info(f"Connected to {udB.name} Successfully!")
@@ -13,6 +13,7 @@ def main():
     import sys
     import time
 
+    from .fns.broadcast import resume_broadcasts
     from .fns.helper import bash, time_formatter, updater
     from .startup.funcs import (
         WasItRestart,
@@ -88,6 +89,9 @@ def main():
     # Edit Restarting Message (if It's restarting)
     ultroid_bot.run_in_loop(WasItRestart(udB))
 
+    # Continue broadcasts stopped by the restart.
+    ultroid_bot.run_in_loop(resume_broadcasts())
+
     try:
         cleanup_cache()
     except BaseException:
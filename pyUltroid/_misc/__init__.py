@@ -12,46 +12,87 @@ CMD_HELP = {}
 # ----------------------------------------------#
 
 
+class DBSettings:
+    """Values of some database keys, kept until one of them changes.
+
+    Attribute names map to keys: 'DBSettings(log_channel="LOG_CHANNEL")'.
+    """
+
+    def __init__(self, **keys):
+        self._keys = keys
+        self._values = None
+        self._hooked = False
+
+    def _reset(self, key=None):
+        self._values = None
+
+    def _load(self):
+        values = self._values
+        if values is None:
+            from .. import udB
+
+            if not self._hooked:
+                udB.on_change(self._keys.values(), self._reset)
+                self._hooked = True
+            values = self._values = {
+                name: udB.get_key(key) for name, key in self._keys.items()
+            }
+        return values
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self._load()[name]
+
+
 class _SudoManager:
     def __init__(self):
         self.db = None
         self.owner = None
-        self._owner_sudos = []
+        self._owner_sudos = None
+        self._fullsudos = None
+        self.settings = DBSettings(
+            owner="OWNER_ID", sudo="SUDO", sudos="SUDOS", fullsudo="FULLSUDO"
+        )
 
     def _init_db(self):
         if not self.db:
             from .. import udB
 
             self.db = udB
+            udB.on_change(("OWNER_ID", "SUDOS", "FULLSUDO"), self._reset)
         return self.db
 
+    def _reset(self, key=None):
+        self._owner_sudos = self._fullsudos = None
+
     def get_sudos(self):
-        db = self._init_db()
-        SUDOS = db.get_key("SUDOS")
-        return SUDOS or []
+        return self.settings.sudos or []
 
     @property
     def should_allow_sudo(self):
-        db = self._init_db()
-        return db.get_key("SUDO")
+        return self.settings.sudo
 
     def owner_and_sudos(self):
-        if not self.owner:
-            db = self._init_db()
-            self.owner = db.get_key("OWNER_ID")
-        return [self.owner, *self.get_sudos()]
+        if self._owner_sudos is None:
+            self._init_db()
+            self.owner = self.settings.owner
+            self._owner_sudos = [self.owner, *self.get_sudos()]
+        return self._owner_sudos
 
     @property
     def fullsudos(self):
-        db = self._init_db()
-        fsudos = db.get("FULLSUDO")
-        if not self.owner:
-            self.owner = db.get_key("OWNER_ID")
-        if not fsudos:
-            return [self.owner]
-        fsudos = fsudos.split()
-        fsudos.append(self.owner)
-        return [int(_) for _ in fsudos]
+        if self._fullsudos is None:
+            self._init_db()
+            self.owner = self.settings.owner
+            fsudos = self.settings.fullsudo
+            if not fsudos:
+                self._fullsudos = [self.owner]
+            else:
+                fsudos = str(fsudos).split()
+                fsudos.append(self.owner)
+                self._fullsudos = [int(_) for _ in fsudos]
+        return self._fullsudos
 
     def is_sudo(self, id_):
         return bool(id_ in self.get_sudos())
@@ -0,0 +1,82 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
+
+"""
+Command logger for `COMMAND_LOGGER`.
+
+Lines are queued and sent to `LOG_CHANNEL` in batches, a few seconds
+after the first of them, so logging never delays the command itself.
+"""
+
+import asyncio
+
+from .. import LOGS
+from . import DBSettings
+
+_MAX_LENGTH = 4096
+
+
+class CommandLogSink:
+    def __init__(self, interval=5):
+        self.interval = interval
+        self.settings = DBSettings(
+            enabled="COMMAND_LOGGER", log_channel="LOG_CHANNEL"
+        )
+        self._lines = []
+        self._handle = None
+
+    @property
+    def enabled(self):
+        return bool(self.settings.enabled)
+
+    def log(self, line):
+        LOGS.info(line)
+        if not self.settings.log_channel:
+            return
+        self._lines.append(line)
+        if self._handle:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._handle = loop.call_later(
+            self.interval, lambda: loop.create_task(self.flush())
+        )
+
+    def _chunks(self, lines):
+        text = ""
+        for line in lines:
+            line = line[: _MAX_LENGTH - 1]
+            if len(text) + len(line) + 1 > _MAX_LENGTH:
+                yield text
+                text = ""
+            text += line + "\n"
+        if text:
+            yield text
+
+    async def flush(self):
+        from .. import asst
+
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+        lines, self._lines = self._lines, []
+        log_channel = self.settings.log_channel
+        if not (lines and log_channel):
+            return
+        for text in self._chunks(lines):
+            try:
+                await asst.send_message(log_channel, text, parse_mode=None)
+            except Exception as e:
+                LOGS.warning(
+                    f"Failed to send command log to log channel {log_channel}: {e}"
+                )
+                return
+
+
+CMD_LOG = CommandLogSink()
@@ -9,6 +9,7 @@ import asyncio
 import inspect
 import re
 import sys
+from contextlib import contextmanager
 from io import BytesIO
 from pathlib import Path
 from time import gmtime, strftime
@@ -31,7 +32,7 @@ from telethon.errors.rpcerrorlist import (
     MessageNotModifiedError,
     UserIsBotError,
 )
-from telethon.events import MessageEdited, NewMessage
+from telethon.events import MessageEdited
 from telethon.utils import get_display_name
 
 from pyUltroid.exceptions import DependencyMissingError
@@ -46,13 +47,31 @@ from ..fns.helper import bash
 from ..fns.helper import time_formatter as tf
 from ..version import __version__ as pyver
 from ..version import ultroid_version as ult_ver
-from . import SUDO_M, owner_and_sudos
+from . import SUDO_M, DBSettings, owner_and_sudos
+from ._cmdlog import CMD_LOG
+from ._dispatcher import CMD_DISPATCHER
 from ._wrappers import eod
 
 MANAGER = udB.get_key("MANAGER")
 TAKE_EDITS = udB.get_key("TAKE_EDITS")
 black_list_chats = udB.get_key("BLACKLIST_CHATS")
 allow_sudo = SUDO_M.should_allow_sudo
+_settings = DBSettings(i_dev="I_DEV")
+
+
+# Functions decorated while 'capture_commands' is active.
+_captured = None
+
+
+@contextmanager
+def capture_commands():
+    """Collect the functions 'ultroid_cmd' decorates meanwhile, in order."""
+    global _captured
+    _captured = found = []
+    try:
+        yield found
+    finally:
+        _captured = None
 
 
 def compile_pattern(data, hndlr):
@@ -77,22 +96,18 @@ def ultroid_cmd(
     func = kwargs.get("func", lambda e: not e.via_bot_id)
 
     def decor(dec):
+        if _captured is not None:
+            # Stacked decorators get the previous wrapper, keep the function
+            # itself so each lazy placeholder calls it through one wrapper.
+            _captured.append(getattr(dec, "__wrapped__", dec))
+
         async def wrapp(ult):
-            if udB.get_key("COMMAND_LOGGER"):
-                user_id = ult.sender_id
-                chat_id = ult.chat_id
-                command_name = pattern if pattern else ult.text.split()[0].lstrip(HNDLR)
-                chat_name = get_display_name(ult.chat)
-                LOGS.info(f"Command '{command_name}' executed by user ID {user_id} in chat {chat_id} ({chat_name})")
-                log_channel = udB.get_key("LOG_CHANNEL")
-                if log_channel:
-                    try:
-                        await asst.send_message(
-                            log_channel,
-                            f"Command '{command_name}' executed by user ID {user_id} in chat {chat_id} ({chat_name})"
-                        )
-                    except Exception as e:
-                        LOGS.warning(f"Failed to send command log to log channel {log_channel}: {e}")
+            if CMD_LOG.enabled:
+                command_name = pattern or ult.text.split()[0].lstrip(HNDLR)
+                CMD_LOG.log(
+                    f"Command '{command_name}' executed by user ID {ult.sender_id}"
+                    f" in chat {ult.chat_id} ({get_display_name(ult.chat)})"
+                )
             if not ult.out:
                 if owner_only:
                     return
@@ -117,7 +132,7 @@ def ultroid_cmd(
                 return await eod(ult, get_string("py_d3"))
             elif admins_only and not (chat.admin_rights or chat.creator):
                 return await eod(ult, get_string("py_d5"))
-            if only_devs and not udB.get_key("I_DEV"):
+            if only_devs and not _settings.i_dev:
                 return await eod(
                     ult,
                     get_string("py_d4").format(HNDLR),
@@ -223,6 +238,7 @@ def ultroid_cmd(
                         parse_mode="html",
                     )
 
+        wrapp.__wrapped__ = dec
         cmd = None
         blacklist_chats = False
         chats = None
@@ -233,44 +249,39 @@ def ultroid_cmd(
         if _add_new:
             if pattern:
                 cmd = compile_pattern(pattern, SUDO_HNDLR)
-            ultroid_bot.add_event_handler(
+            CMD_DISPATCHER.add(
+                ultroid_bot,
                 wrapp,
-                NewMessage(
-                    pattern=cmd,
-                    incoming=True,
-                    forwards=False,
-                    func=func,
-                    chats=chats,
-                    blacklist_chats=blacklist_chats,
-                ),
-            )
-        if pattern:
-            cmd = compile_pattern(pattern, HNDLR)
-        ultroid_bot.add_event_handler(
-            wrapp,
-            NewMessage(
-                outgoing=True if _add_new else None,
                 pattern=cmd,
-                forwards=False,
+                incoming=True,
                 func=func,
                 chats=chats,
                 blacklist_chats=blacklist_chats,
-            ),
+            )
+        if pattern:
+            cmd = compile_pattern(pattern, HNDLR)
+        CMD_DISPATCHER.add(
+            ultroid_bot,
+            wrapp,
+            pattern=cmd,
+            outgoing=True if _add_new else None,
+            func=func,
+            chats=chats,
+            blacklist_chats=blacklist_chats,
         )
         if TAKE_EDITS:
 
             def func_(x):
                 return not x.via_bot_id and not (x.is_channel and x.chat.broadcast)
 
-            ultroid_bot.add_event_handler(
+            CMD_DISPATCHER.add(
+                ultroid_bot,
                 wrapp,
-                MessageEdited(
-                    pattern=cmd,
-                    forwards=False,
-                    func=func_,
-                    chats=chats,
-                    blacklist_chats=blacklist_chats,
-                ),
+                pattern=cmd,
+                event=MessageEdited,
+                func=func_,
+                chats=chats,
+                blacklist_chats=blacklist_chats,
             )
         if manager and MANAGER:
             allow_all = kwargs.get("allow_all", False)
@@ -297,34 +308,32 @@ def ultroid_cmd(
                     LOGS.info(f"• MANAGER [{ult.chat_id}]:")
                     LOGS.exception(er)
 
+            manager_cmd.__wrapped__ = dec
+
             if pattern:
                 cmd = compile_pattern(pattern, "/")
-            asst.add_event_handler(
+            CMD_DISPATCHER.add(
+                asst,
                 manager_cmd,
-                NewMessage(
-                    pattern=cmd,
-                    forwards=False,
-                    incoming=True,
-                    func=func,
-                    chats=chats,
-                    blacklist_chats=blacklist_chats,
-                ),
+                pattern=cmd,
+                incoming=True,
+                func=func,
+                chats=chats,
+                blacklist_chats=blacklist_chats,
             )
         if DUAL_MODE and not (manager and DUAL_HNDLR == "/"):
             if pattern:
                 cmd = compile_pattern(pattern, DUAL_HNDLR)
-            asst.add_event_handler(
+            CMD_DISPATCHER.add(
+                asst,
                 wrapp,
-                NewMessage(
-                    pattern=cmd,
-                    incoming=True,
-                    forwards=False,
-                    func=func,
-                    chats=chats,
-                    blacklist_chats=blacklist_chats,
-                ),
+                pattern=cmd,
+                incoming=True,
+                func=func,
+                chats=chats,
+                blacklist_chats=blacklist_chats,
             )
-        file = Path(inspect.stack()[1].filename)
+        file = Path(kwargs.get("plugin_file") or inspect.stack()[1].filename)
         if "addons/" in str(file):
             if LOADED.get(file.stem):
                 LOADED[file.stem].append(wrapp)
@@ -332,7 +341,8 @@ def ultroid_cmd(
                 LOADED.update({file.stem: [wrapp]})
         if pattern:
             if LIST.get(file.stem):
-                LIST[file.stem].append(pattern)
+                if pattern not in LIST[file.stem]:
+                    LIST[file.stem].append(pattern)
             else:
                 LIST.update({file.stem: [pattern]})
         return wrapp
@@ -0,0 +1,240 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
+
+"""
+Routes command messages to their handlers through one event handler per
+client, instead of one `NewMessage` handler (and regex run) per command.
+
+Each command is indexed in a trie by the literal text its pattern has to
+start with (handler + command name), so for every message only the
+patterns sharing a prefix with the text are tried.
+"""
+
+import inspect
+from itertools import count
+
+from telethon import events
+
+from .. import LOGS
+
+_SPECIAL = set(".^$*+?{}[]\\|()")
+_END = None
+
+
+def _top_level_split(pattern):
+    """Split 'pattern' on '|' outside groups and classes, or None if unbalanced."""
+    parts, depth, start, i = [], 0, 0, 0
+    in_class = False
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and not depth:
+            parts.append(pattern[start:i])
+            start = i + 1
+        i += 1
+    if depth or in_class:
+        return
+    parts.append(pattern[start:])
+    return parts
+
+
+def _literal(pattern):
+    """Literal text every match of 'pattern' starts with, and the rest of it."""
+    text, i = "", 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\" and i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+            text += pattern[i + 1]
+            i += 2
+            continue
+        if char in _SPECIAL:
+            if char in "?*{":
+                # Last char is optional.
+                return text[:-1], ""
+            return text, pattern[i:] if char == "(" else ""
+        text += char
+        i += 1
+    return text, ""
+
+
+def _group_alternatives(pattern):
+    """Alternatives of a leading group made only of literals, like '(a|approve)'."""
+    if pattern.startswith("(?") and not pattern.startswith("(?:"):
+        return
+    start = 3 if pattern.startswith("(?:") else 1
+    depth = 1
+    for i in range(start, len(pattern)):
+        char = pattern[i]
+        if char in "\\[":
+            return
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        if not depth:
+            if pattern[i + 1 : i + 2] in ("?", "*", "{"):
+                return
+            alternatives = _top_level_split(pattern[start:i])
+            if alternatives and not any(set(alt) & _SPECIAL for alt in alternatives):
+                return alternatives
+            return
+
+
+def literal_prefixes(pattern):
+    """Literal prefixes covering every possible match of 'pattern'.
+
+    An empty prefix means the pattern can't be narrowed, and is tried on
+    every message.
+    """
+    parts = _top_level_split(pattern)
+    if parts is None:
+        return [""]
+    if len(parts) > 1:
+        return [prefix for part in parts for prefix in literal_prefixes(part)]
+    head, rest = _literal(pattern[1:] if pattern.startswith("^") else pattern)
+    if alternatives := _group_alternatives(rest):
+        return [head + alt for alt in alternatives]
+    return [head]
+
+
+class _Command:
+    __slots__ = ("order", "pattern", "callback", "incoming", "outgoing", "func")
+
+    def __init__(self, order, pattern, callback, incoming, outgoing, func):
+        self.order = order
+        self.pattern = pattern
+        self.callback = callback
+        self.incoming = incoming
+        self.outgoing = outgoing
+        self.func = func
+
+
+class _Route:
+    """Commands of one client and event type, with their prefix trie."""
+
+    def __init__(self):
+        self.trie = {}
+        self.commands = []
+
+    def add(self, prefix, command):
+        node = self.trie
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node.setdefault(_END, []).append(command)
+        self.commands.append(command)
+
+    def remove(self, callback):
+        def keep(cmd):
+            return callback not in (
+                cmd.callback,
+                getattr(cmd.callback, "__wrapped__", None),
+            )
+
+        def prune(node):
+            if _END in node:
+                node[_END] = list(filter(keep, node[_END]))
+            for char, child in node.items():
+                if char is not _END:
+                    prune(child)
+
+        prune(self.trie)
+        self.commands = list(filter(keep, self.commands))
+
+    def candidates(self, text):
+        node = self.trie
+        found = list(node.get(_END, ()))
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                break
+            found.extend(node.get(_END, ()))
+        if len(found) > 1:
+            found.sort(key=lambda cmd: cmd.order)
+        return found
+
+
+class CommandDispatcher:
+    def __init__(self):
+        self._routes = {}
+        self._order = count()
+
+    def add(
+        self,
+        client,
+        callback,
+        pattern=None,
+        event=events.NewMessage,
+        incoming=None,
+        outgoing=None,
+        func=None,
+        chats=None,
+        blacklist_chats=False,
+    ):
+        """Register 'callback' like 'client.add_event_handler(callback, event(...))'."""
+        key = (client, event, tuple(chats) if chats else None, blacklist_chats)
+        route = self._routes.get(key)
+        if not route:
+            route = self._routes[key] = _Route()
+            client.add_event_handler(
+                self._handler(route),
+                event(forwards=False, chats=chats, blacklist_chats=blacklist_chats),
+            )
+        if incoming is not None and outgoing is None:
+            outgoing = not incoming
+        command = _Command(
+            next(self._order), pattern, callback, incoming, outgoing, func
+        )
+        for prefix in literal_prefixes(pattern.pattern) if pattern else [""]:
+            route.add(prefix, command)
+
+    def remove(self, callback):
+        """Unregister 'callback', or every handler 'ultroid_cmd' made of it."""
+        for route in self._routes.values():
+            route.remove(callback)
+
+    def commands(self):
+        return sum(len(route.commands) for route in self._routes.values())
+
+    @staticmethod
+    def _handler(route):
+        async def dispatch(event):
+            text = event.message.message or ""
+            for cmd in route.candidates(text):
+                if cmd.incoming and event.message.out:
+                    continue
+                if cmd.outgoing and not event.message.out:
+                    continue
+                match = None
+                if cmd.pattern:
+                    match = cmd.pattern.match(text)
+                    if not match:
+                        continue
+                event.pattern_match = match
+                if cmd.func:
+                    allowed = cmd.func(event)
+                    if inspect.isawaitable(allowed):
+                        allowed = await allowed
+                    if not allowed:
+                        continue
+                try:
+                    await cmd.callback(event)
+                except events.StopPropagation:
+                    raise
+                except Exception as er:
+                    LOGS.exception(er)
+
+        return dispatch
+
+
+CMD_DISPATCHER = CommandDispatcher()
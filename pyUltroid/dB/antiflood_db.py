@@ -5,28 +5,150 @@
 # PLease read the GNU Affero General Public License in
 # <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
 
+import time
+from collections import deque
 
 from .. import udB
+from ..fns.cache import BoundedCache
+
+# Seconds a limit set without a window counts messages over.
+FLOOD_WINDOW = 10
+
+# (messages, seconds) of each chat, None for chats without a limit.
+_limits = {}
+
+
+def _reset_limits(key=None):
+    _limits.clear()
+
+
+udB.on_change(("ANTIFLOOD",), _reset_limits)
 
 
 def get_flood():
     return udB.get_key("ANTIFLOOD") or {}
 
 
-def set_flood(chat_id, limit):
-    omk = get_flood()
-    omk.update({chat_id: limit})
-    return udB.set_key("ANTIFLOOD", omk)
+def set_flood(chat_id, limit, window=None):
+    if window:
+        limit = [int(limit), int(window)]
+    return udB.hset("ANTIFLOOD", chat_id, limit)
 
 
 def get_flood_limit(chat_id):
-    omk = get_flood()
-    if chat_id in omk.keys():
-        return omk[chat_id]
+    return udB.hget("ANTIFLOOD", chat_id)
 
 
 def rem_flood(chat_id):
-    omk = get_flood()
-    if chat_id in omk.keys():
-        del omk[chat_id]
-        return udB.set_key("ANTIFLOOD", omk)
+    return udB.hdel("ANTIFLOOD", chat_id)
+
+
+def parse_limit(value):
+    """Stored limit, '5' or [5, 10], as (messages, seconds)."""
+    if isinstance(value, (list, tuple)):
+        # A window under a second, saved before those were rejected, would
+        # never hold more than one message.
+        window = int(value[1])
+        return int(value[0]), (window if window >= 1 else FLOOD_WINDOW)
+    return int(value), FLOOD_WINDOW
+
+
+def flood_limit(chat_id):
+    """(messages, seconds) allowed per sender in 'chat_id', cached in memory."""
+    if chat_id not in _limits:
+        value = udB.hget("ANTIFLOOD", chat_id)
+        _limits[chat_id] = parse_limit(value) if value else None
+    return _limits[chat_id]
+
+
+class _ChatWindow:
+    __slots__ = ("senders", "recent", "last", "burst_until")
+
+    def __init__(self, size):
+        # Timestamps of the last messages, per sender and for the whole chat.
+        self.senders = {}
+        self.recent = deque(maxlen=size)
+        self.last = 0
+        self.burst_until = 0
+
+
+class FloodTracker:
+    """Sliding-window message rates of flood-limited chats.
+
+    Each sender keeps a ring of its last 'limit' message times, so it floods
+    once 'limit' of them fall within the window. The chat keeps a ring of
+    'burst_senders' times as many (sender, time) pairs, to notice several
+    senders flooding together even if each stays under the limit. Chats and
+    senders quiet for a whole window are dropped.
+    """
+
+    def __init__(self, burst_senders=3, admin_ttl=300, sweep_every=60):
+        self.burst_senders = burst_senders
+        self.sweep_every = sweep_every
+        self._chats = {}
+        self._admins = BoundedCache("antiflood_admins", maxsize=5000, ttl=admin_ttl)
+        self._swept = time.monotonic()
+
+    def hit(self, chat_id, sender_id, limit, window):
+        """Record a message; returns "sender" if 'sender_id' is flooding,
+        "burst" the first time several senders flood 'chat_id' together."""
+        if limit < 1:
+            return
+        now = time.monotonic()
+        if now - self._swept > self.sweep_every:
+            self.sweep(now)
+        size = limit * self.burst_senders
+        chat = self._chats.get(chat_id)
+        if not chat or chat.recent.maxlen != size:
+            chat = self._chats[chat_id] = _ChatWindow(size)
+        chat.last = now
+        times = chat.senders.get(sender_id)
+        if times is None or times.maxlen != limit:
+            times = chat.senders[sender_id] = deque(maxlen=limit)
+        times.append(now)
+        chat.recent.append((sender_id, now))
+        if len(times) == limit and now - times[0] <= window:
+            times.clear()
+            return "sender"
+        if (
+            now >= chat.burst_until
+            and len(chat.recent) == size
+            and now - chat.recent[0][1] <= window
+            and len({sender for sender, _ in chat.recent}) >= self.burst_senders
+        ):
+            chat.burst_until = now + window
+            return "burst"
+
+    def forget(self, chat_id):
+        self._chats.pop(chat_id, None)
+
+    async def is_admin(self, event, check):
+        """Cached result of 'await check(event)' for the sender of 'event'."""
+        key = (event.chat_id, event.sender_id)
+        result = self._admins.get(key)
+        if result is None:
+            result = self._admins[key] = bool(await check(event))
+        return result
+
+    def sweep(self, now=None):
+        now = now or time.monotonic()
+        self._swept = now
+        for chat_id, chat in list(self._chats.items()):
+            limit = flood_limit(chat_id)
+            window = limit[1] if limit else 0
+            if now - chat.last > window:
+                del self._chats[chat_id]
+                continue
+            for sender, times in list(chat.senders.items()):
+                if not times or now - times[-1] > window:
+                    del chat.senders[sender]
+
+    def stats(self):
+        return {
+            "chats": len(self._chats),
+            "senders": sum(len(chat.senders) for chat in self._chats.values()),
+            "admins": len(self._admins),
+        }
+
+
+FLOOD_TRACKER = FloodTracker()
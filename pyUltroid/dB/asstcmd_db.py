@@ -14,16 +14,11 @@ def get_stuff():
 
 
 def add_cmd(cmd, msg, media, button):
-    ok = get_stuff()
-    ok.update({cmd: {"msg": msg, "media": media, "button": button}})
-    return udB.set_key("ASST_CMDS", ok)
+    return udB.hset("ASST_CMDS", cmd, {"msg": msg, "media": media, "button": button})
 
 
 def rem_cmd(cmd):
-    ok = get_stuff()
-    if ok.get(cmd):
-        ok.pop(cmd)
-        return udB.set_key("ASST_CMDS", ok)
+    return udB.hdel("ASST_CMDS", cmd)
 
 
 def cmd_reply(cmd):
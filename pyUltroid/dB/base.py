@@ -2,12 +2,21 @@ from .. import udB
 
 
 class KeyManager:
+    """Helper for a key holding a list or dict.
+
+    List keys ('cast=list') are kept as sets of members by 'udB', so
+    'contains' and 'count' don't walk the list, and 'add' and 'remove'
+    write a single member.
+    """
+
     def __init__(self, key, cast=None) -> None:
         self._key = key
         self._cast = cast
 
     def get(self):
         _data = udB.get_key(self._key)
+        if _data is None and callable(self._cast):
+            return self._cast()
         if self._cast and not isinstance(_data, self._cast):
             return [_data] if self._cast == list else self._cast(_data)
         return _data or (self._cast() if callable(self._cast) else self._cast)
@@ -16,9 +25,13 @@ class KeyManager:
         return self.get()[key]
 
     def count(self):
+        if self._cast == list:
+            return udB.scard(self._key)
         return len(self.get())
 
     def add(self, item):
+        if self._cast == list:
+            return udB.sadd(self._key, item)
         content = self.get()
         if content == None and callable(type(item)):
             content = type(item)()
@@ -31,6 +44,8 @@ class KeyManager:
         udB.set_key(self._key, content)
 
     def remove(self, item):
+        if self._cast == list:
+            return udB.srem(self._key, item)
         content = self.get()
         if isinstance(content, list) and item in content:
             content.remove(item)
@@ -41,4 +56,6 @@ class KeyManager:
         udB.set_key(self._key, content)
 
     def contains(self, item):
+        if self._cast == list:
+            return udB.sismember(self._key, item)
         return item in self.get()
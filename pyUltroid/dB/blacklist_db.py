@@ -6,6 +6,30 @@
 # <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
 
 from .. import udB
+from ..fns.automaton import Automaton
+
+# Automaton of each chat's blacklist, None for chats without any.
+_automata = {}
+_writing = False
+
+
+def _reset_automata(key=None):
+    # Our own writes update the automaton in place.
+    if not _writing:
+        _automata.clear()
+
+
+udB.on_change(("BLACKLIST_DB", "BLACKLIST_LEET"), _reset_automata)
+
+
+def _write(chat, words):
+    global _writing
+
+    _writing = True
+    try:
+        return udB.hset("BLACKLIST_DB", chat, words)
+    finally:
+        _writing = False
 
 
 def get_stuff():
@@ -13,21 +37,29 @@ def get_stuff():
 
 
 def add_blacklist(chat, word):
-    ok = get_stuff()
-    if ok.get(chat):
-        for z in word.split():
-            if z not in ok[chat]:
-                ok[chat].append(z)
+    words = udB.hget("BLACKLIST_DB", chat)
+    new = [z for z in word.split() if not (words and z in words)]
+    if words:
+        words.extend(new)
     else:
-        ok.update({chat: [word]})
-    return udB.set_key("BLACKLIST_DB", ok)
+        words = [word]
+    done = _write(chat, words)
+    if (automaton := _automata.get(chat)) is not None:
+        for z in new:
+            automaton.add(z)
+    else:
+        _automata.pop(chat, None)
+    return done
 
 
 def rem_blacklist(chat, word):
-    ok = get_stuff()
-    if ok.get(chat) and word in ok[chat]:
-        ok[chat].remove(word)
-        return udB.set_key("BLACKLIST_DB", ok)
+    words = udB.hget("BLACKLIST_DB", chat)
+    if words and word in words:
+        words.remove(word)
+        done = _write(chat, words)
+        if (automaton := _automata.get(chat)) is not None:
+            automaton.remove(word)
+        return done
 
 
 def list_blacklist(chat):
@@ -42,3 +74,15 @@ def get_blacklist(chat):
     ok = get_stuff()
     if ok.get(chat):
         return ok[chat]
+
+
+async def get_automaton(chat):
+    """Automaton of the blacklisted words of 'chat', None if it has none.
+
+    Leetspeak is folded too ('b4d' matches 'bad') if `BLACKLIST_LEET` is set.
+    """
+    if chat not in _automata:
+        words = await udB.ahget("BLACKLIST_DB", chat)
+        leet = bool(await udB.aget("BLACKLIST_LEET"))
+        _automata[chat] = Automaton(words, leet) if words else None
+    return _automata[chat]
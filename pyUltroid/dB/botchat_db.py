@@ -14,9 +14,7 @@ def get_stuff():
 
 
 def add_stuff(msg_id, user_id):
-    ok = get_stuff()
-    ok.update({msg_id: user_id})
-    return udB.set_key("BOTCHAT", ok)
+    return udB.hset("BOTCHAT", msg_id, user_id)
 
 
 def get_who(msg_id):
@@ -26,12 +24,9 @@ def get_who(msg_id):
 
 
 def tag_add(msg, chat, user):
-    ok = get_stuff()
-    if not ok.get("TAG"):
-        ok.update({"TAG": {msg: [chat, user]}})
-    else:
-        ok["TAG"].update({msg: [chat, user]})
-    return udB.set_key("BOTCHAT", ok)
+    tags = udB.hget("BOTCHAT", "TAG") or {}
+    tags.update({msg: [chat, user]})
+    return udB.hset("BOTCHAT", "TAG", tags)
 
 
 def who_tag(msg):
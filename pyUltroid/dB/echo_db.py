@@ -13,23 +13,19 @@ def get_stuff():
 
 
 def add_echo(chat, user):
-    x = get_stuff()
-    if k := x.get(int(chat)):
+    if k := udB.hget("ECHO", int(chat)):
         if user not in k:
             k.append(int(user))
-        x.update({int(chat): k})
     else:
-        x.update({int(chat): [int(user)]})
-    return udB.set_key("ECHO", x)
+        k = [int(user)]
+    return udB.hset("ECHO", int(chat), k)
 
 
 def rem_echo(chat, user):
-    x = get_stuff()
-    if k := x.get(int(chat)):
+    if k := udB.hget("ECHO", int(chat)):
         if user in k:
             k.remove(int(user))
-        x.update({int(chat): k})
-    return udB.set_key("ECHO", x)
+        return udB.hset("ECHO", int(chat), k)
 
 
 def check_echo(chat, user):
@@ -13,9 +13,7 @@ def get_stored():
 
 
 def store_msg(hash, msg_id):
-    all = get_stored()
-    all.update({hash: msg_id})
-    return udB.set_key("FILE_STORE", all)
+    return udB.hset("FILE_STORE", hash, msg_id)
 
 
 def list_all_stored_msgs():
@@ -24,12 +22,8 @@ def list_all_stored_msgs():
 
 
 def get_stored_msg(hash):
-    all = get_stored()
-    if all.get(hash):
-        return all[hash]
+    return udB.hget("FILE_STORE", hash)
 
 
 def del_stored(hash):
-    all = get_stored()
-    all.pop(hash)
-    return udB.set_key("FILE_STORE", all)
+    return udB.hdel("FILE_STORE", hash)
@@ -5,43 +5,86 @@
 # PLease read the GNU Affero General Public License in
 # <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
 
+import re
+
 from .. import udB
 
+# Compiled matcher of each chat's filter words, None for chats without any.
+_matchers = {}
+
+
+def _reset_matchers(key=None):
+    _matchers.clear()
+
+
+udB.on_change(("FILTERS",), _reset_matchers)
+
 
 def get_stuff():
     return udB.get_key("FILTERS") or {}
 
 
 def add_filter(chat, word, msg, media, button):
-    ok = get_stuff()
-    if ok.get(chat):
-        ok[chat].update({word: {"msg": msg, "media": media, "button": button}})
-    else:
-        ok.update({chat: {word: {"msg": msg, "media": media, "button": button}}})
-    udB.set_key("FILTERS", ok)
+    ok = udB.hget("FILTERS", chat) or {}
+    ok.update({word: {"msg": msg, "media": media, "button": button}})
+    udB.hset("FILTERS", chat, ok)
 
 
 def rem_filter(chat, word):
-    ok = get_stuff()
-    if ok.get(chat) and ok[chat].get(word):
-        ok[chat].pop(word)
-        udB.set_key("FILTERS", ok)
+    ok = udB.hget("FILTERS", chat)
+    if ok and ok.get(word):
+        ok.pop(word)
+        if ok:
+            udB.hset("FILTERS", chat, ok)
+        else:
+            udB.hdel("FILTERS", chat)
 
 
 def rem_all_filter(chat):
-    ok = get_stuff()
-    if ok.get(chat):
-        ok.pop(chat)
-        udB.set_key("FILTERS", ok)
+    udB.hdel("FILTERS", chat)
 
 
 def get_filter(chat):
-    ok = get_stuff()
-    if ok.get(chat):
-        return ok[chat]
+    return udB.hget("FILTERS", chat)
 
 
 def list_filter(chat):
-    ok = get_stuff()
-    if ok.get(chat):
-        return "".join(f"👉 `{z}`\n" for z in ok[chat])
+    if ok := udB.hget("FILTERS", chat):
+        return "".join(f"👉 `{z}`\n" for z in ok)
+
+
+_word_char = re.compile(r"\w")
+
+
+def _compile(words):
+    # Longest first, so the longest word starting at a position is found.
+    # Shorter ones matching there are prefixes of it, checked apart.
+    words = sorted(words, key=len, reverse=True)
+    regex = re.compile(
+        r"(?<!\w)(?=(" + "|".join(map(re.escape, words)) + r")(?!\w))"
+    )
+    prefixes = {
+        word: [other for other in words if other != word and word.startswith(other)]
+        for word in words
+    }
+
+    def find(text):
+        found = set()
+        for match in regex.finditer(text):
+            word = match.group(1)
+            found.add(word)
+            for other in prefixes[word]:
+                if not _word_char.match(text, match.start() + len(other)):
+                    found.add(other)
+        return found
+
+    return find
+
+
+async def get_matcher(chat):
+    """Function giving the filter words of 'chat' found as whole words in
+    lowercased text, in one pass; None if the chat has no filters."""
+    if chat not in _matchers:
+        filters = await udB.ahget("FILTERS", chat)
+        _matchers[chat] = _compile(filters) if filters else None
+    return _matchers[chat]
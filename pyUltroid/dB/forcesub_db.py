@@ -14,22 +14,12 @@ def get_chats():
 
 
 def add_forcesub(chat_id, chattojoin):
-    omk = get_chats()
-    omk.update({chat_id: chattojoin})
-    return udB.set_key("FORCESUB", omk)
+    return udB.hset("FORCESUB", chat_id, chattojoin)
 
 
 def get_forcesetting(chat_id):
-    omk = get_chats()
-    if chat_id in omk.keys():
-        return omk[chat_id]
+    return udB.hget("FORCESUB", chat_id)
 
 
 def rem_forcesub(chat_id):
-    omk = get_chats()
-    if chat_id in omk.keys():
-        try:
-            del omk[chat_id]
-            return udB.set_key("FORCESUB", omk)
-        except KeyError:
-            return False
+    return udB.hdel("FORCESUB", chat_id)
@@ -13,22 +13,15 @@ def list_gbanned():
 
 
 def gban(user, reason):
-    ok = list_gbanned()
-    ok.update({int(user): reason or "No Reason. "})
-    return udB.set_key("GBAN", ok)
+    return udB.hset("GBAN", int(user), reason or "No Reason. ")
 
 
 def ungban(user):
-    ok = list_gbanned()
-    if ok.get(int(user)):
-        del ok[int(user)]
-        return udB.set_key("GBAN", ok)
+    return udB.hdel("GBAN", int(user))
 
 
 def is_gbanned(user):
-    ok = list_gbanned()
-    if ok.get(int(user)):
-        return ok[int(user)]
+    return udB.hget("GBAN", int(user))
 
 
 def gmute(user):
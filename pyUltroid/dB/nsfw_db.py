@@ -14,38 +14,24 @@ def get_stuff(key="NSFW"):
 
 
 def nsfw_chat(chat, action):
-    x = get_stuff()
-    x.update({chat: action})
-    return udB.set_key("NSFW", x)
+    return udB.hset("NSFW", chat, action)
 
 
 def rem_nsfw(chat):
-    x = get_stuff()
-    if x.get(chat):
-        x.pop(chat)
-        return udB.set_key("NSFW", x)
+    return udB.hdel("NSFW", chat)
 
 
 def is_nsfw(chat):
-    x = get_stuff()
-    if x.get(chat):
-        return x[chat]
+    return udB.hget("NSFW", chat)
 
 
 def profan_chat(chat, action):
-    x = get_stuff("PROFANITY")
-    x.update({chat: action})
-    return udB.set_key("PROFANITY", x)
+    return udB.hset("PROFANITY", chat, action)
 
 
 def rem_profan(chat):
-    x = get_stuff("PROFANITY")
-    if x.get(chat):
-        x.pop(chat)
-        return udB.set_key("PROFANITY", x)
+    return udB.hdel("PROFANITY", chat)
 
 
 def is_profan(chat):
-    x = get_stuff("PROFANITY")
-    if x.get(chat):
-        return x[chat]
+    return udB.hget("PROFANITY", chat)
@@ -6,20 +6,24 @@ import hashlib
 import logging
 import math
 import os
-from collections import defaultdict
+import weakref
+from collections import deque
 from typing import (
     AsyncGenerator,
     Awaitable,
     BinaryIO,
-    DefaultDict,
+    Collection,
+    Dict,
     List,
     Optional,
+    Set,
     Tuple,
     Union,
 )
 
 from telethon import TelegramClient, helpers, utils
 from telethon.crypto import AuthKey
+from telethon.errors import FloodWaitError
 from telethon.helpers import _maybe_await
 from telethon.network import MTProtoSender
 from telethon.tl.alltlobjects import LAYER
@@ -59,31 +63,21 @@ class DownloadSender:
     client: TelegramClient
     sender: MTProtoSender
     request: GetFileRequest
-    remaining: int
-    stride: int
 
     def __init__(
         self,
         client: TelegramClient,
         sender: MTProtoSender,
         file: TypeLocation,
-        offset: int,
         limit: int,
-        stride: int,
-        count: int,
     ) -> None:
         self.sender = sender
         self.client = client
-        self.request = GetFileRequest(file, offset=offset, limit=limit)
-        self.stride = stride
-        self.remaining = count
+        self.request = GetFileRequest(file, offset=0, limit=limit)
 
-    async def next(self) -> Optional[bytes]:
-        if not self.remaining:
-            return None
+    async def fetch(self, offset: int) -> bytes:
+        self.request.offset = offset
         result = await self.client._call(self.sender, self.request)
-        self.remaining -= 1
-        self.request.offset += self.stride
         return result.bytes
 
     def disconnect(self) -> Awaitable[None]:
@@ -137,12 +131,152 @@ class UploadSender:
         return await self.sender.disconnect()
 
 
+class SenderPool:
+    """Authorized senders of one client, kept per DC and reused by transfers.
+
+    All transfers of the process share a budget of 'max_senders' open
+    senders, since Telegram limits connections per account. Released
+    senders stay connected for 'idle_timeout' seconds.
+    """
+
+    max_senders: int = 20
+    idle_timeout: float = 60
+    _budget: Optional[asyncio.Semaphore] = None
+    _pools: "weakref.WeakKeyDictionary[TelegramClient, SenderPool]" = (
+        weakref.WeakKeyDictionary()
+    )
+
+    def __init__(self, client: TelegramClient) -> None:
+        self.client = client
+        self._idle: Dict[int, List[Tuple[MTProtoSender, float]]] = {}
+        self._auth_keys: Dict[int, AuthKey] = {}
+        self._auth_lock = asyncio.Lock()
+        self._reaper: Optional[asyncio.TimerHandle] = None
+        self.stats = {"created": 0, "reused": 0, "exported": 0, "in_use": 0}
+
+    @classmethod
+    def of(cls, client: TelegramClient) -> "SenderPool":
+        if client not in cls._pools:
+            cls._pools[client] = cls(client)
+        return cls._pools[client]
+
+    @classmethod
+    def metrics(cls) -> dict:
+        return {
+            "budget": cls.max_senders,
+            "clients": [
+                {
+                    **pool.stats,
+                    "idle": sum(map(len, pool._idle.values())),
+                }
+                for pool in cls._pools.values()
+            ],
+        }
+
+    @classmethod
+    def _get_budget(cls) -> asyncio.Semaphore:
+        if not cls._budget:
+            cls._budget = asyncio.Semaphore(cls.max_senders)
+        return cls._budget
+
+    async def acquire(
+        self, dc_id: int, wait: bool = True
+    ) -> Optional[MTProtoSender]:
+        """Sender for 'dc_id', or None if the budget is used up and not 'wait'."""
+        budget = self._get_budget()
+        if not wait and budget.locked():
+            return None
+        await budget.acquire()
+        try:
+            sender = self._take_idle(dc_id) or await self._create(dc_id)
+        except BaseException:
+            budget.release()
+            raise
+        self.stats["in_use"] += 1
+        return sender
+
+    async def release(self, dc_id: int, sender: MTProtoSender) -> None:
+        self.stats["in_use"] -= 1
+        self._get_budget().release()
+        if not sender.is_connected():
+            return
+        self._idle.setdefault(dc_id, []).append((sender, self.client.loop.time()))
+        if not self._reaper:
+            self._reaper = self.client.loop.call_later(
+                self.idle_timeout, lambda: self.client.loop.create_task(self._reap())
+            )
+
+    def _take_idle(self, dc_id: int) -> Optional[MTProtoSender]:
+        idle = self._idle.get(dc_id)
+        while idle:
+            sender, _ = idle.pop()
+            if sender.is_connected():
+                self.stats["reused"] += 1
+                return sender
+
+    async def _reap(self) -> None:
+        self._reaper = None
+        deadline = self.client.loop.time() - self.idle_timeout
+        expired = []
+        for dc_id, idle in self._idle.items():
+            expired.extend(sender for sender, since in idle if since <= deadline)
+            idle[:] = [(sender, since) for sender, since in idle if since > deadline]
+        await asyncio.gather(
+            *[sender.disconnect() for sender in expired], return_exceptions=True
+        )
+        if any(self._idle.values()):
+            self._reaper = self.client.loop.call_later(
+                self.idle_timeout, lambda: self.client.loop.create_task(self._reap())
+            )
+
+    def _auth_key(self, dc_id: int) -> Optional[AuthKey]:
+        if dc_id == self.client.session.dc_id:
+            return self.client.session.auth_key
+        return self._auth_keys.get(dc_id)
+
+    async def _connect(
+        self, dc_id: int, auth_key: Optional[AuthKey]
+    ) -> MTProtoSender:
+        dc = await self.client._get_dc(dc_id)
+        sender = MTProtoSender(auth_key, loggers=self.client._log)
+        await sender.connect(
+            self.client._connection(
+                dc.ip_address,
+                dc.port,
+                dc.id,
+                loggers=self.client._log,
+                proxy=self.client._proxy,
+            )
+        )
+        self.stats["created"] += 1
+        return sender
+
+    async def _create(self, dc_id: int) -> MTProtoSender:
+        if auth_key := self._auth_key(dc_id):
+            return await self._connect(dc_id, auth_key)
+        # The first sender of a foreign DC exports+imports the authorization,
+        # the others wait for it and reuse its key.
+        async with self._auth_lock:
+            if auth_key := self._auth_key(dc_id):
+                return await self._connect(dc_id, auth_key)
+            sender = await self._connect(dc_id, None)
+            auth = await self.client(ExportAuthorizationRequest(dc_id))
+            self.client._init_request.query = ImportAuthorizationRequest(
+                id=auth.id, bytes=auth.bytes
+            )
+            req = InvokeWithLayerRequest(LAYER, self.client._init_request)
+            await sender.send(req)
+            self._auth_keys[dc_id] = sender.auth_key
+            self.stats["exported"] += 1
+            return sender
+
+
 class ParallelTransferrer:
     client: TelegramClient
     loop: asyncio.AbstractEventLoop
     dc_id: int
     senders: Optional[List[Union[DownloadSender, UploadSender]]]
-    auth_key: AuthKey
+    pool: SenderPool
     upload_ticker: int
 
     def __init__(self, client: TelegramClient, dc_id: Optional[int] = None) -> None:
@@ -153,11 +287,7 @@ class ParallelTransferrer:
             pass
         self.loop = self.client.loop
         self.dc_id = dc_id or self.client.session.dc_id
-        self.auth_key = (
-            None
-            if dc_id and self.client.session.dc_id != dc_id
-            else self.client.session.auth_key
-        )
+        self.pool = SenderPool.of(self.client)
         self.senders = None
         self.upload_ticker = 0
         try:
@@ -165,9 +295,22 @@ class ParallelTransferrer:
         except AttributeError:
             pass
 
+    async def _release(self, sender: Union[DownloadSender, UploadSender]) -> None:
+        try:
+            if getattr(sender, "previous", None):
+                await sender.previous
+        finally:
+            await self.pool.release(self.dc_id, sender.sender)
+
     async def _cleanup(self) -> None:
-        await asyncio.gather(*[sender.disconnect() for sender in self.senders])
-        self.senders = None
+        senders, self.senders = self.senders or [], None
+        results = await asyncio.gather(
+            *[self._release(sender) for sender in senders],
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
 
     @staticmethod
     def _get_connection_count(
@@ -178,100 +321,39 @@ class ParallelTransferrer:
             return 20
         return math.ceil((file_size / full_size) * 20)
 
-    async def _init_download(
-        self, connections: int, file: TypeLocation, part_count: int, part_size: int
-    ) -> None:
-        minimum, remainder = divmod(part_count, connections)
-
-        def get_part_count() -> int:
-            nonlocal remainder
-            if remainder > 0:
-                remainder -= 1
-                return minimum + 1
-            return minimum
-
-        # The first cross-DC sender will export+import the authorization, so we always create it
-        # before creating any other senders.
-        self.senders = [
-            await self._create_download_sender(
-                file, 0, part_size, connections * part_size, get_part_count()
-            ),
-            *await asyncio.gather(
-                *[
-                    self._create_download_sender(
-                        file, i, part_size, connections * part_size, get_part_count()
-                    )
-                    for i in range(1, connections)
-                ]
-            ),
-        ]
-
     async def _create_download_sender(
-        self,
-        file: TypeLocation,
-        index: int,
-        part_size: int,
-        stride: int,
-        part_count: int,
+        self, file: TypeLocation, part_size: int
     ) -> DownloadSender:
-        return DownloadSender(
-            self.client,
-            await self._create_sender(),
-            file,
-            index * part_size,
-            part_size,
-            stride,
-            part_count,
-        )
+        return DownloadSender(self.client, await self._create_sender(), file, part_size)
 
     async def _init_upload(
         self, connections: int, file_id: int, part_count: int, big: bool
     ) -> None:
-        self.senders = [
-            await self._create_upload_sender(file_id, part_count, big, 0, connections),
+        # Only the first sender waits for the budget, the upload goes on
+        # with as many of the others as are free.
+        senders = [
+            await self._create_sender(),
             *await asyncio.gather(
-                *[
-                    self._create_upload_sender(file_id, part_count, big, i, connections)
-                    for i in range(1, connections)
-                ]
+                *[self._create_sender(wait=False) for _ in range(1, connections)]
             ),
         ]
-
-    async def _create_upload_sender(
-        self, file_id: int, part_count: int, big: bool, index: int, stride: int
-    ) -> UploadSender:
-        return UploadSender(
-            self.client,
-            await self._create_sender(),
-            file_id,
-            part_count,
-            big,
-            index,
-            stride,
-            loop=self.loop,
-        )
-
-    async def _create_sender(self) -> MTProtoSender:
-        dc = await self.client._get_dc(self.dc_id)
-        sender = MTProtoSender(self.auth_key, loggers=self.client._log)
-        await sender.connect(
-            self.client._connection(
-                dc.ip_address,
-                dc.port,
-                dc.id,
-                loggers=self.client._log,
-                proxy=self.client._proxy,
-            )
-        )
-        if not self.auth_key:
-            auth = await self.client(ExportAuthorizationRequest(self.dc_id))
-            self.client._init_request.query = ImportAuthorizationRequest(
-                id=auth.id, bytes=auth.bytes
+        senders = [sender for sender in senders if sender]
+        self.senders = [
+            UploadSender(
+                self.client,
+                sender,
+                file_id,
+                part_count,
+                big,
+                index,
+                len(senders),
+                loop=self.loop,
             )
-            req = InvokeWithLayerRequest(LAYER, self.client._init_request)
-            await sender.send(req)
-            self.auth_key = sender.auth_key
-        return sender
+            for index, sender in enumerate(senders)
+        ]
+
+    async def _create_sender(self, wait: bool = True) -> Optional[MTProtoSender]:
+        return await self.pool.acquire(self.dc_id, wait)
 
     async def init_upload(
         self,
@@ -294,33 +376,135 @@ class ParallelTransferrer:
     async def finish_upload(self) -> None:
         await self._cleanup()
 
-    async def download(
+    async def _fetch(
+        self, sender: DownloadSender, offset: int, retries: int
+    ) -> bytes:
+        for attempt in range(retries):
+            try:
+                return await sender.fetch(offset)
+            except FloodWaitError as er:
+                await asyncio.sleep(er.seconds)
+            except Exception as er:
+                if attempt == retries - 1:
+                    raise
+                log.debug(f"Part at {offset} failed ({er}), retrying.")
+                await asyncio.sleep(2**attempt)
+        raise ConnectionError(f"Part at {offset} failed {retries} times.")
+
+    async def download_parts(
         self,
         file: TypeLocation,
         file_size: int,
         part_size_kb: Optional[float] = None,
         connection_count: Optional[int] = None,
-    ) -> AsyncGenerator[bytes, None]:
-        connection_count = connection_count or self._get_connection_count(file_size)
-        part_size = (part_size_kb or utils.get_appropriated_part_size(file_size)) * 1024
-        part_count = math.ceil(file_size / part_size)
-        await self._init_download(connection_count, file, part_count, part_size)
-
-        part = 0
-        while part < part_count:
-            tasks = [self.loop.create_task(sender.next()) for sender in self.senders]
+        skip: Collection[int] = (),
+        retries: int = 5,
+        ahead: Optional[int] = None,
+    ) -> AsyncGenerator[Tuple[int, bytes], None]:
+        """Yield '(index, data)' for each part not in 'skip', as parts arrive.
+
+        Every sender takes the next missing part once it's done with its
+        last one, so a slow connection never holds back the others.
+        Without 'connection_count', senders are added two at a time while
+        throughput keeps improving, up to '_get_connection_count'.
+        With 'ahead', no part is started 'ahead' parts or more past the
+        first one not received yet.
+        """
+        part_size = part_size_kb or utils.get_appropriated_part_size(file_size)
+        part_size = int(part_size * 1024)
+        pending = deque(
+            i for i in range(math.ceil(file_size / part_size)) if i not in skip
+        )
+        total = len(pending)
+        if not total:
+            return
+        limit = connection_count or self._get_connection_count(file_size)
+        # Fetched parts not written yet, at most two per sender.
+        results = asyncio.Queue(maxsize=2 * limit)
+        tasks, self.senders = [], []
+        # First part not received yet, and those received past it.
+        first, arrived = pending[0], set()
+        moved = asyncio.Condition()
+
+        def may_start() -> bool:
+            return not (ahead and pending) or pending[0] < first + ahead
+
+        async def worker(sender: Optional[DownloadSender] = None) -> None:
+            try:
+                if not sender:
+                    sender = await self._create_download_sender(file, part_size)
+                    self.senders.append(sender)
+                while pending:
+                    if not may_start():
+                        async with moved:
+                            await moved.wait_for(may_start)
+                        continue
+                    index = pending.popleft()
+                    data = await self._fetch(sender, index * part_size, retries)
+                    await results.put((index, data))
+            except Exception as er:
+                await results.put((None, er))
+
+        async def spawn(count: int) -> None:
+            # The first cross-DC sender exports+imports the authorization,
+            # so it's created before any other one.
+            if not tasks:
+                sender = await self._create_download_sender(file, part_size)
+                self.senders.append(sender)
+                tasks.append(self.loop.create_task(worker(sender)))
+                count -= 1
+            tasks.extend(self.loop.create_task(worker()) for _ in range(count))
+
+        adaptive = not connection_count
+        await spawn(min(4, limit) if adaptive else limit)
+        best, received, since = 0, 0, self.loop.time()
+        try:
+            for _ in range(total):
+                index, data = await results.get()
+                if index is None:
+                    raise data
+                if ahead:
+                    arrived.add(index)
+                    while first in arrived or first in skip:
+                        arrived.discard(first)
+                        first += 1
+                    async with moved:
+                        moved.notify_all()
+                yield index, data
+                received += len(data)
+                elapsed = self.loop.time() - since
+                if adaptive and elapsed >= 1 and len(tasks) < limit and pending:
+                    rate = received / elapsed
+                    if rate > best * 1.1:
+                        best = rate
+                        await spawn(min(2, limit - len(tasks)))
+                    else:
+                        adaptive = False
+                    received, since = 0, self.loop.time()
+        finally:
             for task in tasks:
-                data = await task
-                if not data:
-                    break
-                yield data
-                part += 1
-        await self._cleanup()
-
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._cleanup()
 
-parallel_transfer_locks: DefaultDict[int, asyncio.Lock] = defaultdict(
-    lambda: asyncio.Lock()
-)
+    async def download(
+        self,
+        file: TypeLocation,
+        file_size: int,
+        part_size_kb: Optional[float] = None,
+        connection_count: Optional[int] = None,
+    ) -> AsyncGenerator[bytes, None]:
+        """In-order variant of 'download_parts'."""
+        # Parts that arrived early wait in 'ready', at most 'ahead' of them.
+        ahead = 2 * (connection_count or self._get_connection_count(file_size))
+        ready, expected = {}, 0
+        async for index, data in self.download_parts(
+            file, file_size, part_size_kb, connection_count, ahead=ahead
+        ):
+            ready[index] = data
+            while expected in ready:
+                yield ready.pop(expected)
+                expected += 1
 
 
 def stream_file(file_to_stream: BinaryIO, chunk_size=1024):
@@ -336,6 +520,7 @@ async def _internal_transfer_to_telegram(
     response: BinaryIO,
     filename: str,
     progress_callback: callable,
+    hasher=None,
 ) -> Tuple[TypeInputFile, int]:
     file_id = helpers.generate_random_long()
     file_size = os.path.getsize(response.name)
@@ -343,53 +528,104 @@ async def _internal_transfer_to_telegram(
     hash_md5 = hashlib.md5()
     uploader = ParallelTransferrer(client)
     part_size, part_count, is_large = await uploader.init_upload(file_id, file_size)
-    buffer = bytearray()
-    for data in stream_file(response):
-        if progress_callback:
-            try:
-                await _maybe_await(progress_callback(response.tell(), file_size))
-            except BaseException:
-                pass
+
+    def read_part() -> bytes:
+        # A whole part in one read, straight into the bytes object sent.
+        # MD5 releases the GIL, so hashing runs alongside the uploads.
+        data = response.read(part_size)
         if not is_large:
             hash_md5.update(data)
-        if len(buffer) == 0 and len(data) == part_size:
+        if hasher:
+            hasher.update(data)
+        return data
+
+    # The next part is read in a thread while the current one is sent.
+    reading = uploader.loop.run_in_executor(None, read_part)
+    uploaded = 0
+    try:
+        while data := await reading:
+            reading = uploader.loop.run_in_executor(None, read_part)
             await uploader.upload(data)
-            continue
-        new_len = len(buffer) + len(data)
-        if new_len >= part_size:
-            cutoff = part_size - len(buffer)
-            buffer.extend(data[:cutoff])
-            await uploader.upload(bytes(buffer))
-            buffer.clear()
-            buffer.extend(data[cutoff:])
-        else:
-            buffer.extend(data)
-    if len(buffer) > 0:
-        await uploader.upload(bytes(buffer))
-    await uploader.finish_upload()
+            uploaded += len(data)
+            if progress_callback:
+                try:
+                    await _maybe_await(progress_callback(uploaded, file_size))
+                except BaseException:
+                    pass
+    finally:
+        await asyncio.wait([reading])
+        await uploader.finish_upload()
     if is_large:
         return InputFileBig(file_id, part_count, filename), file_size
     return InputFile(file_id, part_count, filename, hash_md5.hexdigest()), file_size
 
 
+def _read_checkpoint(path: str, header: str) -> Set[int]:
+    try:
+        with open(path) as file:
+            if file.readline().strip() != header:
+                return set()
+            return {int(line) for line in file if line.strip().isdigit()}
+    except OSError:
+        return set()
+
+
 async def download_file(
     client: TelegramClient,
     location: TypeLocation,
     out: BinaryIO,
     progress_callback: callable = None,
+    checkpoint: Optional[str] = None,
 ) -> BinaryIO:
+    """Download 'location' into 'out', writing parts at their offsets.
+
+    With 'checkpoint', the indexes of written parts are appended to that
+    file, and a later call with the same 'out' and 'checkpoint' only
+    fetches the missing ones.
+    """
     size = location.size
     dc_id, location = utils.get_input_location(location)
-    # We lock the transfers because telegram has connection count limits
+    part_size = utils.get_appropriated_part_size(size) * 1024
+    header = f"{size} {part_size} {getattr(location, 'id', '')}"
+    done = _read_checkpoint(checkpoint, header) if checkpoint else set()
+    if not done:
+        # Nothing reusable, drop what an older download left in 'out'.
+        out.truncate(0)
+    log_file = None
+    if checkpoint:
+        log_file = open(checkpoint, "a" if done else "w")
+        if not done:
+            log_file.write(header + "\n")
+    completed = sum(min(part_size, size - i * part_size) for i in done)
+    fd = out.fileno()
+    pwrite = getattr(os, "pwrite", None)
+    # Senders come from the client's SenderPool, within its connection budget.
     downloader = ParallelTransferrer(client, dc_id)
-    downloaded = downloader.download(location, size)
-    async for x in downloaded:
-        out.write(x)
-        if progress_callback:
-            try:
-                await _maybe_await(progress_callback(out.tell(), size))
-            except BaseException:
-                pass
+    try:
+        async for index, data in downloader.download_parts(
+            location, size, skip=done
+        ):
+            if pwrite:
+                pwrite(fd, data, index * part_size)
+            else:
+                out.seek(index * part_size)
+                out.write(data)
+                out.flush()
+            if log_file:
+                log_file.write(f"{index}\n")
+            completed += len(data)
+            if progress_callback:
+                try:
+                    await _maybe_await(progress_callback(completed, size))
+                except BaseException:
+                    pass
+    finally:
+        if log_file:
+            log_file.close()
+    if checkpoint:
+        os.remove(checkpoint)
+    out.truncate(size)
+    out.seek(0, os.SEEK_END)
     return out
 
 
@@ -398,7 +634,11 @@ async def upload_file(
     file: BinaryIO,
     filename: str,
     progress_callback: callable = None,
+    hasher=None,
 ) -> TypeInputFile:
+    """Upload 'file', feeding its content to 'hasher' as well if given."""
     return (
-        await _internal_transfer_to_telegram(client, file, filename, progress_callback)
+        await _internal_transfer_to_telegram(
+            client, file, filename, progress_callback, hasher
+        )
     )[0]
@@ -0,0 +1,121 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
+
+"""
+Multi-word matching in one pass over the text, for word lists (like chat
+blacklists) too long to check word by word on every message.
+"""
+
+import unicodedata
+from collections import deque
+
+_LEET = str.maketrans("0134578@$", "oieastbas")
+
+
+def normalize(text, leet=False):
+    """Casefolded 'text' without accents, compatibility forms or repeated
+    spaces (so 'Ｂád  wórd' reads 'bad word'), with leetspeak folded to
+    letters if 'leet'."""
+    if text.isascii():
+        text = text.lower()
+    else:
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    text = " ".join(text.split())
+    return text.translate(_LEET) if leet else text
+
+
+def _is_word(char):
+    return char.isalnum() or char == "_"
+
+
+class Automaton:
+    """Aho-Corasick automaton finding blacklisted words as whole words in one
+    pass over the text, whatever the number of words.
+
+    Words are added to and removed from the trie in place; the failure links
+    are recomputed on the next search after a change.
+    """
+
+    def __init__(self, words=(), leet=False):
+        self.leet = leet
+        self._goto = [{}]
+        self._words = [None]
+        self._fail = []
+        self._out = []
+        for word in words:
+            self.add(word)
+
+    def __len__(self):
+        return sum(word is not None for word in self._words)
+
+    def _node(self, word):
+        node = 0
+        for char in word:
+            node = self._goto[node].get(char)
+            if node is None:
+                return
+        return node
+
+    def add(self, word):
+        word = normalize(word, self.leet).strip()
+        if not word:
+            return
+        node = 0
+        for char in word:
+            child = self._goto[node].get(char)
+            if child is None:
+                child = self._goto[node][char] = len(self._goto)
+                self._goto.append({})
+                self._words.append(None)
+            node = child
+        self._words[node] = word
+        self._fail = []
+
+    def remove(self, word):
+        node = self._node(normalize(word, self.leet).strip())
+        if node and self._words[node] is not None:
+            self._words[node] = None
+            self._fail = []
+
+    def _link(self):
+        fail = [0] * len(self._goto)
+        out = [()] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        for node in queue:
+            if self._words[node] is not None:
+                out[node] = (self._words[node],)
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                state = fail[node]
+                while state and char not in self._goto[state]:
+                    state = fail[state]
+                fail[child] = self._goto[state].get(char, 0)
+                word = self._words[child]
+                out[child] = ((word,) if word is not None else ()) + out[fail[child]]
+                queue.append(child)
+        self._fail, self._out = fail, out
+
+    def search(self, text):
+        """First blacklisted word found in 'text', or None."""
+        if not self._fail:
+            self._link()
+        text = normalize(text, self.leet)
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for word in out[node]:
+                start = end - len(word)
+                if _is_word(word[0]) and start and _is_word(text[start - 1]):
+                    continue
+                if _is_word(word[-1]) and end < len(text) and _is_word(text[end]):
+                    continue
+                return word
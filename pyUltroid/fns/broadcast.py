@@ -0,0 +1,313 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
+
+"""
+Broadcast engine for sending one message to many chats.
+
+Sends run on a few workers behind a shared token bucket, a FloodWait pauses
+every worker and retries the chat, and the status message is edited every
+few seconds instead of after every send. The job is saved to the database
+as it goes, so a broadcast interrupted by a restart resumes where it was.
+"""
+
+import asyncio
+import time
+
+from telethon.errors import FloodWaitError
+
+from .. import LOGS, udB
+from .helper import time_formatter
+
+JOBS_KEY = "BROADCAST_JOBS"
+
+# Sends per second and parallel sends, by client type. Bots may send about
+# 30 messages per second to different chats, user accounts far fewer.
+LIMITS = {"bot": (25, 8), "user": (4, 2)}
+
+# A running job is saved after this many chats or seconds, whichever comes
+# first, and a restart sends again to the chats done since.
+SAVE_CHATS, SAVE_SECONDS = 50, 10
+
+_running = {}
+# Resumed broadcasts, referenced until done so they aren't collected.
+_tasks = set()
+
+
+class TokenBucket:
+    """Allows 'rate' acquisitions per second, in bursts of up to 'burst'."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or rate
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._resume = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._resume:
+                    await asyncio.sleep(self._resume - now)
+                    continue
+                elapsed, self._last = now - self._last, now
+                self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds):
+        """Hold every acquisition for 'seconds', as asked by a FloodWait."""
+        self._resume = max(self._resume, time.monotonic() + seconds)
+        self._tokens = 0
+
+
+def _targets_key(name):
+    return f"BROADCAST_TARGETS_{name.upper()}"
+
+
+class Broadcast:
+    """A broadcast of one message to 'targets', saved as job 'name'.
+
+    The saved state holds the index below which every target is done, and
+    the done targets past it, so after a restart no chat gets it twice
+    except those done since the last save and those being sent to at the
+    moment the bot stopped.
+    """
+
+    def __init__(self, name, client, message, targets, state, progress_every=5):
+        self.name = name
+        self.client = client
+        self.message = message
+        self.targets = targets
+        self.state = state
+        self.progress_every = progress_every
+        rate, self.concurrency = LIMITS[state["client"]]
+        self.bucket = TokenBucket(rate)
+        self.status = None
+        self.errors = []
+        self._done = set(state["done"])
+        self._edited = 0
+        self._unsaved, self._saved = 0, time.monotonic()
+
+    @classmethod
+    async def start(cls, name, client, message, targets, mode="send", status=None):
+        """Broadcast 'message' to 'targets' by sending ('mode' "send") or
+        forwarding it, reporting progress by editing 'status'."""
+        if name in _running:
+            raise RuntimeError(f"Broadcast '{name}' is already running.")
+        state = {
+            "client": "bot" if client.me.bot else "user",
+            "mode": mode,
+            "chat": message.chat_id,
+            "msg": message.id,
+            "status": status.chat_id if status else None,
+            "cursor": 0,
+            "done": [],
+            "sent": 0,
+            "failed": 0,
+            "time": time.time(),
+        }
+        await udB.aset(_targets_key(name), list(targets))
+        job = cls(name, client, message, list(targets), state)
+        job.status = status
+        await job._save()
+        return await job.run()
+
+    @classmethod
+    async def resume(cls, name, state):
+        from .. import asst, ultroid_bot
+
+        client = asst if state["client"] == "bot" else ultroid_bot
+        targets = await udB.aget(_targets_key(name)) or []
+        try:
+            message = await client.get_messages(state["chat"], ids=state["msg"])
+        except Exception as er:
+            LOGS.exception(er)
+            message = None
+        if not message:
+            LOGS.warning(f"Broadcast '{name}': message is gone, dropping it.")
+            return cls(name, client, None, targets, state)._finish()
+        job = cls(name, client, message, targets, state)
+        if state["status"]:
+            try:
+                job.status = await client.send_message(
+                    state["status"], f"Resuming broadcast...\n\n{job.progress()}"
+                )
+            except Exception as er:
+                LOGS.exception(er)
+        return await job.run()
+
+    async def _save(self):
+        self._unsaved, self._saved = 0, time.monotonic()
+        state = dict(self.state, done=sorted(self._done))
+        try:
+            await udB.ahset(JOBS_KEY, self.name, state)
+        except Exception as er:
+            # A worker must not die over it, or 'run' waits forever.
+            LOGS.exception(er)
+
+    def _finish(self):
+        _running.pop(self.name, None)
+        udB.hdel(JOBS_KEY, self.name)
+        udB.del_key(_targets_key(self.name))
+        return self.state
+
+    def progress(self):
+        return (
+            f"Sent : {self.state['sent']}\nError : {self.state['failed']}"
+            f"\nTotal : {len(self.targets)}"
+        )
+
+    async def _report(self, final=False):
+        now = time.monotonic()
+        if not final and now - self._edited < self.progress_every:
+            return
+        self._edited = now
+        if not self.status:
+            return
+        text = self.progress()
+        if final:
+            took = time_formatter((time.time() - self.state["time"]) * 1000)
+            text = f"**Broadcast completed in {took}.**\n\n{text}"
+        try:
+            await self.status.edit(text)
+        except Exception as er:
+            LOGS.debug(f"Broadcast '{self.name}': {er}")
+
+    async def _send(self, target):
+        if self.state["mode"] == "forward":
+            return await self.client.forward_messages(target, self.message)
+        return await self.client.send_message(target, self.message)
+
+    async def _complete(self, index):
+        self._done.add(index)
+        while self.state["cursor"] in self._done:
+            self._done.discard(self.state["cursor"])
+            self.state["cursor"] += 1
+        self._unsaved += 1
+        if (
+            self._unsaved >= SAVE_CHATS
+            or time.monotonic() - self._saved >= SAVE_SECONDS
+        ):
+            await self._save()
+
+    async def _worker(self, queue):
+        while True:
+            index, tries = await queue.get()
+            target = self.targets[index]
+            try:
+                await self.bucket.acquire()
+                await self._send(target)
+                self.state["sent"] += 1
+            except FloodWaitError as er:
+                self.bucket.pause(er.seconds + 1)
+                if tries < 3:
+                    queue.put_nowait((index, tries + 1))
+                    queue.task_done()
+                    continue
+                self.state["failed"] += 1
+                self.errors.append((target, er))
+            except Exception as er:
+                self.state["failed"] += 1
+                self.errors.append((target, er))
+            await self._complete(index)
+            queue.task_done()
+            await self._report()
+
+    async def run(self):
+        _running[self.name] = self
+        queue = asyncio.Queue()
+        for index in range(self.state["cursor"], len(self.targets)):
+            if index not in self._done:
+                queue.put_nowait((index, 0))
+        workers = [
+            asyncio.create_task(self._worker(queue)) for _ in range(self.concurrency)
+        ]
+        try:
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+        await self._report(final=True)
+        await self._log_errors()
+        return self._finish()
+
+    async def _log_errors(self):
+        if not self.errors:
+            return
+        from .. import asst
+
+        text = f"#Broadcast\n\n{len(self.errors)} errors while broadcasting:\n"
+        for target, er in self.errors[:50]:
+            text += f"\n• `{target}`: {type(er).__name__}"
+        try:
+            await asst.send_message(udB.get_key("LOG_CHANNEL"), text)
+        except Exception as er:
+            LOGS.exception(er)
+
+
+async def run_in_chats(chats, action, status=None, text="", rate=4, concurrency=4):
+    """Run 'await action(chat)' for every chat of 'chats', a few at a time,
+    pausing everyone on FloodWait. 'status' is edited with the progress,
+    prefixed by 'text'. Returns the number done and the (chat, error) list.
+    """
+    bucket = TokenBucket(rate)
+    queue = asyncio.Queue()
+    for chat in chats:
+        queue.put_nowait((chat, 0))
+    done, errors, edited = 0, [], time.monotonic()
+
+    async def worker():
+        nonlocal done, edited
+        while True:
+            chat, tries = await queue.get()
+            try:
+                await bucket.acquire()
+                await action(chat)
+                done += 1
+            except FloodWaitError as er:
+                bucket.pause(er.seconds + 1)
+                if tries < 3:
+                    queue.put_nowait((chat, tries + 1))
+                else:
+                    errors.append((chat, er))
+            except Exception as er:
+                errors.append((chat, er))
+            queue.task_done()
+            if status and time.monotonic() - edited > 5:
+                edited = time.monotonic()
+                try:
+                    await status.edit(
+                        f"{text}\n\n`{done + len(errors)}/{len(chats)} chats...`"
+                    )
+                except Exception as er:
+                    LOGS.debug(er)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        await queue.join()
+    finally:
+        for task in workers:
+            task.cancel()
+    return done, errors
+
+
+def running(name):
+    return _running.get(name)
+
+
+async def resume_broadcasts():
+    """Continue every broadcast stopped by a restart, in the background."""
+    for name, state in (udB.get_key(JOBS_KEY) or {}).items():
+        if name not in _running:
+            LOGS.info(f"Resuming broadcast '{name}' at {state['cursor']}.")
+            task = asyncio.create_task(Broadcast.resume(name, state))
+            _tasks.add(task)
+            task.add_done_callback(_tasks.discard)
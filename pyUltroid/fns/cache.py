@@ -0,0 +1,125 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
+
+"""
+Bounded in-memory caches, for module-level state that would otherwise
+grow for as long as the bot runs.
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from weakref import WeakValueDictionary
+
+_CACHES = WeakValueDictionary()
+
+
+class BoundedCache(MutableMapping):
+    """Dict keeping at most 'maxsize' entries, dropping the least recently
+    used ones first, and forgetting entries 'ttl' seconds after they were set.
+
+    Entries are measured with 'sizeof' (shallow 'sys.getsizeof' by default)
+    as they are set, so 'stats()' gives an estimate of the memory held.
+    """
+
+    def __init__(self, name, maxsize=1000, ttl=None, sizeof=sys.getsizeof):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.sizeof = sizeof
+        # Entries by use for eviction, and their expiry times by when they
+        # were set, which is also expiry order as 'ttl' is the same for all.
+        self._data = OrderedDict()
+        self._expiry = OrderedDict()
+        self._bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evicted": 0, "expired": 0}
+        _CACHES[name] = self
+
+    def _pop(self, key, reason):
+        _, size, _ = self._data.pop(key)
+        self._expiry.pop(key, None)
+        self._bytes -= size
+        self._stats[reason] += 1
+
+    def _expire(self, now):
+        # Oldest entries first, until one is still fresh.
+        while self._expiry:
+            key, expiry = next(iter(self._expiry.items()))
+            if expiry > now:
+                break
+            self._pop(key, "expired")
+
+    def __getitem__(self, key):
+        try:
+            expiry, _, value = self._data[key]
+        except KeyError:
+            self._stats["misses"] += 1
+            raise
+        if expiry is not None and expiry <= time.monotonic():
+            self._pop(key, "expired")
+            self._stats["misses"] += 1
+            raise KeyError(key)
+        self._data.move_to_end(key)
+        self._stats["hits"] += 1
+        return value
+
+    def __setitem__(self, key, value):
+        now = time.monotonic()
+        if key in self._data:
+            self._bytes -= self._data.pop(key)[1]
+            self._expiry.pop(key, None)
+        size = self.sizeof(value)
+        expiry = now + self.ttl if self.ttl else None
+        self._data[key] = (expiry, size, value)
+        if expiry is not None:
+            self._expiry[key] = expiry
+        self._bytes += size
+        self._expire(now)
+        while len(self._data) > self.maxsize:
+            self._pop(next(iter(self._data)), "evicted")
+
+    def __delitem__(self, key):
+        self._bytes -= self._data.pop(key)[1]
+        self._expiry.pop(key, None)
+
+    def __contains__(self, key):
+        entry = self._data.get(key)
+        return bool(entry) and (entry[0] is None or entry[0] > time.monotonic())
+
+    def __iter__(self):
+        now = time.monotonic()
+        return iter(
+            [
+                key
+                for key, (expiry, _, _) in self._data.items()
+                if expiry is None or expiry > now
+            ]
+        )
+
+    def __len__(self):
+        self._expire(time.monotonic())
+        return len(self._data)
+
+    def clear(self):
+        self._data.clear()
+        self._expiry.clear()
+        self._bytes = 0
+
+    def stats(self):
+        self._expire(time.monotonic())
+        return {
+            "entries": len(self._data),
+            "maxsize": self.maxsize,
+            "bytes": self._bytes,
+            **self._stats,
+        }
+
+
+def cache_stats():
+    """Stats of every live 'BoundedCache', by name."""
+    return {name: cache.stats() for name, cache in sorted(_CACHES.items())}
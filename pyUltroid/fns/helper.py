@@ -6,7 +6,6 @@
 # <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
 
 import asyncio
-import math
 import os
 import re
 import sys
@@ -23,6 +22,7 @@ if run_as_module:
 
 try:
     from aiohttp import ClientSession as aiohttp_client
+    from aiohttp import ClientTimeout, TCPConnector
 except ImportError:
     aiohttp_client = None
     try:
@@ -102,9 +102,12 @@ def inline_mention(user, custom=None, html=False):
 
 def un_plug(shortname):
     from .. import asst, ultroid_bot
+    from .._misc._dispatcher import CMD_DISPATCHER
 
     try:
         all_func = LOADED[shortname]
+        for x in all_func:
+            CMD_DISPATCHER.remove(x)
         for client in [ultroid_bot, asst]:
             for x, _ in client.list_event_handlers():
                 if x in all_func:
@@ -310,43 +313,61 @@ async def updater():
 
 
 async def uploader(file, name, taime, event, msg):
+    from .progress import reporter
+
     with open(file, "rb") as f:
         result = await uploadable(
             client=event.client,
             file=f,
             filename=name,
-            progress_callback=lambda d, t: asyncio.get_event_loop().create_task(
-                progress(
-                    d,
-                    t,
-                    event,
-                    taime,
-                    msg,
-                ),
-            ),
+            progress_callback=reporter(event, msg, taime),
         )
     return result
 
 
 async def downloader(filename, file, event, taime, msg):
+    from .progress import reporter
+
     with open(filename, "wb") as fk:
         result = await downloadable(
             client=event.client,
             location=file,
             out=fk,
-            progress_callback=lambda d, t: asyncio.get_event_loop().create_task(
-                progress(
-                    d,
-                    t,
-                    event,
-                    taime,
-                    msg,
-                ),
-            ),
+            progress_callback=reporter(event, msg, taime),
         )
     return result
 
 
+# ~~~~~~~~~~~~~~~Shared HTTP Session~~~~~~~~~~~~~~~
+
+_http_session = None
+# (url, headers, kwargs, mode) -> (expiry, result) of GETs made with 'cache'.
+_http_cache = {}
+_HTTP_CACHE_SIZE = 256
+
+
+def http_session():
+    """Process-wide aiohttp session, kept alive and reused by every request."""
+    global _http_session
+    if not aiohttp_client:
+        raise DependencyMissingError("install 'aiohttp' to use this.")
+    if not _http_session or _http_session.closed:
+        _http_session = aiohttp_client(
+            connector=TCPConnector(
+                limit=100, limit_per_host=10, ttl_dns_cache=300, keepalive_timeout=60
+            ),
+            timeout=ClientTimeout(total=None, sock_connect=30),
+        )
+    return _http_session
+
+
+async def close_http_session():
+    global _http_session
+    if _http_session and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
+
 # ~~~~~~~~~~~~~~~Async Searcher~~~~~~~~~~~~~~~
 # @buddhhu
 
@@ -361,33 +382,50 @@ async def async_searcher(
     re_json: bool = False,
     re_content: bool = False,
     *args,
+    timeout: float = 300,
+    cache: float = 0,
     **kwargs,
 ):
-    if aiohttp_client:
-        async with aiohttp_client(headers=headers) as client:
-            method = client.head if head else (client.post if post else client.get)
-            data = await method(url, *args, **kwargs)
-            if evaluate:
-                return await evaluate(data)
-            if re_json:
-                return await data.json()
-            if re_content:
-                return await data.read()
-            if head or object:
-                return data
-            return await data.text()
-    # elif requests:
-    #     method = requests.head if head else (requests.post if post else requests.get)
-    #     data = method(url, headers=headers, *args, **kwargs)
-    #     if re_json:
-    #         return data.json()
-    #     if re_content:
-    #         return data.content
-    #     if head or object:
-    #         return data
-    #     return data.text
-    else:
-        raise DependencyMissingError("install 'aiohttp' to use this.")
+    """Request 'url' through the shared session.
+
+    'cache' keeps the result of a plain GET for that many seconds, and
+    returns the same object to later identical calls.
+    """
+    key = None
+    if cache and not (post or head or object or evaluate):
+        key = repr((url, headers, args, kwargs, re_json, re_content))
+        if key in _http_cache:
+            expiry, result = _http_cache[key]
+            if expiry > time.time():
+                return result
+            del _http_cache[key]
+    client = http_session()
+    method = "HEAD" if head else ("POST" if post else "GET")
+    async with client.request(
+        method,
+        url,
+        *args,
+        headers=headers,
+        timeout=ClientTimeout(total=timeout),
+        **kwargs,
+    ) as data:
+        if evaluate:
+            return await evaluate(data)
+        if re_json:
+            result = await data.json()
+        elif re_content:
+            result = await data.read()
+        elif head or object:
+            # Read now, the connection goes back to the pool on return.
+            await data.read()
+            return data
+        else:
+            result = await data.text()
+    if key:
+        if len(_http_cache) >= _HTTP_CACHE_SIZE:
+            del _http_cache[next(iter(_http_cache))]
+        _http_cache[key] = (time.time() + cache, result)
+    return result
 
 
 # ~~~~~~~~~~~~~~~~~~~~DDL Downloader~~~~~~~~~~~~~~~~~~~~
@@ -401,32 +439,31 @@ async def download_file(link, name, validate=False):
         if validate and "application/json" in content.headers.get("Content-Type"):
             return None, await content.json()
         with open(name, "wb") as file:
-            file.write(await content.read())
+            async for chunk in content.content.iter_chunked(2**16):
+                file.write(chunk)
         return name, ""
 
-    return await async_searcher(link, evaluate=_download)
+    return await async_searcher(link, evaluate=_download, timeout=None)
 
 
 async def fast_download(download_url, filename=None, progress_callback=None):
     if not aiohttp_client:
         return await download_file(download_url, filename)[0], None
-    async with aiohttp_client() as session:
-        async with session.get(download_url, timeout=None) as response:
-            if not filename:
-                filename = unquote(download_url.rpartition("/")[-1])
-            total_size = int(response.headers.get("content-length", 0)) or None
-            downloaded_size = 0
-            start_time = time.time()
-            with open(filename, "wb") as f:
-                async for chunk in response.content.iter_chunked(1024):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
-                    if progress_callback and total_size:
-                        await _maybe_await(
-                            progress_callback(downloaded_size, total_size)
-                        )
-            return filename, time.time() - start_time
+    session = http_session()
+    async with session.get(download_url, timeout=ClientTimeout(total=None)) as response:
+        if not filename:
+            filename = unquote(download_url.rpartition("/")[-1])
+        total_size = int(response.headers.get("content-length", 0)) or None
+        downloaded_size = 0
+        start_time = time.time()
+        with open(filename, "wb") as f:
+            async for chunk in response.content.iter_chunked(2**16):
+                if chunk:
+                    f.write(chunk)
+                    downloaded_size += len(chunk)
+                if progress_callback and total_size:
+                    await _maybe_await(progress_callback(downloaded_size, total_size))
+        return filename, time.time() - start_time
 
 
 # --------------------------Media Funcs-------------------------------- #
@@ -519,45 +556,11 @@ def numerize(number):
     return number
 
 
-No_Flood = {}
-
-
 async def progress(current, total, event, start, type_of_ps, file_name=None):
-    now = time.time()
-    if No_Flood.get(event.chat_id):
-        if No_Flood[event.chat_id].get(event.id):
-            if (now - No_Flood[event.chat_id][event.id]) < 1.1:
-                return
-        else:
-            No_Flood[event.chat_id].update({event.id: now})
-    else:
-        No_Flood.update({event.chat_id: {event.id: now}})
-    diff = time.time() - start
-    if round(diff % 10.00) == 0 or current == total:
-        percentage = current * 100 / total
-        speed = current / diff
-        time_to_completion = round((total - current) / speed) * 1000
-        progress_str = "`[{0}{1}] {2}%`\n\n".format(
-            "".join("●" for i in range(math.floor(percentage / 5))),
-            "".join("" for i in range(20 - math.floor(percentage / 5))),
-            round(percentage, 2),
-        )
+    """Report a transfer to be shown on 'event', see 'fns.progress.report'."""
+    from .progress import report
 
-        tmp = (
-            progress_str
-            + "`{0} of {1}`\n\n`✦ Speed: {2}/s`\n\n`✦ ETA: {3}`\n\n".format(
-                humanbytes(current),
-                humanbytes(total),
-                humanbytes(speed),
-                time_formatter(time_to_completion),
-            )
-        )
-        if file_name:
-            await event.edit(
-                "`✦ {}`\n\n`File Name: {}`\n\n{}".format(type_of_ps, file_name, tmp)
-            )
-        else:
-            await event.edit("`✦ {}`\n\n{}".format(type_of_ps, tmp))
+    report(event, current, total, type_of_ps, start, file_name)
 
 
 # ------------------System\\Heroku stuff----------------
@@ -565,6 +568,8 @@ async def progress(current, total, event, start, type_of_ps, file_name=None):
 
 
 async def restart(ult=None):
+    await udB.aflush()
+    await close_http_session()
     if Var.HEROKU_APP_NAME and Var.HEROKU_API:
         try:
             Heroku = heroku3.from_key(Var.HEROKU_API)
@@ -601,6 +606,8 @@ async def shutdown(ult):
     from .. import HOSTED_ON, LOGS
 
     ult = await eor(ult, "Shutting Down")
+    await udB.aflush()
+    await close_http_session()
     if HOSTED_ON == "heroku":
         if not (Var.HEROKU_APP_NAME and Var.HEROKU_API):
             return await ult.edit("Please Fill `HEROKU_APP_NAME` and `HEROKU_API`")
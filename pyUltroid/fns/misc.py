@@ -33,7 +33,7 @@ if run_as_module:
     from ..dB._core import LIST
 
 from . import some_random_headers
-from .helper import async_searcher
+from .helper import async_searcher, http_session
 from .tools import check_filename, json_parser
 
 try:
@@ -129,7 +129,9 @@ async def google_search(query):
         "Connection": "keep-alive",
         "User-Agent": choice(some_random_headers),
     }
-    con = await async_searcher(_base + "/search?q=" + query, headers=headers)
+    con = await async_searcher(
+        _base + "/search?q=" + query, headers=headers, cache=300
+    )
     soup = BeautifulSoup(con, "html.parser")
     result = []
     pdata = soup.find_all("a", href=re.compile("url="))
@@ -169,18 +171,17 @@ async def ReTrieveFile(input_file_name):
     RMBG_API = udB.get_key("RMBG_API")
     headers = {"X-API-Key": RMBG_API}
     files = {"image_file": open(input_file_name, "rb").read()}
-    async with aiohttp.ClientSession() as ses:
-        async with ses.post(
-            "https://api.remove.bg/v1.0/removebg", headers=headers, data=files
-        ) as out:
-            contentType = out.headers.get("content-type")
-            if "image" not in contentType:
-                return False, (await out.json())
-
-            name = check_filename("ult-rmbg.png")
-            with open(name, "wb") as file:
-                file.write(await out.read())
-            return True, name
+    async with http_session().post(
+        "https://api.remove.bg/v1.0/removebg", headers=headers, data=files
+    ) as out:
+        contentType = out.headers.get("content-type")
+        if "image" not in contentType:
+            return False, (await out.json())
+
+        name = check_filename("ult-rmbg.png")
+        with open(name, "wb") as file:
+            file.write(await out.read())
+        return True, name
 
 
 # ---------------- Unsplash Search ----------------
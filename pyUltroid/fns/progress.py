@@ -0,0 +1,166 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
+
+"""
+Progress of uploads and downloads, shown by editing a status message.
+
+Reporting only stores the latest state of a transfer, so it is cheap to do
+for every chunk. Each status message has one task rendering it every
+'INTERVAL' seconds, showing all the transfers reporting to it, and it
+stops once the last of them is complete.
+"""
+
+import asyncio
+import math
+import time
+from functools import partial
+
+from telethon.errors import FloodWaitError, MessageNotModifiedError
+
+from .. import LOGS
+from .helper import humanbytes, time_formatter
+
+# Seconds between edits of a status message.
+INTERVAL = 5
+# Seconds a transfer can go without reports before it is dropped.
+STALE = 10 * 60
+
+_statuses = {}
+
+
+class _Transfer:
+    __slots__ = ("title", "file_name", "start", "current", "total", "seen", "speed")
+
+    def __init__(self, title, file_name, start):
+        self.title = title
+        self.file_name = file_name
+        self.start = start
+        self.current = self.total = 0
+        self.seen = time.time()
+        self.speed = None
+
+    def render(self, now, last):
+        # Speed over the last interval, smoothed with the previous one.
+        since, done = last.get(self, (self.start, 0))
+        speed = (self.current - done) / max(now - since, 1e-3)
+        self.speed = speed if self.speed is None else (self.speed + speed) / 2
+        last[self] = (now, self.current)
+        percentage = self.current * 100 / self.total
+        eta = (self.total - self.current) / self.speed if self.speed else 0
+        text = (
+            f"`[{'●' * math.floor(percentage / 5)}] {round(percentage, 2)}%`\n\n"
+            f"`{humanbytes(self.current)} of {humanbytes(self.total)}`\n\n"
+            f"`✦ Speed: {humanbytes(self.speed)}/s`\n\n"
+            f"`✦ ETA: {time_formatter(eta * 1000)}`\n\n"
+        )
+        if self.file_name:
+            return f"`✦ {self.title}`\n\n`File Name: {self.file_name}`\n\n{text}"
+        return f"`✦ {self.title}`\n\n{text}"
+
+
+class _Status:
+    def __init__(self, key, message, interval):
+        self.key = key
+        self.message = message
+        self.interval = interval
+        self.transfers = {}
+        self._last = {}
+        self._text = None
+        self.closing = False
+        self.task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        try:
+            while self.transfers:
+                await asyncio.sleep(self.interval)
+                await self._update()
+        finally:
+            if _statuses.get(self.key) is self:
+                del _statuses[self.key]
+
+    async def _update(self):
+        now = time.time()
+        for key, transfer in list(self.transfers.items()):
+            if now - transfer.seen > STALE:
+                del self.transfers[key]
+                self._last.pop(transfer, None)
+        text = "\n".join(
+            transfer.render(now, self._last)
+            for transfer in self.transfers.values()
+            if transfer.total
+        )
+        if not text or text == self._text:
+            return
+        self._text = text
+        try:
+            await self.message.edit(text)
+        except MessageNotModifiedError:
+            pass
+        except FloodWaitError as er:
+            await asyncio.sleep(er.seconds)
+        except Exception as er:
+            LOGS.debug(f"Progress: {er}")
+
+    def remove(self, key):
+        if transfer := self.transfers.pop(key, None):
+            self._last.pop(transfer, None)
+        if not self.transfers:
+            # The task may only finish on its next step, don't reuse it.
+            self.closing = True
+            self.task.cancel()
+            if _statuses.get(self.key) is self:
+                del _statuses[self.key]
+
+
+def _key(message):
+    return getattr(message, "chat_id", None), getattr(message, "id", id(message))
+
+
+def report(message, current, total, title, start=None, file_name=None):
+    """Record 'current' of 'total' bytes of a transfer shown on 'message'.
+
+    Transfers are told apart by 'title' and 'file_name'. A complete one is
+    dropped at once, leaving the message to the caller. Safe to call from
+    other threads.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return message.client.loop.call_soon_threadsafe(
+            partial(report, message, current, total, title, start, file_name)
+        )
+    key = _key(message)
+    status = _statuses.get(key)
+    if not total or current >= total:
+        if status:
+            status.remove((title, file_name))
+        return
+    if not status or status.closing or status.task.done():
+        status = _statuses[key] = _Status(key, message, INTERVAL)
+    transfer = status.transfers.get((title, file_name))
+    if not transfer:
+        transfer = status.transfers[(title, file_name)] = _Transfer(
+            title, file_name, start or time.time()
+        )
+    transfer.current, transfer.total, transfer.seen = current, total, time.time()
+
+
+def reporter(message, title, start=None, file_name=None):
+    """'progress_callback(current, total)' reporting to 'message'."""
+    start = start or time.time()
+    return lambda current, total: report(
+        message, current, total, title, start, file_name
+    )
+
+
+def finish(message, title=None, file_name=None):
+    """Stop showing a transfer on 'message', or all of them without 'title'."""
+    if status := _statuses.get(_key(message)):
+        for key in list(status.transfers):
+            if title is None or key == (title, file_name):
+                status.remove(key)
+
@@ -21,6 +21,7 @@ import requests
 from .. import *
 from ..exceptions import DependencyMissingError
 from . import some_random_headers
+from .cache import BoundedCache
 from .helper import async_searcher, bash, run_async
 
 try:
@@ -57,6 +58,14 @@ try:
 except ImportError:
     BeautifulSoup = None
 
+try:
+    from pymediainfo import MediaInfo
+
+    if not MediaInfo.can_parse():
+        MediaInfo = None
+except ImportError:
+    MediaInfo = None
+
 # ~~~~~~~~~~~~~~~~~~~~OFOX API~~~~~~~~~~~~~~~~~~~~
 # @buddhhu
 
@@ -64,10 +73,10 @@ except ImportError:
 async def get_ofox(codename):
     ofox_baseurl = "https://api.orangefox.download/v3/"
     releases = await async_searcher(
-        ofox_baseurl + "releases?codename=" + codename, re_json=True
+        ofox_baseurl + "releases?codename=" + codename, re_json=True, cache=600
     )
     device = await async_searcher(
-        ofox_baseurl + "devices/get?codename=" + codename, re_json=True
+        ofox_baseurl + "devices/get?codename=" + codename, re_json=True, cache=600
     )
     return device, releases
 
@@ -112,36 +121,181 @@ async def is_url_ok(url: str):
 # ~~~~~~~~~~~~~~~~ Metadata ~~~~~~~~~~~~~~~~~~~~
 
 
-async def metadata(file):
-    out, _ = await bash(f'mediainfo "{_unquote_text(file)}" --Output=JSON')
-    if _ and _.endswith("NOT_FOUND"):
-        raise DependencyMissingError(
-            f"'{_}' is not installed!\nInstall it to use this command."
+# Probes are cached by inode, size and mtime, so a file is only probed once
+# even if it gets renamed. pymediainfo parses in-process, otherwise the
+# mediainfo command is run, or ffprobe if mediainfo isn't installed.
+
+_probes = BoundedCache("media_probes", maxsize=512)
+
+
+def _probe_key(file):
+    try:
+        stat = os.stat(file)
+    except OSError:
+        return
+    return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def _number(value, cast=int, default=0):
+    try:
+        return cast(float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def _mediainfo_tracks(media):
+    """Tracks of one file of 'mediainfo --Output=JSON'."""
+    return [
+        {
+            "type": track.get("@type"),
+            "format": track.get("Format"),
+            "duration": _number(track.get("Duration"), float),
+            "width": track.get("Width"),
+            "height": track.get("Height"),
+            "bitrate": track.get("BitRate"),
+            "title": track.get("Title"),
+            "performer": track.get("Performer"),
+        }
+        for track in (media or {}).get("track", [])
+    ]
+
+
+def _pymediainfo_tracks(info):
+    return [
+        {
+            "type": track.track_type,
+            "format": track.format,
+            # In milliseconds here.
+            "duration": _number(track.duration, float) / 1000,
+            "width": track.width,
+            "height": track.height,
+            "bitrate": track.bit_rate,
+            "title": track.title,
+            "performer": track.performer,
+        }
+        for track in info.tracks
+    ]
+
+
+def _ffprobe_tracks(data):
+    """Tracks, in the mediainfo layout, of 'ffprobe -print_format json'."""
+    if not (general := data.get("format")):
+        return []
+    tags = general.get("tags", {})
+    name = general.get("format_name", "")
+    tracks = [
+        {
+            "type": "General",
+            "format": "GIF" if name == "gif" else "PNG" if "png" in name else name,
+            "duration": _number(general.get("duration"), float),
+            "title": tags.get("title") or tags.get("TITLE"),
+            "performer": tags.get("artist") or tags.get("ARTIST"),
+        }
+    ]
+    for stream in data.get("streams", []):
+        if stream.get("disposition", {}).get("attached_pic"):
+            # Cover art of an audio file.
+            continue
+        tracks.append(
+            {
+                "type": stream.get("codec_type", "").capitalize(),
+                "format": stream.get("codec_name"),
+                "width": stream.get("width"),
+                "height": stream.get("height"),
+                "bitrate": stream.get("bit_rate"),
+            }
         )
-    
-    data = {}
-    _info = json.loads(out)["media"]
-    if not _info:
+    return tracks
+
+
+def _metadata(tracks):
+    if not tracks:
         return {}
-    _info = _info["track"]
-    info = _info[0]
-    if info.get("Format") in ["GIF", "PNG"]:
+    info, rest = tracks[0], tracks[1:]
+    video = next((x for x in rest if x["type"] in ("Video", "Image")), None)
+    if info.get("format") in ["GIF", "PNG"]:
+        video = video or (rest[0] if rest else {})
         return {
-            "height": _info[1]["Height"],
-            "width": _info[1]["Width"],
-            "bitrate": _info[1].get("BitRate", 320),
+            "height": _number(video.get("height")),
+            "width": _number(video.get("width")),
+            "bitrate": _number(video.get("bitrate"), default=320),
         }
-    if info.get("AudioCount"):
-        data["title"] = info.get("Title", file)
-        data["performer"] = info.get("Performer") or udB.get_key("artist") or ""
-    if info.get("VideoCount"):
-        data["height"] = int(float(_info[1].get("Height", 720)))
-        data["width"] = int(float(_info[1].get("Width", 1280)))
-        data["bitrate"] = int(_info[1].get("BitRate", 320))
-    data["duration"] = int(float(info.get("Duration", 0)))
+    data = {}
+    if any(x["type"] == "Audio" for x in rest):
+        # The file name is filled in by 'metadata_many', as the cached
+        # result outlives renames.
+        data["title"] = info.get("title")
+        data["performer"] = info.get("performer") or udB.get_key("artist") or ""
+    if video and video["type"] == "Video":
+        data["height"] = _number(video.get("height"), default=720)
+        data["width"] = _number(video.get("width"), default=1280)
+        data["bitrate"] = _number(video.get("bitrate"), default=320)
+    data["duration"] = int(info.get("duration") or 0)
     return data
 
 
+@run_async
+def _probe_in_process(files):
+    tracks = []
+    for file in files:
+        try:
+            tracks.append(_pymediainfo_tracks(MediaInfo.parse(file)))
+        except Exception as er:
+            LOGS.debug(f"pymediainfo: {file}: {er}")
+            tracks.append([])
+    return tracks
+
+
+async def _probe_commands(files):
+    quoted = " ".join(f'"{_unquote_text(file)}"' for file in files)
+    out, _ = await bash(f"mediainfo {quoted} --Output=JSON")
+    if not (_ and _.endswith("NOT_FOUND")):
+        # One object for a single file, a list of them for several.
+        data = json.loads(out) if out else []
+        data = data if isinstance(data, list) else [data]
+        if len(data) == len(files):
+            return [_mediainfo_tracks(media.get("media")) for media in data]
+        if len(files) > 1:
+            return [(await _probe_commands([file]))[0] for file in files]
+        return [[]]
+    tracks = []
+    ffprobe = "ffprobe -v quiet -print_format json -show_format -show_streams"
+    for file in files:
+        out, err = await bash(f'{ffprobe} "{_unquote_text(file)}"')
+        if err and err.endswith("NOT_FOUND"):
+            raise DependencyMissingError(
+                f"'{err}' is not installed!\nInstall it to use this command."
+            )
+        tracks.append(_ffprobe_tracks(json.loads(out or "{}")))
+    return tracks
+
+
+async def metadata_many(files):
+    """'metadata' of each of 'files', probing the uncached ones together."""
+    keys = [_probe_key(file) for file in files]
+    found = {key: _probes[key] for key in keys if key in _probes}
+    todo = {key: file for key, file in zip(keys, files) if key and key not in found}
+    if todo:
+        paths = list(todo.values())
+        if MediaInfo:
+            tracks = await _probe_in_process(paths)
+        else:
+            tracks = await _probe_commands(paths)
+        for key, data in zip(todo, tracks):
+            found[key] = _probes[key] = _metadata(data)
+    results = []
+    for key, file in zip(keys, files):
+        data = dict(found.get(key) or {})
+        if "title" in data and not data["title"]:
+            data["title"] = file
+        results.append(data)
+    return results
+
+
+async def metadata(file):
+    return (await metadata_many([file]))[0]
+
+
 # ~~~~~~~~~~~~~~~~ Attributes ~~~~~~~~~~~~~~~~
 
 
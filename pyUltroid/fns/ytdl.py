@@ -9,6 +9,7 @@ import glob
 import os
 import re
 import time
+from functools import partial
 
 from telethon import Button
 
@@ -20,26 +21,20 @@ except ImportError:
 from yt_dlp import YoutubeDL
 
 from .. import LOGS, udB
-from .helper import download_file, humanbytes, run_async, time_formatter
-from .tools import set_attributes
+from .helper import download_file, humanbytes, run_async
+from .progress import report
+from .tools import metadata_many, set_attributes
 
 
-async def ytdl_progress(k, start_time, event):
-    if k["status"] == "error":
-        return await event.edit("error")
-    while k["status"] == "downloading":
-        text = (
-            f"`Downloading: {k['filename']}\n"
-            + f"Total Size: {humanbytes(k['total_bytes'])}\n"
-            + f"Downloaded: {humanbytes(k['downloaded_bytes'])}\n"
-            + f"Speed: {humanbytes(k['speed'])}/s\n"
-            + f"ETA: {time_formatter(k['eta']*1000)}`"
-        )
-        if round((time.time() - start_time) % 10.0) == 0:
-            try:
-                await event.edit(text)
-            except Exception as ex:
-                LOGS.error(f"ytdl_progress: {ex}")
+def ytdl_progress(k, start_time, event):
+    """yt-dlp progress hook, reporting the download to be shown on 'event'."""
+    name = os.path.basename(k.get("filename") or "")
+    total = k.get("total_bytes") or k.get("total_bytes_estimate") or 0
+    if k["status"] != "downloading":
+        # Finished or failed, stop showing it.
+        total = 0
+    done = k.get("downloaded_bytes") or 0
+    report(event, done, total, "Downloading", start_time, name)
 
 
 def get_yt_link(query):
@@ -57,6 +52,16 @@ async def download_yt(event, link, ytd):
         return
     if info.get("_type", None) == "playlist":
         total = info["playlist_count"]
+        # Probe the whole playlist at once, the results stay cached by inode
+        # through the renames below.
+        await metadata_many(
+            [
+                file
+                for entry in info["entries"]
+                for file in glob.glob(f"{entry['id']}*")
+                if not file.endswith(("jpg", ".part"))
+            ]
+        )
         for num, file in enumerate(info["entries"]):
             num += 1
             id_ = file["id"]
@@ -234,7 +239,8 @@ async def dler(event, url, opts: dict = {}, download=False):
     opts["username"] = udB.get_key("YT_USERNAME")
     opts["password"] = udB.get_key("YT_PASSWORD")
     if download:
-        await ytdownload(url, opts)
+        hook = partial(ytdl_progress, start_time=time.time(), event=event)
+        await ytdownload(url, {**opts, "progress_hooks": [hook]})
     try:
         return await extract_info(url, opts)
     except Exception as e:
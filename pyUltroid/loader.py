@@ -5,15 +5,74 @@
 # PLease read the GNU Affero General Public License in
 # <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
 
+import ast
 import contextlib
 import glob
+import json
 import os
+import sys
+from hashlib import sha1
 from importlib import import_module
 from logging import Logger
+from types import ModuleType
 
 from . import LOGS
 from .fns.tools import get_all_files
 
+MANIFEST = "resources/plugins_manifest.json"
+
+
+def _command(decorator):
+    """Arguments of an '@ultroid_cmd(...)' decorator, if all are literals."""
+    if not (
+        isinstance(decorator, ast.Call)
+        and getattr(decorator.func, "id", None) == "ultroid_cmd"
+    ):
+        return
+    try:
+        kwargs = {kw.arg: ast.literal_eval(kw.value) for kw in decorator.keywords}
+        if decorator.args:
+            kwargs["pattern"] = ast.literal_eval(decorator.args[0])
+    except (ValueError, TypeError, SyntaxError):
+        return
+    if None in kwargs or len(decorator.args) > 1:
+        return
+    return kwargs
+
+
+def _only_imports(node):
+    return all(
+        isinstance(stmt, (ast.Import, ast.ImportFrom, ast.Assign))
+        for stmt in node.body
+    )
+
+
+def scan_plugin(source):
+    """Manifest entry of a plugin: its docstring, and its commands when the
+    module does nothing at import time besides defining them."""
+    tree = ast.parse(source)
+    commands, lazy = [], True
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            # Decorators apply bottom-up.
+            for decorator in reversed(node.decorator_list):
+                kwargs = _command(decorator)
+                if kwargs is None:
+                    lazy = False
+                    break
+                commands.append(kwargs)
+        elif isinstance(node, ast.Try):
+            lazy = lazy and _only_imports(node)
+        elif isinstance(node, ast.Expr):
+            # Anything but a docstring runs code at import time.
+            lazy = lazy and isinstance(node.value, ast.Constant)
+        elif not isinstance(node, (ast.Import, ast.ImportFrom, ast.Assign)):
+            lazy = False
+    return {
+        "doc": ast.get_docstring(tree, clean=False),
+        "commands": commands if lazy and commands else None,
+    }
+
 
 class Loader:
     def __init__(self, path="plugins", key="Official", logger: Logger = LOGS):
@@ -29,7 +88,11 @@ class Loader:
         exclude=None,
         after_load=None,
         load_all=False,
+        lazy=False,
     ):
+        """Import plugins, or with 'lazy', register placeholders for the
+        commands of the plugins listed in the manifest and import them when
+        one of those commands is first used."""
         _single = os.path.isfile(self.path)
         if include:
             if log:
@@ -55,7 +118,11 @@ class Loader:
             self._logger.info(
                 f"• Installing {self.key} Plugins || Count : {len(files)} •"
             )
+        manifest = self._manifest(files) if lazy and func == import_module else {}
         for plugin in sorted(files):
+            if manifest.get(plugin, {}).get("commands"):
+                self._load_lazy(plugin, manifest[plugin], after_load)
+                continue
             if func == import_module:
                 plugin = plugin.replace(".py", "").replace("/", ".").replace("\\", ".")
             try:
@@ -75,3 +142,69 @@ class Loader:
                 if func == import_module:
                     plugin = plugin.split(".")[-1]
                 after_load(self, modl, plugin_name=plugin)
+
+    def _manifest(self, files):
+        try:
+            with open(MANIFEST) as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            cache = {}
+        manifest, changed = {}, False
+        for path in files:
+            with open(path, "rb") as file:
+                source = file.read()
+            digest = sha1(source).hexdigest()
+            entry = cache.get(path)
+            if not entry or entry.get("hash") != digest:
+                try:
+                    entry = {"hash": digest, **scan_plugin(source)}
+                except SyntaxError:
+                    continue
+                cache[path] = entry
+                changed = True
+            manifest[path] = entry
+        if changed:
+            try:
+                with open(MANIFEST, "w") as file:
+                    json.dump(cache, file)
+            except OSError as er:
+                self._logger.exception(er)
+        return manifest
+
+    def _load_lazy(self, path, entry, after_load=None):
+        from ._misc._decorators import capture_commands, ultroid_cmd
+        from ._misc._dispatcher import CMD_DISPATCHER
+
+        name = path.replace(".py", "").replace("/", ".").replace("\\", ".")
+        stubs, funcs = [], []
+
+        def load():
+            if not funcs and name not in sys.modules:
+                for stub in stubs:
+                    CMD_DISPATCHER.remove(stub)
+                self._logger.info(f"Loading {name} on first use.")
+                try:
+                    with capture_commands() as found:
+                        import_module(name)
+                except Exception as exc:
+                    self._logger.error(f"pyUltroid - {self.key} - ERROR - {name}")
+                    self._logger.exception(exc)
+                    return
+                funcs.extend(found)
+            return funcs
+
+        def placeholder(index):
+            async def lazy_cmd(event):
+                loaded = load()
+                if loaded and index < len(loaded):
+                    await loaded[index](event)
+
+            return lazy_cmd
+
+        for index, kwargs in enumerate(entry["commands"]):
+            stub = placeholder(index)
+            ultroid_cmd(plugin_file=path, **kwargs)(stub)
+            stubs.append(stub)
+        if callable(after_load):
+            module = ModuleType(name, entry["doc"])
+            after_load(self, module, plugin_name=name.split(".")[-1])
@@ -6,7 +6,10 @@
 # <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
 
 import contextlib
+import copy
+import hashlib
 import inspect
+import os
 import sys
 import time
 from logging import Logger
@@ -18,13 +21,25 @@ from telethon.errors import (
     AccessTokenInvalidError,
     ApiIdInvalidError,
     AuthKeyDuplicatedError,
+    FileReferenceExpiredError,
+    FileReferenceInvalidError,
 )
+from telethon.tl.custom import Message
+from telethon.tl.types import InputDocument, InputFile, InputFileBig, InputPhoto
 
 from ..configs import Var
+from ..fns.cache import BoundedCache
 from . import *
+from ._dialogs import DialogIndex
 
 
 class UltroidClient(TelegramClient):
+    # Seconds an entry of the upload cache is trusted without being resent.
+    upload_cache_ttl = 30 * 24 * 60 * 60
+    # Files up to this size are hashed before uploading to be looked up in
+    # the upload cache, bigger ones only as they are uploaded.
+    upload_hash_limit = 20 * 2**20
+
     def __init__(
         self,
         session,
@@ -39,7 +54,21 @@ class UltroidClient(TelegramClient):
         **kwargs,
     ):
         self._cache = {}
-        self._dialogs = []
+        # Upload cache state: digests of local files by (path, size, mtime),
+        # uploaded files by digest, digests of files uploaded but not sent
+        # yet, and cached media handed out.
+        kind = "bot" if bot_token else "user"
+        self._digests = BoundedCache(f"{kind}_file_digests", maxsize=256)
+        self._upload_handles = BoundedCache(
+            f"{kind}_upload_handles", maxsize=64, ttl=24 * 60 * 60
+        )
+        self._upload_digests = BoundedCache(
+            f"{kind}_unsent_uploads", maxsize=64, ttl=24 * 60 * 60
+        )
+        self._cached_media = BoundedCache(
+            f"{kind}_cached_uploads", maxsize=64, ttl=24 * 60 * 60
+        )
+        self.dialogs = DialogIndex(self)
         self._handle_error = exit_on_error
         self._log_at = log_attempt
         self.logger = logger
@@ -111,58 +140,242 @@ class UltroidClient(TelegramClient):
         # Delete original file after uploading
         to_delete = kwargs.get("to_delete", False)
         message = kwargs.get("message", f"Uploading {filename}...")
-        by_bot = self._bot
         size = os.path.getsize(file)
         # Don't show progress bar when file size is less than 5MB.
         if size < 5 * 2 ** 20:
             show_progress = False
-        if use_cache and self._cache and self._cache.get("upload_cache"):
-            for files in self._cache["upload_cache"]:
-                if (
-                    files["size"] == size
-                    and files["path"] == path
-                    and files["name"] == filename
-                    and files["by_bot"] == by_bot
-                ):
-                    if to_delete:
-                        with contextlib.suppress(FileNotFoundError):
-                            os.remove(file)
-                    return files["raw_file"], time.time() - start_time
+        stat_key = self._stat_key(file)
+        digest = await self._file_digest(file, stat_key) if use_cache else None
+        if digest:
+            # How to upload it again, should the cached media not do.
+            upload = {
+                "filename": filename,
+                "show_progress": show_progress,
+                "event": kwargs.get("event"),
+                "message": message,
+            }
+            if media := self._cached_upload(digest, file, to_delete, upload):
+                # A new object for each hit, naming it doesn't touch the cache.
+                media.name = filename
+                # 'to_delete' is done once the media is used, see
+                # '_use_cached', which may need the file again.
+                return media, time.time() - start_time
+            if handle := self._reuse_upload(digest, filename):
+                if to_delete:
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(file)
+                return handle, time.time() - start_time
 
         from pyUltroid.fns.FastTelethon import upload_file
-        from pyUltroid.fns.helper import progress
+        from pyUltroid.fns.progress import reporter
 
         raw_file = None
         while not raw_file:
+            # Files too big to hash first are hashed as they are uploaded.
+            hasher = hashlib.sha256() if use_cache and not digest else None
             with open(file, "rb") as f:
                 raw_file = await upload_file(
                     client=self,
                     file=f,
                     filename=filename,
-                    progress_callback=(
-                        lambda completed, total: self.loop.create_task(
-                            progress(completed, total, event, start_time, message)
-                        )
-                    )
+                    progress_callback=reporter(event, message, start_time)
                     if show_progress
                     else None,
+                    hasher=hasher,
                 )
-        cache = {
-            "by_bot": by_bot,
-            "size": size,
-            "path": path,
-            "name": filename,
-            "raw_file": raw_file,
-        }
-        if self._cache.get("upload_cache"):
-            self._cache["upload_cache"].append(cache)
-        else:
-            self._cache.update({"upload_cache": [cache]})
+        if hasher:
+            digest = self._digests[stat_key] = hasher.hexdigest()
+        if digest:
+            # Cached once a message carrying it is sent, see 'send_file'.
+            self._upload_digests[raw_file.id] = digest
+            self._upload_handles[digest] = raw_file
         if to_delete:
             with contextlib.suppress(FileNotFoundError):
                 os.remove(file)
         return raw_file, time.time() - start_time
 
+    # Upload cache: media sent from an uploaded file is kept in 'udB' by the
+    # SHA-256 of the file, and re-sending the same content reuses it. The
+    # uploaded files themselves are reused for the life of the process.
+
+    @staticmethod
+    def _stat_key(path):
+        stat = os.stat(path)
+        return str(path), stat.st_size, stat.st_mtime_ns
+
+    async def _file_digest(self, path, key):
+        """SHA-256 of 'path', if known or small enough to hash first."""
+        if (digest := self._digests.get(key)) or key[1] > self.upload_hash_limit:
+            return digest
+
+        def sha256():
+            digest = hashlib.sha256()
+            with open(path, "rb") as file:
+                while chunk := file.read(2**20):
+                    digest.update(chunk)
+            return digest.hexdigest()
+
+        digest = self._digests[key] = await self.loop.run_in_executor(None, sha256)
+        return digest
+
+    def _reuse_upload(self, digest, name=None):
+        """The file uploaded with 'digest', named 'name', if still known."""
+        if not (handle := self._upload_handles.get(digest)):
+            return
+        handle = copy.copy(handle)
+        handle.name = name or handle.name
+        # Remembered again by the next send, with its own options.
+        self._upload_digests[handle.id] = digest
+        return handle
+
+    def _upload_field(self, digest):
+        # Access hashes differ between the user and the bot account.
+        return f"{digest}:{int(bool(self._bot))}"
+
+    @staticmethod
+    def _send_options(name, kwargs):
+        """Digest of what sending a file sets on the media besides its content,
+        None if that can't be told."""
+        thumb = kwargs.get("thumb")
+        if isinstance(thumb, (str, os.PathLike)):
+            try:
+                with open(thumb, "rb") as file:
+                    thumb = file.read()
+            except OSError:
+                return
+        if not isinstance(thumb, (bytes, type(None))):
+            return
+        options = (
+            name,
+            [bytes(attribute) for attribute in kwargs.get("attributes") or ()],
+            thumb and hashlib.sha256(thumb).hexdigest(),
+            bool(kwargs.get("force_document")),
+            bool(kwargs.get("supports_streaming")),
+        )
+        return hashlib.sha256(repr(options).encode()).hexdigest()
+
+    def _cached_upload(self, digest, path=None, to_delete=False, upload=None):
+        if not self.udB:
+            return
+        field = self._upload_field(digest)
+        entry = self.udB.hget("UPLOAD_CACHE", field)
+        if not entry:
+            return
+        if time.time() - entry["time"] > self.upload_cache_ttl:
+            self.udB.hdel("UPLOAD_CACHE", field)
+            return
+        media_type = InputPhoto if entry["type"] == "photo" else InputDocument
+        media = media_type(entry["id"], entry["access_hash"], entry["file_reference"])
+        self._cached_media[media.id] = {
+            "digest": digest,
+            "path": path,
+            "to_delete": to_delete,
+            "options": entry.get("options"),
+            "upload": upload or {},
+        }
+        return media
+
+    def _remember_upload(self, file, message, kwargs):
+        if not isinstance(file, (InputFile, InputFileBig)):
+            return
+        digest = self._upload_digests.pop(file.id, None)
+        if not (digest and self.udB and isinstance(message, Message)):
+            return
+        media = message.photo or message.document
+        if not media:
+            return
+        self.udB.hset(
+            "UPLOAD_CACHE",
+            self._upload_field(digest),
+            {
+                "type": "photo" if message.photo else "document",
+                "id": media.id,
+                "access_hash": media.access_hash,
+                "file_reference": media.file_reference,
+                "options": self._send_options(file.name, kwargs),
+                "chat": message.chat_id,
+                "msg": message.id,
+                "time": time.time(),
+            },
+        )
+
+    def _take_cached(self, file):
+        if isinstance(file, (InputDocument, InputPhoto)):
+            return self._cached_media.pop(file.id, None)
+
+    async def _use_cached(self, media, cached, kwargs):
+        """'media', or the uploaded file if sending with 'kwargs' would set
+        anything 'media' wasn't sent with, as sent media keeps those."""
+        options = self._send_options(cached["upload"].get("filename"), kwargs)
+        if options and options == cached["options"]:
+            return media
+        return await self._upload_again(cached) or media
+
+    @staticmethod
+    def _discard(cached):
+        if cached["to_delete"]:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(cached["path"])
+
+    async def _refresh_upload(self, media, cached):
+        """Fresh file reference for cached 'media', or a new upload of it."""
+        field = self._upload_field(cached["digest"])
+        entry = self.udB.hget("UPLOAD_CACHE", field)
+        message = None
+        if entry:
+            with contextlib.suppress(Exception):
+                message = await self.get_messages(entry["chat"], ids=entry["msg"])
+        fresh = message and (message.photo or message.document)
+        if fresh and fresh.id == media.id:
+            entry.update(file_reference=fresh.file_reference, time=time.time())
+            self.udB.hset("UPLOAD_CACHE", field, entry)
+            return type(media)(fresh.id, fresh.access_hash, fresh.file_reference)
+        self.udB.hdel("UPLOAD_CACHE", field)
+        return await self._upload_again(cached)
+
+    async def _upload_again(self, cached):
+        digest, path = cached["digest"], cached["path"]
+        if handle := self._reuse_upload(digest, cached["upload"].get("filename")):
+            return handle
+        if not (path and os.path.exists(path)):
+            return
+        raw_file, _ = await self.fast_uploader(
+            path, use_cache=False, **cached["upload"]
+        )
+        self._upload_digests[raw_file.id] = digest
+        self._upload_handles[digest] = raw_file
+        return raw_file
+
+    async def send_file(self, entity, file, *args, **kwargs):
+        cached = self._take_cached(file)
+        try:
+            if cached:
+                file = await self._use_cached(file, cached, kwargs)
+            try:
+                message = await super().send_file(entity, file, *args, **kwargs)
+            except (FileReferenceExpiredError, FileReferenceInvalidError):
+                if not (cached and isinstance(file, (InputDocument, InputPhoto))):
+                    raise
+                if not (fresh := await self._refresh_upload(file, cached)):
+                    raise
+                file = fresh
+                message = await super().send_file(entity, file, *args, **kwargs)
+        finally:
+            if cached:
+                self._discard(cached)
+        self._remember_upload(file, message, kwargs)
+        return message
+
+    async def _file_to_media(self, file, *args, **kwargs):
+        # Cached media reaching here without 'send_file', as from
+        # 'edit_message'. 'send_file' takes its own before calling this.
+        if cached := self._take_cached(file):
+            try:
+                file = await self._use_cached(file, cached, kwargs)
+            finally:
+                self._discard(cached)
+        return await super()._file_to_media(file, *args, **kwargs)
+
     async def fast_downloader(self, file, **kwargs):
         """Download files in a faster way"""
         # Set to True and pass event to show progress bar.
@@ -178,7 +391,7 @@ class UltroidClient(TelegramClient):
         from telethon.tl.types import DocumentAttributeFilename
 
         from pyUltroid.fns.FastTelethon import download_file
-        from pyUltroid.fns.helper import progress
+        from pyUltroid.fns.progress import reporter
 
         start_time = time.time()
         # Auto-generate Filename
@@ -196,18 +409,18 @@ class UltroidClient(TelegramClient):
                 )
         message = kwargs.get("message", f"Downloading {filename}...")
 
+        # Parts already written by an interrupted download are kept.
+        checkpoint = f"{filename}.ultdl"
+        resume = os.path.exists(filename) and os.path.exists(checkpoint)
         raw_file = None
         while not raw_file:
-            with open(filename, "wb") as f:
+            with open(filename, "r+b" if resume else "wb") as f:
                 raw_file = await download_file(
                     client=self,
                     location=file,
                     out=f,
-                    progress_callback=(
-                        lambda completed, total: self.loop.create_task(
-                            progress(completed, total, event, start_time, message)
-                        )
-                    )
+                    checkpoint=checkpoint,
+                    progress_callback=reporter(event, message, start_time)
                     if show_progress
                     else None,
                 )
@@ -0,0 +1,90 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
+
+"""
+Value codec used by the database backends.
+
+Values are written as `ult:1:` followed by JSON, where python types
+JSON can't keep (non-str dict keys, tuples, sets, bytes) are tagged.
+Anything without the prefix is data written by older versions with
+`str()`, and is read back with `ast.literal_eval`.
+"""
+
+import ast
+import json
+from base64 import b64decode, b64encode
+
+VERSION = 1
+PREFIX = f"ult:{VERSION}:"
+
+_DICT, _TUPLE, _SET, _BYTES = "#d", "#t", "#s", "#b"
+_TAGS = {_DICT, _TUPLE, _SET, _BYTES}
+
+
+def _pack(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value) and not (
+            len(value) == 1 and next(iter(value)) in _TAGS
+        ):
+            return {key: _pack(data) for key, data in value.items()}
+        return {_DICT: [[_pack(key), _pack(data)] for key, data in value.items()]}
+    if isinstance(value, list):
+        return [_pack(data) for data in value]
+    if isinstance(value, tuple):
+        return {_TUPLE: [_pack(data) for data in value]}
+    if isinstance(value, (set, frozenset)):
+        return {_SET: [_pack(data) for data in value]}
+    if isinstance(value, bytes):
+        return {_BYTES: b64encode(value).decode()}
+    raise TypeError(type(value).__name__)
+
+
+def _hashable(value):
+    if isinstance(value, list):
+        return tuple(_hashable(data) for data in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def _unpack(data):
+    if len(data) != 1:
+        return data
+    tag, value = next(iter(data.items()))
+    if tag == _DICT:
+        return {_hashable(key): value for key, value in value}
+    if tag == _TUPLE:
+        return tuple(value)
+    if tag == _SET:
+        return set(map(_hashable, value))
+    if tag == _BYTES:
+        return b64decode(value)
+    return data
+
+
+def encode(value):
+    """Serialize 'value' to text, falling back to 'str()' for unknown types."""
+    try:
+        return PREFIX + json.dumps(
+            _pack(value), ensure_ascii=False, separators=(",", ":")
+        )
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def decode(data):
+    """Inverse of 'encode', also reading values written as 'str(value)'."""
+    if not isinstance(data, str):
+        return data
+    if data.startswith(PREFIX):
+        return json.loads(data[len(PREFIX) :], object_hook=_unpack)
+    try:
+        return ast.literal_eval(data)
+    except BaseException:
+        return data
@@ -5,12 +5,22 @@
 # PLease read the GNU Affero General Public License in
 # <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
 
-import ast
+import asyncio
+import atexit
 import os
+import select
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from urllib.parse import unquote
+from uuid import uuid4
 
 from .. import run_as_module
 from . import *
+from ._codec import decode, encode
 
 if run_as_module:
     from ..configs import Var
@@ -24,6 +34,12 @@ if Var.REDIS_URI or Var.REDISHOST:
         LOGS.info("Installing 'redis' for database.")
         os.system(f"{sys.executable} -m pip install -q redis hiredis")
         from redis import Redis
+    from redis.exceptions import ResponseError
+
+    try:
+        from redis.asyncio import Redis as AsyncRedis
+    except ImportError:
+        AsyncRedis = None
 elif Var.MONGO_URI:
     try:
         from pymongo import MongoClient
@@ -31,6 +47,13 @@ elif Var.MONGO_URI:
         LOGS.info("Installing 'pymongo' for database.")
         os.system(f"{sys.executable} -m pip install -q pymongo[srv]")
         from pymongo import MongoClient
+    from pymongo import ReplaceOne
+    from pymongo.errors import OperationFailure
+
+    try:
+        from motor.motor_asyncio import AsyncIOMotorClient
+    except ImportError:
+        AsyncIOMotorClient = None
 elif Var.DATABASE_URL:
     try:
         import psycopg2
@@ -38,6 +61,8 @@ elif Var.DATABASE_URL:
         LOGS.info("Installing 'pyscopg2' for database.")
         os.system(f"{sys.executable} -m pip install -q psycopg2-binary")
         import psycopg2
+    from psycopg2.extras import execute_values
+    from psycopg2.pool import ThreadedConnectionPool
 else:
     try:
         from localdb import Database
@@ -50,20 +75,60 @@ else:
 
 
 class _BaseDatabase:
+    # Threads used for backend calls made through the async API.
+    _workers = 4
+    # Whether the backend stores hashed keys field by field.
+    _native_hash = False
+    # Whether the backend stores set keys member by member.
+    _native_set = False
+
     def __init__(self, *args, **kwargs):
         self._cache = {}
+        self._hkeys = set()
+        # Set mirrors of set keys, and those stored natively by the backend.
+        self._sets = {}
+        self._skeys = set()
+        self._executor = None
+        # Write-behind state, see 'write_behind'.
+        self._write_delay = None
+        self._dirty = {}
+        self._dirty_fields = {}
+        self._dirty_members = {}
+        self._flush_handle = None
+        self._flush_lock = None
+        # Cross-process invalidation, see 'watch'.
+        self._instance = uuid4().hex
+        self._watching = False
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+        # Callbacks of 'on_change', by key.
+        self._hooks = {}
 
     def get_key(self, key):
         if key in self._cache:
+            self._stats["hits"] += 1
             return self._cache[key]
+        if self._dirty.get(key) is False:
+            return
+        self._stats["misses"] += 1
         value = self._get_data(key)
         self._cache.update({key: value})
         return value
 
     def re_cache(self):
         self._cache.clear()
-        for key in self.keys():
-            self._cache.update({key: self.get_key(key)})
+        self._sets.clear()
+        for key, value in self.get_many(self.keys()).items():
+            self._cache.update({key: self._get_data(data=value)})
+        for key in list(self._hooks):
+            self._changed(key)
+
+    def get_many(self, keys):
+        return {key: self.get(str(key)) for key in keys}
+
+    def set_many(self, mapping):
+        for key, value in mapping.items():
+            self.set(key, value)
+        return True
 
     def ping(self):
         return 1
@@ -78,25 +143,258 @@ class _BaseDatabase:
     def del_key(self, key):
         if key in self._cache:
             del self._cache[key]
+        self._hkeys.discard(key)
+        self._skeys.discard(key)
+        self._changed(key)
+        if self._write_delay:
+            return self._mark(key, False)
         self.delete(key)
+        self._notify([key])
         return True
 
     def _get_data(self, key=None, data=None):
         if key:
             data = self.get(str(key))
         if data and isinstance(data, str):
-            try:
-                data = ast.literal_eval(data)
-            except BaseException:
-                pass
+            data = decode(data)
         return data
 
     def set_key(self, key, value, cache_only=False):
         value = self._get_data(data=value)
         self._cache[key] = value
+        self._changed(key)
         if cache_only:
             return
-        return self.set(str(key), str(value))
+        self._hkeys.discard(key)
+        self._skeys.discard(key)
+        if self._write_delay:
+            return self._mark(key, True)
+        _ = self.set(str(key), encode(value))
+        self._notify([key])
+        return _
+
+    # Hashed keys: dict-valued keys whose entries can be written one by one.
+
+    def hgetall(self, key):
+        data = self.get_key(key)
+        return data if isinstance(data, dict) else {}
+
+    def hget(self, key, field, default=None):
+        return self.hgetall(key).get(field, default)
+
+    def hset(self, key, field, value):
+        data = self.hgetall(key)
+        data[field] = value
+        self._cache[key] = data
+        self._changed(key)
+        return self._hwrite(key, field)
+
+    def hdel(self, key, field):
+        data = self.hgetall(key)
+        if field not in data:
+            return False
+        del data[field]
+        if not data:
+            return self.del_key(key)
+        self._changed(key)
+        return self._hwrite(key, field)
+
+    def _hwrite(self, key, field):
+        if self._write_delay:
+            return self._mark(key, field=field)
+        _ = self._hcall(key, field)()
+        self._notify([key])
+        return _
+
+    def _hcall(self, key, field):
+        """Backend call writing one changed field of cached 'key', encoded now."""
+        data = self._cache.get(key) or {}
+        if not self._native_hash:
+            return partial(self.set, str(key), encode(data))
+        if field in data:
+            write = partial(self._hset, str(key), field, encode(data[field]))
+        else:
+            write = partial(self._hdel, str(key), field)
+        if key in self._hkeys:
+            return write
+        # First write here: an old whole-dict blob is rewritten in the hash
+        # layout, a key already stored as a hash just gets the field.
+        self._hkeys.add(key)
+        migrate = partial(
+            self._hmigrate,
+            str(key),
+            {field: encode(value) for field, value in data.items()},
+        )
+        return partial(self._first_write, str(key), "hash", write, migrate)
+
+    def _hfield(self, field):
+        return repr(field)
+
+    def _hunfield(self, field):
+        return self._get_data(data=field)
+
+    # Set keys: list-valued keys of unique members, checked against an
+    # in-memory set and written member by member.
+
+    def smembers(self, key):
+        """Set of the members of 'key', mirroring its cached list."""
+        members = self._sets.get(key)
+        if members is None:
+            data = self.get_key(key)
+            if data is None:
+                data = []
+            elif not isinstance(data, (list, tuple, set)):
+                data = [data]
+            members = self._sets[key] = set(data)
+        return members
+
+    def sismember(self, key, member):
+        return member in self.smembers(key)
+
+    def scard(self, key):
+        return len(self.smembers(key))
+
+    def sadd(self, key, member):
+        members = self.smembers(key)
+        if member in members:
+            return False
+        data = self._cache.get(key)
+        if isinstance(data, list):
+            data.append(member)
+        else:
+            self._cache[key] = [*members, member]
+        members.add(member)
+        self._changed(key)
+        self._sets[key] = members
+        return self._swrite(key, member)
+
+    def srem(self, key, member):
+        members = self.smembers(key)
+        if member not in members:
+            return False
+        members.discard(member)
+        if not members:
+            return self.del_key(key)
+        data = self._cache.get(key)
+        if isinstance(data, list):
+            data.remove(member)
+        else:
+            self._cache[key] = list(members)
+        self._changed(key)
+        self._sets[key] = members
+        return self._swrite(key, member)
+
+    def _swrite(self, key, member):
+        if self._write_delay:
+            return self._mark(key, member=member)
+        _ = self._scall(key, member)()
+        self._notify([key])
+        return _
+
+    def _scall(self, key, member):
+        """Backend call writing one added or removed member of cached 'key'."""
+        data = self._cache.get(key) or []
+        if not self._native_set:
+            return partial(self.set, str(key), encode(data))
+        if member in self.smembers(key):
+            write = partial(self._sadd, str(key), encode(member))
+        else:
+            write = partial(self._srem, str(key), encode(member))
+        if key in self._skeys:
+            return write
+        # First write here: a whole list is rewritten as a set once.
+        self._skeys.add(key)
+        migrate = partial(self._smigrate, str(key), [encode(x) for x in data])
+        return partial(self._first_write, str(key), "set", write, migrate)
+
+    def _first_write(self, key, kind, write, migrate):
+        return write() if self._stored_as(key, kind) else migrate()
+
+    def _stored_as(self, key, kind):
+        """Whether 'key' is stored in the native layout 'kind', "hash" or "set"."""
+        return False
+
+    # Write-behind: writes only touch '_cache' and are sent to the backend
+    # in one batch, 'delay' seconds after the first of them.
+
+    def write_behind(self, delay=1):
+        if not self._write_delay:
+            atexit.register(self.flush)
+        self._write_delay = delay
+
+    def _mark(self, key, exists=None, field=None, member=None):
+        if exists is not None:
+            self._dirty[key] = exists
+            self._dirty_fields.pop(key, None)
+            self._dirty_members.pop(key, None)
+        elif member is not None and self._native_set:
+            self._dirty_members.setdefault(key, set()).add(member)
+        elif member is None and self._native_hash:
+            self._dirty_fields.setdefault(key, set()).add(field)
+        else:
+            self._dirty[key] = True
+        if self._flush_handle:
+            return True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Nothing to schedule on, write through.
+            self.flush()
+            return True
+        self._flush_handle = loop.call_later(
+            self._write_delay, lambda: loop.create_task(self.aflush())
+        )
+        return True
+
+    def _pending_calls(self):
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        dirty, fields = self._dirty, self._dirty_fields
+        members = self._dirty_members
+        self._dirty, self._dirty_fields, self._dirty_members = {}, {}, {}
+        if not (dirty or fields or members):
+            return []
+        calls = []
+        if to_set := {
+            str(key): encode(self._cache.get(key)) for key in dirty if dirty[key]
+        }:
+            calls.append(partial(self.set_many, to_set))
+        calls.extend(partial(self.delete, str(key)) for key in dirty if not dirty[key])
+        for key, names in fields.items():
+            calls.extend(self._hcall(key, field) for field in names)
+        for key, names in members.items():
+            calls.extend(self._scall(key, member) for member in names)
+        calls.append(partial(self._notify, [*dirty, *fields, *members]))
+        return calls
+
+    def flush(self):
+        """Write pending write-behind changes, blocking."""
+        for call in self._pending_calls():
+            call()
+
+    async def aflush(self):
+        if not self._flush_lock:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if calls := self._pending_calls():
+                await self._run(lambda: [call() for call in calls])
+
+    # Change hooks: let callers keep values derived from some keys, and
+    # drop them when those keys are written here or by another process.
+
+    def on_change(self, keys, callback):
+        """Call 'callback(key)' whenever one of 'keys' changes."""
+        for key in keys:
+            self._hooks.setdefault(key, []).append(callback)
+
+    def _changed(self, key):
+        self._sets.pop(key, None)
+        for callback in self._hooks.get(key, ()):
+            try:
+                callback(key)
+            except Exception as er:
+                LOGS.exception(er)
 
     def rename(self, key1, key2):
         _ = self.get_key(key1)
@@ -106,16 +404,175 @@ class _BaseDatabase:
             return 0
         return 1
 
+    # Async API: cache hits return at once, backend calls never block the loop.
+    # Backends with an asyncio driver override '_async_get/set/delete'.
+
+    async def _run(self, func, *args):
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(
+                self._workers, thread_name_prefix="udB"
+            )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, partial(func, *args)
+        )
+
+    async def _async_get(self, key):
+        return await self._run(self.get, key)
+
+    async def _async_set(self, key, value):
+        return await self._run(self.set, key, value)
+
+    async def _async_delete(self, key):
+        return await self._run(self.delete, key)
+
+    async def aget(self, key):
+        if key in self._cache:
+            self._stats["hits"] += 1
+            return self._cache[key]
+        if self._dirty.get(key) is False:
+            return
+        self._stats["misses"] += 1
+        value = self._get_data(data=await self._async_get(str(key)))
+        self._cache.update({key: value})
+        return value
+
+    async def aset(self, key, value, cache_only=False):
+        value = self._get_data(data=value)
+        self._cache[key] = value
+        self._changed(key)
+        if cache_only:
+            return
+        self._hkeys.discard(key)
+        self._skeys.discard(key)
+        if self._write_delay:
+            return self._mark(key, True)
+        _ = await self._async_set(str(key), encode(value))
+        await self._anotify([key])
+        return _
+
+    async def adel(self, key):
+        self._cache.pop(key, None)
+        self._hkeys.discard(key)
+        self._skeys.discard(key)
+        self._changed(key)
+        if self._write_delay:
+            return self._mark(key, False)
+        await self._async_delete(str(key))
+        await self._anotify([key])
+        return True
+
+    async def ahget(self, key, field, default=None):
+        data = await self.aget(key)
+        return data.get(field, default) if isinstance(data, dict) else default
+
+    async def ahset(self, key, field, value):
+        data = await self.aget(key)
+        if not isinstance(data, dict):
+            data = {}
+        data[field] = value
+        self._cache[key] = data
+        self._changed(key)
+        return await self._ahwrite(key, field)
+
+    async def ahdel(self, key, field):
+        data = await self.aget(key)
+        if not isinstance(data, dict) or field not in data:
+            return False
+        del data[field]
+        if not data:
+            return await self.adel(key)
+        self._changed(key)
+        return await self._ahwrite(key, field)
+
+    async def _ahwrite(self, key, field):
+        if self._write_delay:
+            return self._mark(key, field=field)
+        _ = await self._run(self._hcall(key, field))
+        await self._anotify([key])
+        return _
+
+    # Cross-process invalidation: with several processes on one database,
+    # each one tells the others which keys it wrote, and they drop them
+    # from '_cache' so the next read fetches the new value.
+
+    @property
+    def cache_stats(self):
+        return {**self._stats, "keys": len(self._cache), "watching": self._watching}
+
+    def watch(self):
+        """Start listening for writes by other processes."""
+        self._watching = self._listen()
+        return self._watching
+
+    def _listen(self):
+        return False
+
+    def _publish(self, keys):
+        pass
+
+    def _notify(self, keys):
+        if self._watching and keys:
+            self._publish([str(key) for key in keys])
+
+    async def _anotify(self, keys):
+        if self._watching:
+            await self._run(self._notify, keys)
+
+    def _invalidate(self, key, instance=None):
+        if instance == self._instance or key in self._dirty:
+            return
+        if key in self._dirty_fields or key in self._dirty_members:
+            return
+        self._stats["invalidations"] += 1
+        self._cache.pop(key, None)
+        self._hkeys.discard(key)
+        self._skeys.discard(key)
+        self._changed(key)
+
+    def _on_message(self, message):
+        instance, _, key = message.partition(" ")
+        self._invalidate(key, instance)
+
+    def _message(self, key):
+        return f"{self._instance} {key}"
+
 
 class MongoDB(_BaseDatabase):
-    def __init__(self, key, dbname="UltroidDB"):
+    _native_hash = True
+    _native_set = True
+
+    def __init__(self, key, dbname="UltroidDB", collection="Ultroid_kv"):
+        self._uri = key
+        self._dbname = dbname
+        self._collection = collection
         self.dB = MongoClient(key, serverSelectionTimeoutMS=5000)
         self.db = self.dB[dbname]
+        self._store = self.db[collection]
+        self._async_store = None
         super().__init__()
+        self._migrate_collections()
 
     def __repr__(self):
         return f"<Ultroid.MonGoDB\n -total_keys: {len(self.keys())}\n>"
 
+    def _migrate_collections(self):
+        """Move keys from the old layout, where each key had its own collection."""
+        requests, old = [], []
+        for name in self.db.list_collection_names():
+            if name == self._collection:
+                continue
+            if doc := self.db[name].find_one({"_id": name}):
+                requests.append(
+                    ReplaceOne({"_id": name}, {"value": doc["value"]}, upsert=True)
+                )
+                old.append(name)
+        if not requests:
+            return
+        LOGS.info(f"Migrating {len(requests)} keys to single Mongo collection...")
+        self._store.bulk_write(requests, ordered=False)
+        for name in old:
+            self.db.drop_collection(name)
+
     @property
     def name(self):
         return "Mongo"
@@ -129,27 +586,175 @@ class MongoDB(_BaseDatabase):
             return True
 
     def keys(self):
-        return self.db.list_collection_names()
+        return self._store.distinct("_id")
+
+    def re_cache(self):
+        self._cache.clear()
+        self._sets.clear()
+        for doc in self._store.find({}):
+            self._cache[doc["_id"]] = self._get_data(data=self._value(doc))
+
+    def _value(self, doc):
+        value = doc["value"]
+        if isinstance(value, dict):
+            return {
+                self._hunfield(unquote(field)): self._get_data(data=data)
+                for field, data in value.items()
+            }
+        if isinstance(value, list):
+            return [self._get_data(data=data) for data in value]
+        return value
 
     def set(self, key, value):
-        if key in self.keys():
-            self.db[key].replace_one({"_id": key}, {"value": str(value)})
-        else:
-            self.db[key].insert_one({"_id": key, "value": str(value)})
+        self._store.replace_one(
+            {"_id": key}, {"value": str(value), "by": self._instance}, upsert=True
+        )
         return True
 
     def delete(self, key):
-        self.db.drop_collection(key)
+        self._store.delete_one({"_id": key})
 
     def get(self, key):
-        if x := self.db[key].find_one({"_id": key}):
-            return x["value"]
+        if x := self._store.find_one({"_id": key}):
+            return self._value(x)
+
+    def get_many(self, keys):
+        return {
+            doc["_id"]: self._value(doc)
+            for doc in self._store.find({"_id": {"$in": list(keys)}})
+        }
+
+    def set_many(self, mapping):
+        if mapping:
+            self._store.bulk_write(
+                [
+                    ReplaceOne(
+                        {"_id": key},
+                        {"value": str(value), "by": self._instance},
+                        upsert=True,
+                    )
+                    for key, value in mapping.items()
+                ],
+                ordered=False,
+            )
+        return True
+
+    def _hfield(self, field):
+        # Mongo field names can't hold "." or "$".
+        return (
+            repr(field).replace("%", "%25").replace(".", "%2E").replace("$", "%24")
+        )
+
+    def _hmigrate(self, key, data):
+        value = {self._hfield(field): data[field] for field in data}
+        self._store.replace_one(
+            {"_id": key}, {"value": value, "by": self._instance}, upsert=True
+        )
+        return True
+
+    def _hset(self, key, field, value):
+        self._store.update_one(
+            {"_id": key},
+            {
+                "$set": {
+                    f"value.{self._hfield(field)}": value,
+                    "by": self._instance,
+                }
+            },
+            upsert=True,
+        )
+        return True
+
+    def _hdel(self, key, field):
+        self._store.update_one(
+            {"_id": key},
+            {
+                "$unset": {f"value.{self._hfield(field)}": ""},
+                "$set": {"by": self._instance},
+            },
+        )
+        return True
+
+    def _stored_as(self, key, kind):
+        value_type = "object" if kind == "hash" else "array"
+        return bool(
+            self._store.find_one(
+                {"_id": key, "value": {"$type": value_type}}, {"_id": 1}
+            )
+        )
+
+    def _smigrate(self, key, members):
+        self._store.replace_one(
+            {"_id": key}, {"value": members, "by": self._instance}, upsert=True
+        )
+        return True
+
+    def _sadd(self, key, member):
+        self._store.update_one(
+            {"_id": key},
+            {"$addToSet": {"value": member}, "$set": {"by": self._instance}},
+            upsert=True,
+        )
+        return True
+
+    def _srem(self, key, member):
+        self._store.update_one(
+            {"_id": key},
+            {"$pull": {"value": member}, "$set": {"by": self._instance}},
+        )
+        return True
 
     def flushall(self):
-        self.dB.drop_database("UltroidDB")
+        self.dB.drop_database(self._dbname)
         self._cache.clear()
+        self._sets.clear()
+        return True
+
+    def _listen(self):
+        # Change streams need a replica set (Atlas and most hosts have one).
+        try:
+            stream = self._store.watch(full_document="updateLookup")
+        except OperationFailure as er:
+            LOGS.warning(f"Mongo change streams unavailable: {er}")
+            return False
+
+        def listen():
+            with stream:
+                for change in stream:
+                    doc = change.get("fullDocument") or {}
+                    self._invalidate(change["documentKey"]["_id"], doc.get("by"))
+
+        threading.Thread(target=listen, name="udB-watch", daemon=True).start()
+        return True
+
+    # Async access through motor, so handlers don't block the event loop.
+
+    @property
+    def async_store(self):
+        if self._async_store is None and AsyncIOMotorClient:
+            client = AsyncIOMotorClient(self._uri, serverSelectionTimeoutMS=5000)
+            self._async_store = client[self._dbname][self._collection]
+        return self._async_store
+
+    async def _async_get(self, key):
+        if self.async_store is None:
+            return await super()._async_get(key)
+        if doc := await self.async_store.find_one({"_id": key}):
+            return self._value(doc)
+
+    async def _async_set(self, key, value):
+        if self.async_store is None:
+            return await super()._async_set(key, value)
+        await self.async_store.replace_one(
+            {"_id": key}, {"value": str(value), "by": self._instance}, upsert=True
+        )
         return True
 
+    async def _async_delete(self, key):
+        if self.async_store is None:
+            return await super()._async_delete(key)
+        await self.async_store.delete_one({"_id": key})
+
 
 # --------------------------------------------------------------------------------------------- #
 
@@ -160,82 +765,216 @@ class MongoDB(_BaseDatabase):
 
 
 class SqlDB(_BaseDatabase):
-    def __init__(self, url):
+    _native_hash = True
+
+    def __init__(self, url, minconn=1, maxconn=8):
         self._url = url
-        self._connection = None
-        self._cursor = None
+        self._pool = None
         try:
-            self._connection = psycopg2.connect(dsn=url)
-            self._connection.autocommit = True
-            self._cursor = self._connection.cursor()
-            self._cursor.execute(
-                "CREATE TABLE IF NOT EXISTS Ultroid (ultroidCli varchar(70))"
-            )
+            self._pool = ThreadedConnectionPool(minconn, maxconn, dsn=url)
+            with self._cursor() as cursor:
+                cursor.execute(
+                    "CREATE TABLE IF NOT EXISTS Ultroid_kv (key TEXT PRIMARY KEY, value TEXT)"
+                )
+                cursor.execute(
+                    "CREATE TABLE IF NOT EXISTS Ultroid_hash (key TEXT, field TEXT, value TEXT, PRIMARY KEY (key, field))"
+                )
+            self._migrate_columns()
         except Exception as error:
             LOGS.exception(error)
             LOGS.info("Invaid SQL Database")
-            if self._connection:
-                self._connection.close()
+            if self._pool:
+                self._pool.closeall()
             sys.exit()
         super().__init__()
 
+    @contextmanager
+    def _cursor(self):
+        connection = self._pool.getconn()
+        try:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                yield cursor
+        finally:
+            self._pool.putconn(connection)
+
+    # Keys used in lowercase, among the columns of the old layout.
+    _lower_keys = {"artist", "calc", "language"}
+
+    def _column_key(self, column):
+        # Unquoted column names were folded to lowercase by Postgres, so an
+        # all-lowercase one is upper-cased back, unless it is a known key.
+        if column != column.lower() or column in self._lower_keys:
+            return column
+        return column.upper()
+
+    def _migrate_columns(self):
+        """Move keys from the old layout, where each key was a column of 'Ultroid'."""
+        with self._cursor() as cursor:
+            cursor.execute(
+                "SELECT column_name FROM information_schema.columns WHERE table_schema = 'public' AND table_name = 'ultroid'"
+            )
+            columns = [_[0] for _ in cursor.fetchall() if _[0] != "ultroidcli"]
+            if not columns:
+                cursor.execute("DROP TABLE IF EXISTS Ultroid")
+                return
+            LOGS.info(f"Migrating {len(columns)} keys to new SQL layout...")
+            data = {}
+            for column in columns:
+                cursor.execute(
+                    f'SELECT "{column}" FROM Ultroid WHERE "{column}" IS NOT NULL LIMIT 1'
+                )
+                if value := cursor.fetchone():
+                    data[self._column_key(column)] = value[0]
+        self.set_many(data)
+        with self._cursor() as cursor:
+            cursor.execute("DROP TABLE Ultroid")
+
     @property
     def name(self):
         return "SQL"
 
     @property
     def usage(self):
-        self._cursor.execute(
-            "SELECT pg_size_pretty(pg_relation_size('Ultroid')) AS size"
-        )
-        data = self._cursor.fetchall()
-        return int(data[0][0].split()[0])
+        with self._cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_total_relation_size('Ultroid_kv') + pg_total_relation_size('Ultroid_hash')"
+            )
+            return cursor.fetchone()[0]
 
     def keys(self):
-        self._cursor.execute(
-            "SELECT column_name FROM information_schema.columns WHERE table_schema = 'public' AND table_name  = 'ultroid'"
-        )  # case sensitive
-        data = self._cursor.fetchall()
-        return [_[0] for _ in data]
+        with self._cursor() as cursor:
+            cursor.execute(
+                "SELECT key FROM Ultroid_kv UNION SELECT DISTINCT key FROM Ultroid_hash"
+            )
+            return [_[0] for _ in cursor.fetchall()]
 
-    def get(self, variable):
-        try:
-            self._cursor.execute(f"SELECT {variable} FROM Ultroid")
-        except psycopg2.errors.UndefinedColumn:
-            return None
-        data = self._cursor.fetchall()
-        if not data:
-            return None
-        if len(data) >= 1:
-            for i in data:
-                if i[0]:
-                    return i[0]
+    def get(self, key):
+        with self._cursor() as cursor:
+            cursor.execute("SELECT value FROM Ultroid_kv WHERE key = %s", (key,))
+            if data := cursor.fetchone():
+                return data[0]
+        return self._hgetall(key)
+
+    def get_many(self, keys):
+        keys = list(keys)
+        with self._cursor() as cursor:
+            cursor.execute(
+                "SELECT key, value FROM Ultroid_kv WHERE key = ANY(%s)", (keys,)
+            )
+            data = dict(cursor.fetchall())
+            cursor.execute(
+                "SELECT key, field, value FROM Ultroid_hash WHERE key = ANY(%s)",
+                (keys,),
+            )
+            for key, field, value in cursor.fetchall():
+                data.setdefault(key, {})[self._hunfield(field)] = self._get_data(
+                    data=value
+                )
+        return data
 
     def set(self, key, value):
-        try:
-            self._cursor.execute(f"ALTER TABLE Ultroid DROP COLUMN IF EXISTS {key}")
-        except (psycopg2.errors.UndefinedColumn, psycopg2.errors.SyntaxError):
-            pass
-        except BaseException as er:
-            LOGS.exception(er)
-        self._cache.update({key: value})
-        self._cursor.execute(f"ALTER TABLE Ultroid ADD {key} TEXT")
-        self._cursor.execute(f"INSERT INTO Ultroid ({key}) values (%s)", (str(value),))
+        return self.set_many({key: value})
+
+    def set_many(self, mapping):
+        if not mapping:
+            return True
+        with self._cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM Ultroid_hash WHERE key = ANY(%s)", (list(mapping),)
+            )
+            execute_values(
+                cursor,
+                "INSERT INTO Ultroid_kv (key, value) VALUES %s ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value",
+                [(key, str(value)) for key, value in mapping.items()],
+            )
         return True
 
     def delete(self, key):
-        try:
-            self._cursor.execute(f"ALTER TABLE Ultroid DROP COLUMN {key}")
-        except psycopg2.errors.UndefinedColumn:
-            return False
+        with self._cursor() as cursor:
+            cursor.execute("DELETE FROM Ultroid_hash WHERE key = %s", (key,))
+            cursor.execute("DELETE FROM Ultroid_kv WHERE key = %s", (key,))
+            return bool(cursor.rowcount)
+
+    def _hgetall(self, key):
+        with self._cursor() as cursor:
+            cursor.execute(
+                "SELECT field, value FROM Ultroid_hash WHERE key = %s", (key,)
+            )
+            data = cursor.fetchall()
+        if data:
+            return {
+                self._hunfield(field): self._get_data(data=value)
+                for field, value in data
+            }
+
+    def _stored_as(self, key, kind):
+        with self._cursor() as cursor:
+            cursor.execute("SELECT 1 FROM Ultroid_kv WHERE key = %s", (key,))
+            if cursor.fetchone():
+                return False
+            cursor.execute("SELECT 1 FROM Ultroid_hash WHERE key = %s LIMIT 1", (key,))
+            return bool(cursor.fetchone())
+
+    def _hmigrate(self, key, data):
+        with self._cursor() as cursor:
+            cursor.execute("DELETE FROM Ultroid_kv WHERE key = %s", (key,))
+            cursor.execute("DELETE FROM Ultroid_hash WHERE key = %s", (key,))
+            if data:
+                execute_values(
+                    cursor,
+                    "INSERT INTO Ultroid_hash (key, field, value) VALUES %s",
+                    [
+                        (key, self._hfield(field), value)
+                        for field, value in data.items()
+                    ],
+                )
+        return True
+
+    def _hset(self, key, field, value):
+        with self._cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO Ultroid_hash (key, field, value) VALUES (%s, %s, %s) ON CONFLICT (key, field) DO UPDATE SET value = EXCLUDED.value",
+                (key, self._hfield(field), value),
+            )
+        return True
+
+    def _hdel(self, key, field):
+        with self._cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM Ultroid_hash WHERE key = %s AND field = %s",
+                (key, self._hfield(field)),
+            )
         return True
 
     def flushall(self):
         self._cache.clear()
-        self._cursor.execute("DROP TABLE Ultroid")
-        self._cursor.execute(
-            "CREATE TABLE IF NOT EXISTS Ultroid (ultroidCli varchar(70))"
-        )
+        self._sets.clear()
+        with self._cursor() as cursor:
+            cursor.execute("TRUNCATE Ultroid_kv, Ultroid_hash")
+        return True
+
+    def _publish(self, keys):
+        with self._cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_notify('ultroid_kv', message) FROM unnest(%s) AS message",
+                ([self._message(key) for key in keys],),
+            )
+
+    def _listen(self):
+        connection = psycopg2.connect(dsn=self._url)
+        connection.autocommit = True
+        connection.cursor().execute("LISTEN ultroid_kv")
+
+        def listen():
+            while True:
+                if select.select([connection], [], [], 30) == ([], [], []):
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    self._on_message(connection.notifies.pop(0).payload)
+
+        threading.Thread(target=listen, name="udB-watch", daemon=True).start()
         return True
 
 
@@ -243,6 +982,9 @@ class SqlDB(_BaseDatabase):
 
 
 class RedisDB(_BaseDatabase):
+    _native_hash = True
+    _native_set = True
+
     def __init__(
         self,
         host,
@@ -283,8 +1025,8 @@ class RedisDB(_BaseDatabase):
                 kwargs["port"] = os.environ.get(f"QOVERY_REDIS_{hash_}_PORT")
                 kwargs["password"] = os.environ.get(f"QOVERY_REDIS_{hash_}_PASSWORD")
         self.db = Redis(**kwargs)
+        self._async_db = AsyncRedis(**kwargs) if AsyncRedis else None
         self.set = self.db.set
-        self.get = self.db.get
         self.keys = self.db.keys
         self.delete = self.db.delete
         super().__init__()
@@ -293,6 +1035,93 @@ class RedisDB(_BaseDatabase):
     def name(self):
         return "Redis"
 
+    def get(self, key):
+        try:
+            return self.db.get(key)
+        except ResponseError:
+            # WRONGTYPE: key is stored as a set or a hash.
+            if self.db.type(key) == "set":
+                return [self._get_data(data=x) for x in self.db.smembers(key)]
+            return {
+                self._hunfield(field): self._get_data(data=value)
+                for field, value in self.db.hgetall(key).items()
+            }
+
+    def set_many(self, mapping):
+        return self.db.mset(mapping) if mapping else True
+
+    def _publish(self, keys):
+        with self.db.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.publish("ultroid:keys", self._message(key))
+            pipe.execute()
+
+    def _listen(self):
+        pubsub = self.db.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{"ultroid:keys": lambda msg: self._on_message(msg["data"])})
+        pubsub.run_in_thread(sleep_time=1, daemon=True)
+        return True
+
+    async def _async_get(self, key):
+        if not self._async_db:
+            return await super()._async_get(key)
+        try:
+            return await self._async_db.get(key)
+        except ResponseError:
+            if await self._async_db.type(key) == "set":
+                members = await self._async_db.smembers(key)
+                return [self._get_data(data=x) for x in members]
+            return {
+                self._hunfield(field): self._get_data(data=value)
+                for field, value in (await self._async_db.hgetall(key)).items()
+            }
+
+    async def _async_set(self, key, value):
+        if not self._async_db:
+            return await super()._async_set(key, value)
+        return await self._async_db.set(key, value)
+
+    async def _async_delete(self, key):
+        if not self._async_db:
+            return await super()._async_delete(key)
+        return await self._async_db.delete(key)
+
+    def _hmigrate(self, key, data):
+        with self.db.pipeline() as pipe:
+            pipe.delete(key)
+            if data:
+                pipe.hset(
+                    key,
+                    mapping={
+                        self._hfield(field): value for field, value in data.items()
+                    },
+                )
+            pipe.execute()
+        return True
+
+    def _hset(self, key, field, value):
+        return self.db.hset(key, self._hfield(field), value)
+
+    def _hdel(self, key, field):
+        return self.db.hdel(key, self._hfield(field))
+
+    def _stored_as(self, key, kind):
+        return self.db.type(key) == kind
+
+    def _smigrate(self, key, members):
+        with self.db.pipeline() as pipe:
+            pipe.delete(key)
+            if members:
+                pipe.sadd(key, *members)
+            pipe.execute()
+        return True
+
+    def _sadd(self, key, member):
+        return self.db.sadd(key, member)
+
+    def _srem(self, key, member):
+        return self.db.srem(key, member)
+
     @property
     def usage(self):
         return sum(self.db.memory_usage(x) for x in self.keys())
@@ -302,17 +1131,49 @@ class RedisDB(_BaseDatabase):
 
 
 class LocalDB(_BaseDatabase):
+    # The file is rewritten on every set, keep writes in order.
+    _workers = 1
+
     def __init__(self):
         self.db = Database("ultroid")
         self.get = self.db.get
-        self.set = self.db.set
-        self.delete = self.db.delete
+        self._mtime = None
         super().__init__()
 
     @property
     def name(self):
         return "LocalDB"
 
+    def set(self, key, value):
+        _ = self.db.set(key, value)
+        self._mtime = os.path.getmtime(self.db.name)
+        return _
+
+    def delete(self, key):
+        _ = self.db.delete(key)
+        self._mtime = os.path.getmtime(self.db.name)
+        return _
+
+    def _listen(self):
+        # No server to push changes, watch the file for writes by others.
+        self._mtime = os.path.getmtime(self.db.name)
+
+        def listen():
+            while True:
+                time.sleep(2)
+                mtime = os.path.getmtime(self.db.name)
+                if mtime == self._mtime:
+                    continue
+                self._mtime = mtime
+                old = dict(self.db._cache)
+                self.db._data()
+                for key in {*old, *self.db._cache}:
+                    if old.get(key) != self.db._cache.get(key):
+                        self._invalidate(key)
+
+        threading.Thread(target=listen, name="udB-watch", daemon=True).start()
+        return True
+
     def keys(self):
         return self._cache.keys()
 
@@ -0,0 +1,212 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
+
+"""
+Index of the dialogs of a client, for the global tools.
+
+Keeps the type, access hash and admin rights of every chat, saved in the
+database, so global actions can pick their chats without walking every
+dialog each time. Joins, leaves and promotions seen in updates keep it
+fresh, and it is rebuilt once it gets older than 'max_age'.
+"""
+
+import asyncio
+import time
+
+from telethon import events, utils
+from telethon.errors import ChannelPrivateError
+from telethon.tl.types import (
+    Channel,
+    Chat,
+    InputPeerChannel,
+    InputPeerChat,
+    InputPeerUser,
+    PeerChannel,
+    PeerChat,
+    UpdateChannel,
+    UpdateChat,
+    UpdateChatParticipantAdmin,
+    User,
+)
+
+from . import LOGS
+
+# Dialog types, by what Telethon's 'Dialog.is_group' / 'is_channel' match.
+GROUPS = ("chat", "megagroup")
+CHANNELS = ("megagroup", "channel")
+
+
+def _entry(entity):
+    if isinstance(entity, User):
+        kind = "bot" if entity.bot else "user"
+    elif isinstance(entity, Chat):
+        kind = "chat"
+    elif isinstance(entity, Channel):
+        kind = "megagroup" if entity.megagroup else "channel"
+    else:
+        return
+    if getattr(entity, "creator", False):
+        rights = ["creator"]
+    elif admin_rights := getattr(entity, "admin_rights", None):
+        rights = [k for k, v in admin_rights.to_dict().items() if v is True]
+    else:
+        rights = []
+    return {
+        "type": kind,
+        "hash": getattr(entity, "access_hash", None),
+        "rights": rights,
+    }
+
+
+class DialogIndex:
+    def __init__(self, client, max_age=24 * 60 * 60, save_delay=30):
+        self.client = client
+        self.max_age = max_age
+        self.save_delay = save_delay
+        self._chats = {}
+        self._time = 0
+        self._lock = asyncio.Lock()
+        self._watching = False
+        self._save_handle = None
+
+    @property
+    def _key(self):
+        return f"DIALOGS_{self.client.uid}"
+
+    async def load(self):
+        """Index of the client, rebuilt if it is missing or too old."""
+        async with self._lock:
+            if not self._time:
+                data = await self.client.udB.aget(self._key)
+                if data:
+                    self._chats, self._time = data["chats"], data["time"]
+            if time.time() - self._time > self.max_age:
+                await self._rebuild()
+            self._watch()
+        return self
+
+    async def refresh(self):
+        async with self._lock:
+            await self._rebuild()
+        return self
+
+    async def _rebuild(self):
+        start = time.time()
+        chats = {}
+        async for dialog in self.client.iter_dialogs():
+            if entry := _entry(dialog.entity):
+                chats[dialog.id] = entry
+        self._chats, self._time = chats, time.time()
+        self._save()
+        LOGS.info(f"Indexed {len(chats)} dialogs in {time.time() - start:.1f}s.")
+
+    def _save(self):
+        self._save_handle = None
+        data = {"time": self._time, "chats": self._chats}
+        self.client.udB.set_key(self._key, data)
+
+    def _changed(self):
+        if not self._save_handle:
+            self._save_handle = asyncio.get_running_loop().call_later(
+                self.save_delay, self._save
+            )
+
+    def update(self, entity):
+        if not (entry := _entry(entity)):
+            return
+        chat_id = utils.get_peer_id(entity)
+        if getattr(entity, "left", False) or getattr(entity, "deactivated", False):
+            self.remove(chat_id)
+        elif self._chats.get(chat_id) != entry:
+            self._chats[chat_id] = entry
+            self._changed()
+
+    def remove(self, chat_id):
+        if self._chats.pop(chat_id, None):
+            self._changed()
+
+    def drop_rights(self, chat_id):
+        """Forget our rights in 'chat_id', after Telegram said we lack them."""
+        if entry := self._chats.get(chat_id):
+            entry["rights"] = []
+            self._changed()
+
+    def __contains__(self, chat_id):
+        return chat_id in self._chats
+
+    def __len__(self):
+        return len(self._chats)
+
+    def chats(self, types=None, right=None, admin=False):
+        """Ids of chats of one of 'types', where we have 'right' if given,
+        or are an admin at all if 'admin'."""
+        return [
+            chat_id
+            for chat_id, entry in self._chats.items()
+            if (not types or entry["type"] in types)
+            and (not admin or entry["rights"])
+            and (
+                not right
+                or "creator" in entry["rights"]
+                or right in entry["rights"]
+            )
+        ]
+
+    def input_peer(self, chat_id):
+        entry = self._chats.get(chat_id)
+        if not entry:
+            return chat_id
+        peer_id, _ = utils.resolve_id(chat_id)
+        if entry["type"] == "chat":
+            return InputPeerChat(peer_id)
+        if entry["type"] in CHANNELS:
+            return InputPeerChannel(peer_id, entry["hash"])
+        return InputPeerUser(peer_id, entry["hash"])
+
+    def _watch(self):
+        if self._watching:
+            return
+        self._watching = True
+        client = self.client
+        updates = (UpdateChannel, UpdateChat, UpdateChatParticipantAdmin)
+        client.add_event_handler(self._on_update, events.Raw(types=updates))
+        client.add_event_handler(self._on_action, events.ChatAction())
+        client.add_event_handler(
+            self._on_message,
+            events.NewMessage(func=lambda e: e.chat_id not in self._chats),
+        )
+
+    async def _on_update(self, update):
+        if isinstance(update, UpdateChannel):
+            peer = PeerChannel(update.channel_id)
+        else:
+            if isinstance(update, UpdateChatParticipantAdmin) and (
+                update.user_id != self.client.uid
+            ):
+                return
+            peer = PeerChat(update.chat_id)
+        entity = getattr(update, "_entities", {}).get(utils.get_peer_id(peer))
+        try:
+            entity = entity or await self.client.get_entity(peer)
+        except (ChannelPrivateError, ValueError):
+            return self.remove(utils.get_peer_id(peer))
+        except Exception as er:
+            return LOGS.debug(f"Dialog index: {er}")
+        self.update(entity)
+
+    async def _on_action(self, event):
+        if self.client.uid not in (event.user_ids or []):
+            return
+        if event.user_left or event.user_kicked:
+            return self.remove(event.chat_id)
+        if event.user_joined or event.user_added:
+            if chat := await event.get_chat():
+                self.update(chat)
+
+    async def _on_message(self, event):
+        if chat := await event.get_chat():
+            self.update(chat)
@@ -511,7 +511,7 @@ def _version_changes(udb):
     ]:
         key = udb.get_key(_)
         if key and str(key)[0] != "[":
-            key = udb.get(_)
+            key = str(key)
             new_ = [
                 int(z) if z.isdigit() or (z.startswith("-") and z[1:].isdigit()) else z
                 for z in key.split()
@@ -8,6 +8,7 @@
 import os
 import subprocess
 import sys
+import time
 from shutil import rmtree
 
 from decouple import config
@@ -45,7 +46,18 @@ def _after_load(loader, module, plugin_name=""):
                 loader._logger.exception(em)
 
 
+def _rss():
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # Peak resident size, in KB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024
+
+
 def load_other_plugins(addons=None, pmbot=None, manager=None, vcbot=None):
+    start = time.time()
+    lazy = bool(udB.get_key("LAZY_PLUGINS") or config("LAZY_PLUGINS", None))
 
     # for official
     _exclude = udB.get_key("EXCLUDE_OFFICIAL") or config("EXCLUDE_OFFICIAL", None)
@@ -54,7 +66,9 @@ def load_other_plugins(addons=None, pmbot=None, manager=None, vcbot=None):
     # "INCLUDE_ONLY" was added to reduce Big List in "EXCLUDE_OFFICIAL" Plugin
     _in_only = udB.get_key("INCLUDE_ONLY") or config("INCLUDE_ONLY", None)
     _in_only = _in_only.split() if _in_only else []
-    Loader().load(include=_in_only, exclude=_exclude, after_load=_after_load)
+    Loader().load(
+        include=_in_only, exclude=_exclude, after_load=_after_load, lazy=lazy
+    )
 
     # for assistant
     if not USER_MODE and not udB.get_key("DISABLE_AST_PLUGINS"):
@@ -65,6 +79,11 @@ def load_other_plugins(addons=None, pmbot=None, manager=None, vcbot=None):
             log=False, exclude=_ast_exc, after_load=_after_load
         )
 
+    LOGS.info(
+        f"Loaded plugins{' lazily' if lazy else ''} in {time.time() - start:.2f}s"
+        f" (peak RSS: {_rss()} MB)"
+    )
+
     # for addons
     if addons:
         if url := udB.get_key("ADDONS_URL"):
@@ -0,0 +1,60 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# Please read the GNU Affero General Public License in
+# <https://www.github.com/TeamUltroid/Ultroid/blob/main/LICENSE/>.
+
+# Per-message cost of the blacklist check as the list grows: the old
+# `any(word in text.split())` scan against the per-chat automaton.
+#
+# Usage: python3 resources/benchmarks/blacklist.py
+
+import random
+import string
+import sys
+import timeit
+
+sys.path.insert(0, ".")
+
+from pyUltroid.fns.automaton import Automaton
+
+
+def messages(count=1000):
+    rand = random.Random(0)
+    words = "hello there how is it going ok lol nice thanks see you".split()
+    return [
+        " ".join(rand.choices(words, k=rand.randint(1, 30))) for _ in range(count)
+    ]
+
+
+def main(repeat=5):
+    rand = random.Random(1)
+    texts = messages()
+    for size in (10, 100, 1000, 10000):
+        entries = [
+            "".join(rand.choices(string.ascii_lowercase, k=rand.randint(4, 10)))
+            for _ in range(size)
+        ]
+        automaton = Automaton(entries)
+        automaton.search("")
+
+        def linear():
+            for text in texts:
+                words = text.lower().split()
+                any(z in words for z in entries)
+
+        def indexed():
+            for text in texts:
+                automaton.search(text)
+
+        t_old = min(timeit.repeat(linear, number=1, repeat=repeat)) / len(texts)
+        t_new = min(timeit.repeat(indexed, number=1, repeat=repeat)) / len(texts)
+        print(
+            f"{size:>6} words | any() scan: {t_old * 1e6:9.2f} us"
+            f" | automaton: {t_new * 1e6:6.2f} us | {t_old / t_new:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
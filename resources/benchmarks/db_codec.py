@@ -0,0 +1,58 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# Please read the GNU Affero General Public License in
+# <https://www.github.com/TeamUltroid/Ultroid/blob/main/LICENSE/>.
+
+# Compare decode time of the database codec against the old
+# str() / ast.literal_eval path on ~1 MB payloads.
+#
+# Usage: python3 resources/benchmarks/db_codec.py
+
+import ast
+import random
+import string
+import sys
+import timeit
+
+sys.path.insert(0, ".")
+
+from pyUltroid.startup._codec import decode, encode
+
+
+def payloads():
+    rand = random.Random(0)
+
+    def word(n=12):
+        return "".join(rand.choices(string.ascii_letters, k=n))
+
+    def fill(make_item):
+        data, size = {}, 0
+        while size < 2**20:
+            key, value = make_item()
+            data[key] = value
+            size += len(repr(key)) + len(repr(value)) + 4
+        return data
+
+    return {
+        "GBAN": fill(lambda: (-(10**12) - rand.randint(0, 10**9), word(24))),
+        "USERNAME_DB": fill(lambda: (rand.randint(10**8, 10**10), [word(), word(8)])),
+        "FILE_STORE": fill(lambda: (word(32), rand.randint(1, 10**6))),
+    }
+
+
+def main(repeat=5):
+    for name, value in payloads().items():
+        old, new = str(value), encode(value)
+        assert decode(new) == value
+        t_old = min(timeit.repeat(lambda: ast.literal_eval(old), number=1, repeat=repeat))
+        t_new = min(timeit.repeat(lambda: decode(new), number=1, repeat=repeat))
+        print(
+            f"{name:<12} {len(old) / 2**20:.2f} MB | literal_eval: {t_old * 1000:8.2f} ms"
+            f" | codec: {t_new * 1000:7.2f} ms | {t_old / t_new:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# Please read the GNU Affero General Public License in
+# <https://www.github.com/TeamUltroid/Ultroid/blob/main/LICENSE/>.
+
+# Per-message dispatch cost with every `ultroid_cmd` of the official
+# plugins registered: one regex per handler (old) against the prefix
+# index of the command dispatcher.
+#
+# Usage: python3 resources/benchmarks/dispatch.py
+
+import ast
+import random
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, ".")
+
+from pyUltroid._misc._dispatcher import _Command, _Route, literal_prefixes
+
+HNDLR, SUDO_HNDLR = ".", "!"
+
+
+def compile_pattern(data, hndlr):
+    # Same as pyUltroid._misc._decorators.compile_pattern
+    data = data[1:] if data.startswith("^") else data
+    data = data[1:] if data.startswith(".") else data
+    return re.compile("\\" + hndlr + data)
+
+
+def plugin_patterns(folder="plugins"):
+    for path in sorted(Path(folder).glob("*.py")):
+        for node in ast.walk(ast.parse(path.read_text())):
+            if not (
+                isinstance(node, ast.Call)
+                and getattr(node.func, "id", None) == "ultroid_cmd"
+            ):
+                continue
+            args = [kw.value for kw in node.keywords if kw.arg == "pattern"]
+            args = args or node.args[:1]
+            if args and isinstance(args[0], ast.Constant):
+                yield args[0].value
+
+
+def messages(patterns, count=2000):
+    rand = random.Random(0)
+    words = "hello there how is it going ok lol nice thanks see you .".split()
+    names = [re.match(r"[\w-]*", data.lstrip("^.")).group() for data in patterns]
+    texts = []
+    for _ in range(count):
+        if rand.random() < 0.9:
+            texts.append(" ".join(rand.choices(words, k=rand.randint(1, 12))))
+        else:
+            hndlr = rand.choice((HNDLR, SUDO_HNDLR))
+            texts.append(hndlr + rand.choice(names) + " " + rand.choice(words))
+    return texts
+
+
+def main(repeat=5):
+    patterns = list(plugin_patterns())
+    regexes = [
+        compile_pattern(data, hndlr)
+        for hndlr in (HNDLR, SUDO_HNDLR)
+        for data in patterns
+    ]
+    route = _Route()
+    for order, regex in enumerate(regexes):
+        command = _Command(order, regex, None, None, None, None)
+        for prefix in literal_prefixes(regex.pattern):
+            route.add(prefix, command)
+    texts = messages(patterns)
+
+    def linear():
+        for text in texts:
+            for regex in regexes:
+                regex.match(text)
+
+    def indexed():
+        for text in texts:
+            for command in route.candidates(text):
+                command.pattern.match(text)
+
+    for text in texts:
+        old = [regex for regex in regexes if regex.match(text)]
+        new = [cmd.pattern for cmd in route.candidates(text) if cmd.pattern.match(text)]
+        assert old == new, text
+
+    t_old = min(timeit.repeat(linear, number=1, repeat=repeat)) / len(texts)
+    t_new = min(timeit.repeat(indexed, number=1, repeat=repeat)) / len(texts)
+    unindexed = len(route.trie.get(None, ()))
+    print(f"{len(regexes)} handlers ({unindexed} without a literal prefix)")
+    print(
+        f"per message | one regex per handler: {t_old * 1e6:8.2f} us"
+        f" | indexed: {t_new * 1e6:6.2f} us | {t_old / t_new:5.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
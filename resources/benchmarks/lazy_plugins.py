@@ -0,0 +1,100 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# Please read the GNU Affero General Public License in
+# <https://www.github.com/TeamUltroid/Ultroid/blob/main/LICENSE/>.
+
+# Startup time and peak RSS of loading the official plugins eagerly against
+# LAZY_PLUGINS, each in a fresh interpreter. Plugins need a logged in client
+# to import, so each one is stood for by the top level imports it makes:
+# eager imports those of every plugin, lazy reads the manifest and imports
+# those of the plugins it can't defer. The gap is a lower bound, it leaves
+# out running the plugin bodies themselves.
+#
+# Usage: python3 resources/benchmarks/lazy_plugins.py
+
+import ast
+import glob
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from importlib import import_module
+
+sys.path.insert(0, ".")
+
+_OWN = ("pyUltroid", "plugins", "strings", "assistant", "addons")
+
+
+def plugin_imports(path):
+    """Modules a plugin imports at its top level, its own packages aside."""
+    with open(path) as file:
+        tree = ast.parse(file.read())
+    nodes = []
+    for node in tree.body:
+        nodes.extend(node.body if isinstance(node, ast.Try) else [node])
+    for node in nodes:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and not node.level:
+            names = [node.module]
+        else:
+            continue
+        yield from (name for name in names if not name.startswith(_OWN))
+
+
+def run(mode):
+    start = time.perf_counter()
+    from pyUltroid.loader import Loader
+
+    files = sorted(glob.glob("plugins/*.py"))
+    if mode == "lazy":
+        manifest = Loader()._manifest(files)
+        files = [path for path in files if not manifest[path].get("commands")]
+    for path in files:
+        for name in plugin_imports(path):
+            try:
+                import_module(name)
+            except Exception:
+                # Optional dependencies, the plugins guard these too.
+                pass
+    elapsed = time.perf_counter() - start
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024
+    print(f"{elapsed} {rss} {len(files)}")
+
+
+def measure(mode, repeat):
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, __file__, mode],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        elapsed, rss, count = out.stdout.split()[-3:]
+        runs.append((float(elapsed), int(rss), int(count)))
+    return runs
+
+
+def main(repeat=5):
+    # Warm the manifest and the bytecode caches first.
+    measure("lazy", 1)
+    measure("eager", 1)
+    for mode in ("eager", "lazy"):
+        runs = measure(mode, repeat)
+        elapsed = statistics.median(run[0] for run in runs)
+        rss = statistics.median(run[1] for run in runs)
+        print(
+            f"{mode:>5}: {elapsed * 1000:7.1f} ms, peak RSS {rss:.0f} MB,"
+            f" {runs[0][2]} plugins imported"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(sys.argv[1])
+    else:
+        main()
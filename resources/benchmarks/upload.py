@@ -0,0 +1,113 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# Please read the GNU Affero General Public License in
+# <https://www.github.com/TeamUltroid/Ultroid/blob/main/LICENSE/>.
+
+# Upload throughput of FastTelethon against a local fake sender, for the
+# old 1 KiB chunk loop and the current part-sized read path.
+#
+# Usage: python3 resources/benchmarks/upload.py [size in MB]
+
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, ".")
+
+from pyUltroid.fns.FastTelethon import (
+    ParallelTransferrer,
+    SenderPool,
+    _internal_transfer_to_telegram,
+    helpers,
+    stream_file,
+)
+
+
+class FakeSender:
+    def is_connected(self):
+        return True
+
+    async def disconnect(self):
+        pass
+
+
+class FakeClient:
+    """Accepts every part at once, so only the local path is measured."""
+
+    session = SimpleNamespace(dc_id=2)
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.received = 0
+
+    async def _call(self, sender, request):
+        self.received += len(request.bytes)
+        await asyncio.sleep(0)
+        return True
+
+
+async def fake_create(pool, dc_id):
+    return FakeSender()
+
+
+async def legacy_transfer(client, response, filename, progress_callback):
+    # The old upload loop: 1 KiB reads copied into a bytearray, MD5 on the loop.
+    file_id = helpers.generate_random_long()
+    file_size = os.path.getsize(response.name)
+    hash_md5 = hashlib.md5()
+    uploader = ParallelTransferrer(client)
+    part_size, part_count, is_large = await uploader.init_upload(file_id, file_size)
+    buffer = bytearray()
+    for data in stream_file(response):
+        if not is_large:
+            hash_md5.update(data)
+        if len(buffer) == 0 and len(data) == part_size:
+            await uploader.upload(data)
+            continue
+        new_len = len(buffer) + len(data)
+        if new_len >= part_size:
+            cutoff = part_size - len(buffer)
+            buffer.extend(data[:cutoff])
+            await uploader.upload(bytes(buffer))
+            buffer.clear()
+            buffer.extend(data[cutoff:])
+        else:
+            buffer.extend(data)
+    if len(buffer) > 0:
+        await uploader.upload(bytes(buffer))
+    await uploader.finish_upload()
+
+
+async def measure(transfer, path, size):
+    client = FakeClient()
+    with open(path, "rb") as file:
+        start = time.perf_counter()
+        await transfer(client, file, "bench", None)
+        elapsed = time.perf_counter() - start
+    assert client.received == size
+    return size / elapsed / 2**20
+
+
+async def main(size_mb=200):
+    SenderPool._create = fake_create
+    size = size_mb * 2**20
+    with tempfile.NamedTemporaryFile() as file:
+        for _ in range(size_mb):
+            file.write(os.urandom(2**20))
+        file.flush()
+        for name, transfer in (
+            ("1 KiB chunks", legacy_transfer),
+            ("part reads", _internal_transfer_to_telegram),
+        ):
+            rate = await measure(transfer, file.name, size)
+            print(f"{name:<12} | {rate:8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*map(int, sys.argv[1:])))
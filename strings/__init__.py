@@ -1,5 +1,8 @@
+import asyncio
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from glob import glob
 from typing import Any, Dict, List, Union
 
@@ -16,6 +19,11 @@ ULTConfig.lang = udB.get_key("language") or os.getenv("LANGUAGE", "en")
 languages = {}
 PATH = "strings/strings/{}.yml"
 
+# Missing strings are translated from English in these threads, and kept in
+# the database hash 'TRANSLATIONS_<LANG>' as {key: [english, translation]}.
+_translator = ThreadPoolExecutor(2, thread_name_prefix="translate")
+_pending = set()
+
 
 def load(file):
     if not file.endswith(".yml"):
@@ -32,7 +40,74 @@ def load(file):
         LOGS.exception(er)
 
 
-load(PATH.format(ULTConfig.lang))
+def _cache_key(lang):
+    return f"TRANSLATIONS_{lang.upper()}"
+
+
+def load_translations(lang):
+    """Add the translations cached in the database to 'languages[lang]'."""
+    if lang == "en" or not udB:
+        return
+    english = languages.get("en", {})
+    strings = languages.setdefault(lang, {})
+    for key, (source, text) in udB.hgetall(_cache_key(lang)).items():
+        # Dropped once the English string changes.
+        if key not in strings and english.get(key) == source:
+            strings[key] = text
+
+
+def _translate(text, lang):
+    """Translation of 'text', None if it failed or broke the placeholders."""
+    tr = translate(text, lang_tgt=lang).replace("\ N", "\n")
+    if tr and text.count("{}") == tr.count("{}"):
+        return tr
+
+
+def _store(lang, key, text, future):
+    _pending.discard((lang, key))
+    try:
+        tr = future.result()
+    except Exception as er:
+        return LOGS.exception(er)
+    if tr is None:
+        # Not cached, so it is tried again later.
+        return
+    languages.setdefault(lang, {})[key] = tr
+    if udB:
+        udB.hset(_cache_key(lang), key, [text, tr])
+
+
+def translate_later(lang, key):
+    """Translate English string 'key' to 'lang' in a thread, if not done yet."""
+    text = languages.get("en", {}).get(key)
+    if not isinstance(text, str) or (lang, key) in _pending:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    _pending.add((lang, key))
+    future = loop.run_in_executor(_translator, _translate, text, lang)
+    future.add_done_callback(partial(_store, lang, key, text))
+    return future
+
+
+async def translate_all(lang):
+    """Translate every English string missing in 'lang'; returns the number
+    of strings translated."""
+    strings = languages.get(lang, {})
+    futures = [
+        translate_later(lang, key) for key in languages["en"] if key not in strings
+    ]
+    futures = [future for future in futures if future]
+    results = await asyncio.gather(*futures, return_exceptions=True)
+    return sum(isinstance(result, str) for result in results)
+
+
+load(PATH.format("en"))
+if ULTConfig.lang != "en":
+    load(PATH.format(ULTConfig.lang))
+    load_translations(ULTConfig.lang)
 
 
 def get_string(key: str, _res: bool = True) -> Any:
@@ -40,27 +115,16 @@ def get_string(key: str, _res: bool = True) -> Any:
     try:
         return languages[lang][key]
     except KeyError:
-        try:
-            en_ = languages["en"][key]
-            tr = translate(en_, lang_tgt=lang).replace("\ N", "\n")
-            if en_.count("{}") != tr.count("{}"):
-                tr = en_
-            if languages.get(lang):
-                languages[lang][key] = tr
-            else:
-                languages.update({lang: {key: tr}})
-            return tr
-        except KeyError:
-            if not _res:
-                return
-            return f"Warning: could not load any string with the key `{key}`"
-        except TypeError:
-            pass
-        except Exception as er:
-            LOGS.exception(er)
+        pass
+    en_ = languages.get("en", {}).get(key)
+    if en_ is None:
         if not _res:
-            return None
-        return languages["en"].get(key) or f"Failed to load language string '{key}'"
+            return
+        return f"Warning: could not load any string with the key `{key}`"
+    if lang != "en":
+        # English now, the translation for the next call.
+        translate_later(lang, key)
+    return en_
 
 
 def get_help(key):